@@ -0,0 +1,49 @@
+import numpy as np
+from pyomo.environ import maximize
+from build_model import OBJECTIVE_SENSE
+
+# --- Archive de Pareto incrémentale
+# Ne garde que les points non dominés au fur et à mesure qu'ils arrivent : la mémoire suit la taille du front,
+# pas le nombre de runs. Les comparaisons se font sur les valeurs arrondies (objectifs entiers),
+# comme dans filter_dominated_solutions ; un point égal à un point déjà archivé n'est pas ajouté.
+
+STATUTS_VALIDES = ['Optimal', 'maxTimeLimit', 'feasible', 'optimal']
+
+class ArchivePareto:
+
+    # objectives : [objectif principal] + objectifs secondaires
+    def __init__(self, objectives):
+        self.objectives = list(objectives)
+        # Toutes les colonnes sont ramenées à une minimisation
+        self._signe = np.array([-1.0 if OBJECTIVE_SENSE[obj] == maximize else 1.0 for obj in self.objectives])
+        self._valeurs = np.empty((0, len(self.objectives)))
+        self._points = []
+
+    def __len__(self):
+        return len(self._points)
+
+    def points(self):
+        return list(self._points)
+
+    def _vecteur(self, valeurs):
+        return np.rint([valeurs[obj] for obj in self.objectives]) * self._signe
+
+    # Ajoute le point s'il n'est dominé par aucun point de l'archive (et retire ceux qu'il domine).
+    # Renvoie True si le point a été ajouté.
+    def inserer(self, point):
+        if point.get('status') not in STATUTS_VALIDES or any(np.isnan(point[obj]) for obj in self.objectives):
+            return False
+        v = self._vecteur(point)
+
+        if len(self._points):
+            # Un point de l'archive au moins aussi bon partout : dominé ou doublon
+            if (self._valeurs <= v).all(axis=1).any():
+                return False
+            domines = (v <= self._valeurs).all(axis=1)
+            if domines.any():
+                self._valeurs = self._valeurs[~domines]
+                self._points = [p for p, d in zip(self._points, domines) if not d]
+
+        self._valeurs = np.vstack([self._valeurs, v])
+        self._points.append(point)
+        return True
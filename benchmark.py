@@ -0,0 +1,182 @@
+import json
+import os
+import platform
+import resource
+import time
+import tracemalloc
+from datetime import datetime
+import pyomo
+from pyomo.environ import *
+import extraction
+from extraction import load_instance
+from solve_model import build_epsilon_model, solve_multiobjective_epsilon_constraint_v2, filter_dominated_solutions
+from comparaison_formulations import taille_modele
+
+# --- Benchmark du pipeline : chargement, construction, passage au solveur, résolution, balayage de Pareto et filtrage
+# Chaque étape est chronométrée séparément ; les résultats sont écrits en JSON et comparés à une référence.
+
+# Mesures comparées à la référence (temps en secondes, mémoire en Mo) et seuil absolu en dessous duquel on ignore l'écart
+MESURES_TEMPS = ['load_s', 'build_s', 'handoff_s', 'solve_s', 'sweep_s', 'filter_s']
+MESURES_MEMOIRE = ['peak_python_mb']
+MESURES_TAILLE = ['variables', 'contraintes', 'points']
+SEUIL_ABSOLU = {'s': 0.05, 'mb': 1.0}
+
+def _cle(config):
+    options = ",".join(f"{k}={v}" for k, v in sorted(config['model_options'].items()))
+    cle = f"{config['instance']}|{config['primary']}|{'+'.join(config['secondaries'])}|{options}"
+    return cle + "|augmente" if config.get('augmented') else cle
+
+# Pic mémoire Python (tracemalloc) pendant le chargement et la construction.
+# Passe séparée : tracemalloc ralentit la construction, les temps sont mesurés sans lui.
+def _pic_memoire_construction(config):
+    extraction._memo.clear()
+    tracemalloc.start()
+    build_epsilon_model(config['instance'], config['primary'], config['secondaries'], config['model_options'])
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pic / 1e6
+
+# Une configuration : instance, objectif principal, objectifs secondaires, options du modèle (sparse, formulation)
+# et, pour le balayage, epsilon-constraint classique ou augmenté ('augmented', classique par défaut)
+def mesurer_configuration(config, solver_name='gurobi_persistent', time_limit_sec=60, balayage=False, memoire=True):
+    nom_instance, primary, secondaries = config['instance'], config['primary'], config['secondaries']
+    mesures = {'cle': _cle(config), **config}
+
+    # 1. Chargement à froid (sans le mémo du processus ; le cache .npz reste utilisé s'il existe)
+    extraction._memo.clear()
+    t0 = time.perf_counter()
+    load_instance(nom_instance)
+    mesures['load_s'] = time.perf_counter() - t0
+
+    # 2. Construction du modèle (instance déjà en mémoire)
+    t0 = time.perf_counter()
+    model = build_epsilon_model(nom_instance, primary, secondaries, config['model_options'])
+    mesures['build_s'] = time.perf_counter() - t0
+    mesures['variables'], mesures['contraintes'] = taille_modele(model)
+
+    # Résolution mono-objectif : pas de contraintes epsilon
+    model.epsilon_constraints.deactivate()
+
+    # 3. Passage du modèle au solveur (chargement dans Gurobi), séparé de la résolution en mode persistant seulement :
+    # un solveur par fichier LP ('gurobi') l'écrit pendant solve, compté dans solve_s
+    solver = SolverFactory(solver_name)
+    mesures['handoff_s'] = None
+    if solver_name.startswith('appsi'):
+        solver.config.time_limit = time_limit_sec
+    else:
+        solver.options['TimeLimit'] = time_limit_sec
+        if hasattr(solver, 'set_instance'):
+            t0 = time.perf_counter()
+            solver.set_instance(model)
+            mesures['handoff_s'] = time.perf_counter() - t0
+
+    # 4. Résolution
+    t0 = time.perf_counter()
+    result = solver.solve(model)
+    mesures['solve_s'] = time.perf_counter() - t0
+    mesures['status'] = str(result.solver.termination_condition)
+    mesures['objectif'] = value(model.obj) if mesures['status'] in ['optimal', 'maxTimeLimit', 'feasible'] else None
+    if hasattr(solver, 'get_model_attr'):
+        mesures['gurobi_runtime_s'] = solver.get_model_attr('Runtime')
+        mesures['noeuds'] = solver.get_model_attr('NodeCount')
+
+    # 5. Balayage du front (v2) puis filtrage des points dominés
+    if balayage and secondaries:
+        t0 = time.perf_counter()
+        points = solve_multiobjective_epsilon_constraint_v2(nom_instance, primary, secondaries, time_limit_sec=time_limit_sec,
+                                                            model_options=config['model_options'], augmented=config.get('augmented', False))
+        mesures['sweep_s'] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        front = filter_dominated_solutions(points, primary, secondaries)
+        mesures['filter_s'] = time.perf_counter() - t0
+        mesures['points'] = len(front)
+
+    # 6. Mémoire
+    if memoire:
+        mesures['peak_python_mb'] = _pic_memoire_construction(config)
+    # ru_maxrss est en Ko sous Linux : pic du processus depuis son lancement (Gurobi compris)
+    mesures['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+    return mesures
+
+# Toutes les combinaisons instances x objectifs x options (x modes de balayage, ex. (False, True) pour comparer
+# l'epsilon-constraint classique et augmenté)
+def lancer_benchmark(instances, objectifs, options_modele, solver_name='gurobi_persistent', time_limit_sec=60, balayage=False, memoire=True,
+                     modes_augmentes=(False,)):
+    resultats = []
+    for nom_instance in instances:
+        for primary, secondaries in objectifs:
+            for model_options in options_modele:
+                for augmented in (modes_augmentes if balayage else (False,)):
+                    config = {'instance': nom_instance, 'primary': primary, 'secondaries': list(secondaries),
+                              'model_options': dict(model_options), 'augmented': augmented}
+                    print(f"\n=== Benchmark {_cle(config)} ===")
+                    resultats.append(mesurer_configuration(config, solver_name, time_limit_sec, balayage, memoire))
+    return {
+        'meta': {
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'machine': platform.node(),
+            'python': platform.python_version(),
+            'pyomo': pyomo.version.version,
+            'solveur': solver_name,
+            'nb_coeurs': os.cpu_count(),
+        },
+        'resultats': resultats,
+    }
+
+def ecrire_resultats(benchmark, chemin):
+    os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+    with open(chemin, "w") as f:
+        json.dump(benchmark, f, indent=2)
+
+# Compare à une référence : renvoie la liste des régressions (mesure plus lente / plus lourde au-delà de la tolérance)
+def comparer_a_reference(benchmark, reference, tolerance=0.20):
+    ref_par_cle = {r['cle']: r for r in reference['resultats']}
+    regressions = []
+    print(f"\n{'configuration':<55} {'mesure':<15} {'référence':>10} {'actuel':>10} {'ratio':>7}")
+    for r in benchmark['resultats']:
+        ref = ref_par_cle.get(r['cle'])
+        if ref is None:
+            print(f"{r['cle']:<55} (absente de la référence)")
+            continue
+        for mesure in MESURES_TEMPS + MESURES_MEMOIRE + MESURES_TAILLE:
+            actuel, avant = r.get(mesure), ref.get(mesure)
+            if actuel is None or avant is None:
+                continue
+            ratio = actuel / avant if avant else float('inf') if actuel else 1.0
+            seuil = SEUIL_ABSOLU['mb'] if mesure in MESURES_MEMOIRE else SEUIL_ABSOLU['s']
+            if mesure in MESURES_TAILLE:
+                marque = '  (taille modifiée)' if actuel != avant else ''
+            elif ratio > 1 + tolerance and actuel - avant > seuil:
+                marque = '  <-- REGRESSION'
+                regressions.append({'cle': r['cle'], 'mesure': mesure, 'reference': avant, 'actuel': actuel, 'ratio': ratio})
+            else:
+                marque = ''
+            print(f"{r['cle']:<55} {mesure:<15} {avant:>10.3f} {actuel:>10.3f} {ratio:>7.2f}{marque}")
+    print(f"\n{len(regressions)} régression(s) au-delà de {tolerance:.0%}")
+    return regressions
+
+
+if __name__ == "__main__":
+
+    INSTANCES = ["toy", "medium"]       # ajouter "large" ou des instances générées ("large_x2", cf. generate_instance.py)
+    OBJECTIFS = [('profit', ['nb_projets_max'])]
+    OPTIONS_MODELE = [{'sparse': True, 'formulation': 'cellule'}, {'sparse': False, 'formulation': 'cellule'}]
+    SOLVEUR = 'gurobi_persistent'       # ou 'appsi_highs' sans licence Gurobi complète (pas de mesure du passage au solveur)
+    TIME_LIMIT_SEC = 60
+    BALAYAGE = True                     # chronométrer aussi un balayage v2 complet et le filtrage du front
+    MODES_AUGMENTES = (False, True)     # balayage v2 classique et augmenté (AUGMECON2)
+
+    SORTIE = os.path.join("benchmarks", "resultats.json")
+    REFERENCE = os.path.join("benchmarks", "reference.json")
+
+    benchmark = lancer_benchmark(INSTANCES, OBJECTIFS, OPTIONS_MODELE, SOLVEUR, TIME_LIMIT_SEC, BALAYAGE, modes_augmentes=MODES_AUGMENTES)
+    ecrire_resultats(benchmark, SORTIE)
+    print(f"\nRésultats écrits dans {SORTIE}")
+
+    if os.path.exists(REFERENCE):
+        with open(REFERENCE) as f:
+            comparer_a_reference(benchmark, json.load(f))
+    else:
+        # Premier passage : ces résultats deviennent la référence
+        ecrire_resultats(benchmark, REFERENCE)
+        print(f"Pas de référence : résultats enregistrés comme référence dans {REFERENCE}")
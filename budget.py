@@ -0,0 +1,124 @@
+import math
+import time
+
+# --- Budget de temps global d'une recherche de front (v1, v2)
+# Au lieu d'une limite fixe par résolution, chaque résolution reçoit une limite de temps (TimeLimit) tirée du temps restant :
+#   part équitable = temps restant / runs restants ; limite = marge x part équitable (sans dépasser le temps restant),
+# pour qu'une cellule difficile puisse profiter du temps laissé par les cellules faciles.
+# Si les derniers runs ont pris plus que leur part équitable, la recherche est en retard : le gap MIP toléré (MIPGap)
+# est relâché en proportion, jusqu'à gap_max. Un run résolu avec un gap relâché n'est plus prouvé optimal.
+# Une fois le budget épuisé, les runs restants ne sont plus résolus (statut STATUT_EPUISE).
+
+STATUT_EPUISE = 'budgetExhausted'
+
+# Gap MIP par défaut de Gurobi : en dessous, une solution 'optimal' est considérée comme prouvée
+GAP_PROUVE = 1e-4
+
+class BudgetTemps:
+
+    # total_sec : temps total de la recherche (anchors compris)
+    # part_bornes : part maximale du budget pour la table des gains
+    # marge : une résolution peut prendre jusqu'à marge fois sa part équitable
+    # limite_min_sec : plus petite limite donnée à une résolution ; en dessous, le budget est épuisé
+    # gap_max : gap MIP le plus lâche accepté quand la recherche est en retard
+    # nb_observes : nombre de derniers temps de résolution pris en compte
+    def __init__(self, total_sec, part_bornes=0.2, marge=3.0, limite_min_sec=1.0, gap_max=0.05, nb_observes=10):
+        self.total_sec = total_sec
+        self.part_bornes = part_bornes
+        self.marge = marge
+        self.limite_min_sec = limite_min_sec
+        self.gap_max = gap_max
+        self.nb_observes = nb_observes
+        self.runs_prevus = None
+        self.runs_faits = 0
+        self.temps_observes = []
+        self.compteurs = {'prouves': 0, 'incumbents': 0, 'sans_solution': 0, 'non_resolus': 0}
+        self._debut = None
+
+    # Options pour recréer le budget dans un processus de calcul : il dispose du temps restant pour ses nb_runs cellules
+    def options_processus(self, nb_runs):
+        return {'total_sec': self.restant(), 'part_bornes': 0.0, 'marge': self.marge, 'limite_min_sec': self.limite_min_sec,
+                'gap_max': self.gap_max, 'nb_observes': self.nb_observes, 'runs_prevus': nb_runs}
+
+    # Le chronomètre part au premier appel (construction du modèle comprise)
+    def demarrer(self):
+        if self._debut is None:
+            self._debut = time.perf_counter()
+
+    def ecoule(self):
+        return 0.0 if self._debut is None else time.perf_counter() - self._debut
+
+    def restant(self):
+        return max(0.0, self.total_sec - self.ecoule())
+
+    def epuise(self):
+        return self.restant() < self.limite_min_sec
+
+    # Nombre de runs attendus (v1 : taille de la grille ; v2 : première estimation, cf. avancer), pour répartir le temps restant
+    def prevoir(self, nb_runs):
+        self.runs_prevus = nb_runs
+
+    # v2 : le nombre de runs n'est pas connu d'avance. avancement : part de l'espace des epsilon déjà parcourue (0 à 1) ;
+    # les runs restants sont estimés au rythme observé (runs faits / avancement) au lieu du majorant de la recherche
+    def avancer(self, avancement):
+        if avancement > 0:
+            self.runs_prevus = self.runs_faits / min(1.0, avancement)
+
+    # Limite de temps de chaque résolution de la table des gains (nb_resolutions au total)
+    def limite_bornes(self, nb_resolutions):
+        return max(self.limite_min_sec, self.part_bornes * self.restant() / max(1, nb_resolutions))
+
+    # Règle TimeLimit et MIPGap du solveur pour la prochaine résolution ; renvoie (limite, gap), gap None si non relâché.
+    # gap_base : gap de la résolution non relâchée (0 avec l'objectif augmenté), réécrit explicitement : un solveur
+    # persistant garde le dernier MIPGap reçu tant qu'on ne lui en donne pas un autre
+    def regler(self, solver, gap_base=GAP_PROUVE):
+        restant = self.restant()
+        runs_restants = max(1, self.runs_prevus - self.runs_faits) if self.runs_prevus else 1
+        part = restant / runs_restants
+        limite = max(self.limite_min_sec, min(restant, self.marge * part))
+
+        gap = None
+        recents = self.temps_observes[-self.nb_observes:]
+        if recents:
+            moyenne = sum(recents) / len(recents)
+            if moyenne > part:
+                gap = max(GAP_PROUVE, self.gap_max * (1 - part / moyenne))
+
+        solver.options['TimeLimit'] = limite
+        solver.options['MIPGap'] = gap_base if gap is None else gap
+        return limite, gap
+
+    # Compte un run terminé (cf. solve_model._resultat_run) ; seuls les runs résolus par le solveur donnent un temps
+    def observer(self, run):
+        self.runs_faits += 1
+        if run['source'] == 'solveur':
+            self.temps_observes.append(run['solve_s'])
+        if run['status'] == STATUT_EPUISE:
+            self.compteurs['non_resolus'] += 1
+        elif run['point'] is None:
+            self.compteurs['sans_solution'] += 1
+        elif run['prouve']:
+            self.compteurs['prouves'] += 1
+        else:
+            self.compteurs['incumbents'] += 1
+
+    def afficher(self):
+        c = self.compteurs
+        print(f"Budget : {self.ecoule():.1f}s utilisées sur {self.total_sec:.1f}s, {self.runs_faits} runs "
+              f"({c['prouves']} prouvés optimaux, {c['incumbents']} incumbents seulement, {c['sans_solution']} sans solution, "
+              f"{c['non_resolus']} non résolus faute de temps)")
+
+def budget_depuis_options(options):
+    if not options:
+        return None
+    options = dict(options)
+    runs_prevus = options.pop('runs_prevus', None)
+    budget = BudgetTemps(**options)
+    budget.prevoir(runs_prevus)
+    budget.demarrer()
+    return budget
+
+# Majorant du nombre de runs de la recherche v2 : chaque run resserre l'epsilon d'au moins une unité (objectifs entiers).
+# Le produit sur tous les secondaires est très pessimiste : v2 ne s'en sert que pour la boucle interne, avant tout avancement.
+def majorant_runs_v2(bounds, secondary_objectives):
+    return math.prod(int(abs(bounds[obj]['worst'] - bounds[obj]['best'])) + 1 for obj in secondary_objectives)
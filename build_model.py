@@ -1,7 +1,7 @@
 from pyomo.environ import *
 import gurobipy
 import numpy as np
-from extraction import load_instance 
+from extraction import load_instance_arrays, Instance
 from pyomo.environ import Reals
 
 # --- Constante pour le sens des objectifs
@@ -12,10 +12,26 @@ OBJECTIVE_SENSE = {
     'duree': minimize
 }
 
-def build_model(nom_instance):
-    Hmax, Smax, Pmax, Qmax, n_values, v_values, g_values, c_values, d_values, r_values, staff_names, job_names, qual_names = load_instance(nom_instance)
+# --- Formulations possibles des liens a -> fin, z, k
+#   'cellule'           : une contrainte par cellule (h,s,q,p) pour chacun des trois liens
+#   'agregee'           : liens agrégés par (p,h) et (s,p) avec un grand M calculé sur l'instance
+#   'agregee_renforcee' : 'agregee' + inégalités valides par (h,s,p), au moins aussi forte que 'cellule'
+FORMULATIONS = ['cellule', 'agregee', 'agregee_renforcee']
+
+# nom_instance : nom ou chemin de l'instance, ou Instance déjà construite (sous-problèmes de lns.py)
+def build_model(nom_instance, sparse=False, formulation='cellule'):
+    if formulation not in FORMULATIONS:
+        raise ValueError(f"Formulation inconnue : {formulation}")
+
+
+    # Instance sous forme de tableaux NumPy (mise en cache, cf. extraction.py) ; les dictionnaires servent aux Param
+    instance = nom_instance if isinstance(nom_instance, Instance) else load_instance_arrays(nom_instance)
+    Hmax, Smax, Pmax, Qmax = instance.Hmax, instance.Smax, instance.Pmax, instance.Qmax
+    n_values, v_values, g_values, c_values, d_values, r_values = instance.as_dicts()
     
     model = ConcreteModel()
+    model.nom_instance = None if isinstance(nom_instance, Instance) else nom_instance
+    model.options_modele = {'sparse': sparse, 'formulation': formulation}
 
     # --- Ensembles
     model.H = RangeSet(1, Hmax)
@@ -23,6 +39,30 @@ def build_model(nom_instance):
     model.Q = RangeSet(1, Qmax)
     model.P = RangeSet(1, Pmax)
 
+    # Ensemble des affectations (h,s,q,p) admissibles.
+    # En mode 'sparse', on ne garde que les cellules où la personne a la compétence, n'est pas en vacances
+    # et où le projet demande des jours pour cette qualification (sinon a[h,s,q,p] est forcément nul).
+    if sparse:
+        # Calcul sur les tableaux sans passer par un masque [H,S,Q,P] (trop gros sur les grandes instances) :
+        # triplets (s,q,p) compétence x demande, puis filtrage par jour sur les vacances. Ordre (h,s,q,p) conservé.
+        sq = np.argwhere(instance.c == 1)
+        p_par_q = [np.flatnonzero(instance.n[:, q] > 0) for q in range(Qmax)]
+        triplets = np.column_stack([np.repeat(sq, [len(p_par_q[q]) for q in sq[:, 1]], axis=0),
+                                    np.concatenate([p_par_q[q] for q in sq[:, 1]] + [np.empty(0, dtype=int)])])
+        h_idx, t_idx = np.nonzero(instance.v[triplets[:, 0]].T == 0)
+        A_values = [tuple(cell) for cell in (np.column_stack([h_idx, triplets[t_idx]]) + 1).tolist()]
+        model.A = Set(dimen=4, initialize=A_values, ordered=True)
+    else:
+        model.A = model.H * model.S * model.Q * model.P
+
+    # Index inverses pour que chaque contrainte ne parcoure que ses cellules de A
+    A_par_hs, A_par_pq, A_par_sp, A_par_ph = {}, {}, {}, {}
+    for (h, s, q, p) in model.A:
+        A_par_hs.setdefault((h, s), []).append((h, s, q, p))
+        A_par_pq.setdefault((p, q), []).append((h, s, q, p))
+        A_par_sp.setdefault((s, p), []).append((h, s, q, p))
+        A_par_ph.setdefault((p, h), []).append((h, s, q, p))
+
     # --- Paramètres
     model.n = Param(model.P, model.Q, initialize=n_values)
     model.v = Param(model.S, model.H, initialize=v_values)
@@ -33,7 +73,7 @@ def build_model(nom_instance):
 
     # --- Variables
 
-    model.a = Var(model.H, model.S, model.Q, model.P, domain=Binary)
+    model.a = Var(model.A, domain=Binary)
     model.f = Var(model.P, domain=Binary)
     model.fin = Var(model.P, domain=NonNegativeIntegers)
     model.R = Var(model.P, domain=NonNegativeIntegers)
@@ -45,29 +85,38 @@ def build_model(nom_instance):
     model.N_projets = Var(domain=NonNegativeIntegers)
 
     # --- Contraintes
-    def competences_rule(model,h,s,q,p):
-        return model.a[h,s,q,p]<=model.c[s,q]
-    model.competences = Constraint(model.H, model.S,model.Q,model.P, rule=competences_rule, doc='personne affectée a compétence')
+    # En mode 'sparse', les compétences sont garanties par construction de A
+    if not sparse:
+        def competences_rule(model,h,s,q,p):
+            return model.a[h,s,q,p]<=model.c[s,q]
+        model.competences = Constraint(model.A, rule=competences_rule, doc='personne affectée a compétence')
 
     # def vacances_rule(model,h,s,q,p):
     #     return model.a[h,s,q,p]<=1-model.v[s,h]
     # model.vacances = Constraint(model.H, model.S,model.Q,model.P, rule=vacances_rule, doc='vacances')
 
     def allocation_rule(model,h,s):
-        return sum(model.a[h,s,q,p] for q in model.Q for p in model.P )<=1-model.v[s,h]
+        if (h, s) not in A_par_hs:
+            return Constraint.Skip
+        return sum(model.a[i] for i in A_par_hs[h, s])<=1-model.v[s,h]
     model.allocation = Constraint(model.H, model.S, rule=allocation_rule, doc='unicité allocation')
 
     def unicite_rule(model,p,q):
-        return sum(model.a[h,s,q,p] for h in model.H for s in model.S )<=model.n[p,q]
+        if (p, q) not in A_par_pq:
+            return Constraint.Skip
+        return sum(model.a[i] for i in A_par_pq[p, q])<=model.n[p,q]
     model.unicite = Constraint(model.P, model.Q, rule=unicite_rule, doc='travail max par projet et unicite sur H')
 
     def fini_rule(model,p,q):
-        return (sum(model.a[h,s,q,p] for s in model.S for h in model.H)) >=model.f[p]*model.n[p,q]
+        if model.n[p,q] == 0:
+            return Constraint.Skip
+        return (sum(model.a[i] for i in A_par_pq.get((p, q), []))) >=model.f[p]*model.n[p,q]
     model.fini = Constraint(model.P, model.Q, rule=fini_rule, doc='projet fini')
 
-    def duration_rule(model,p,h,q,s):
-        return model.fin[p]>= h*model.a[h,s,q,p]
-    model.duration= Constraint(model.P, model.H, model.Q, model.S, rule=duration_rule, doc="definir delai pour finir projet")
+    if formulation == 'cellule':
+        def duration_rule(model,h,s,q,p):
+            return model.fin[p]>= h*model.a[h,s,q,p]
+        model.duration= Constraint(model.A, rule=duration_rule, doc="definir delai pour finir projet")
 
     def delay_rule(model,p):
         return model.R[p]>= model.fin[p]-model.d[p]
@@ -77,9 +126,10 @@ def build_model(nom_instance):
         return model.R[p]>= 0
     model.delay2= Constraint(model.P, rule=delay2_rule, doc="def delai 2/2")
     
-    def z_activation_rule(model, p, h, s, q):
-        return model.z[p,h] >= model.a[h,s,q,p]
-    model.z_activation_strong = Constraint(model.P, model.H, model.S, model.Q, rule=z_activation_rule)
+    if formulation == 'cellule':
+        def z_activation_rule(model,h,s,q,p):
+            return model.z[p,h] >= model.a[h,s,q,p]
+        model.z_activation_strong = Constraint(model.A, rule=z_activation_rule)
 
     def z_monotonic_rule(model, p, h):
         if h < Hmax:
@@ -95,9 +145,67 @@ def build_model(nom_instance):
         return model.fin[p]>=model.debut[p]
     model.duree=Constraint(model.P, rule=duree_rule, doc="def duree positive")
 
-    def k_rule(model,s,p,q,h):
-        return model.k[s,p]>=model.a[h,s,q,p] 
-    model.k_def=Constraint(model.S, model.P,model.Q, model.H, rule=k_rule, doc="def de k")
+    if formulation == 'cellule':
+        def k_rule(model,h,s,q,p):
+            return model.k[s,p]>=model.a[h,s,q,p] 
+        model.k_def=Constraint(model.A, rule=k_rule, doc="def de k")
+    else:
+        # w[p,h] = 1 si le projet p est travaillé le jour h : il remplace a dans les liens vers fin et z
+        model.PH = Set(dimen=2, initialize=sorted(A_par_ph), ordered=True)
+        model.SP = Set(dimen=2, initialize=sorted(A_par_sp), ordered=True)
+        model.w = Var(model.PH, domain=Binary)
+
+        # Grands M les plus petits possibles : une personne fait au plus une tâche par jour,
+        # et un projet ne peut pas recevoir plus de jours que sa charge totale
+        charge = instance.n.sum(axis=1)                               # [P]
+        competent = (instance.c @ (instance.n.T > 0)) > 0             # [S,P] : s a une qualification demandée par p
+        jours_dispo = (instance.v == 0).sum(axis=1)                   # [S]
+        def M_ph(p, h):
+            staff_dispo = np.count_nonzero(competent[:, p-1] & (instance.v[:, h-1] == 0))
+            return int(min(staff_dispo, charge[p-1]))
+        def M_sp(s, p):
+            return int(min(jours_dispo[s-1], instance.n[p-1][instance.c[s-1] == 1].sum()))
+
+        def w_activation_rule(model, p, h):
+            return sum(model.a[i] for i in A_par_ph[p, h]) <= M_ph(p, h) * model.w[p, h]
+        model.w_activation = Constraint(model.PH, rule=w_activation_rule, doc="w[p,h]=1 si p travaillé en h")
+
+        def duration_agregee_rule(model, p, h):
+            return model.fin[p] >= h * model.w[p, h]
+        model.duration = Constraint(model.PH, rule=duration_agregee_rule, doc="definir delai pour finir projet")
+
+        def z_activation_agregee_rule(model, p, h):
+            return model.z[p, h] >= model.w[p, h]
+        model.z_activation = Constraint(model.PH, rule=z_activation_agregee_rule)
+
+        def k_agregee_rule(model, s, p):
+            return sum(model.a[i] for i in A_par_sp[s, p]) <= M_sp(s, p) * model.k[s, p]
+        model.k_def = Constraint(model.SP, rule=k_agregee_rule, doc="def de k")
+
+        # Inégalités valides : w et k ne valent 1 que s'il y a réellement du travail
+        def w_utile_rule(model, p, h):
+            return model.w[p, h] <= sum(model.a[i] for i in A_par_ph[p, h])
+        model.w_utile = Constraint(model.PH, rule=w_utile_rule)
+
+        def k_utile_rule(model, s, p):
+            return model.k[s, p] <= sum(model.a[i] for i in A_par_sp[s, p])
+        model.k_utile = Constraint(model.SP, rule=k_utile_rule)
+
+        if formulation == 'agregee_renforcee':
+            # Une personne fait au plus une qualification par jour et par projet : sum_q a[h,s,q,p] <= w[p,h] (et <= k[s,p]).
+            # Chaque contrainte par cellule de 'cellule' est impliquée par ces lignes, la relaxation est donc au moins aussi forte.
+            A_par_hsp = {}
+            for (h, s, q, p) in model.A:
+                A_par_hsp.setdefault((h, s, p), []).append((h, s, q, p))
+            model.HSP = Set(dimen=3, initialize=sorted(A_par_hsp), ordered=True)
+
+            def w_gub_rule(model, h, s, p):
+                return sum(model.a[i] for i in A_par_hsp[h, s, p]) <= model.w[p, h]
+            model.w_gub = Constraint(model.HSP, rule=w_gub_rule)
+
+            def k_gub_rule(model, h, s, p):
+                return sum(model.a[i] for i in A_par_hsp[h, s, p]) <= model.k[s, p]
+            model.k_gub = Constraint(model.HSP, rule=k_gub_rule)
 
     def retard_rule(model,p):
         return model.p_retard[p] >= model.R[p]/Hmax
@@ -112,6 +220,8 @@ def build_model(nom_instance):
     model.Smax = Smax
     model.Qmax = Qmax
     model.Pmax = Pmax
+    model.sparse = sparse
+    model.formulation = formulation
     
     return model
 
@@ -0,0 +1,119 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+from extraction import load_instance_arrays
+from planning import Planning
+
+# --- Cache persistant des résolutions (SQLite), partagé entre sessions et entre processus
+# Clé : hash du contenu de l'instance, options de construction du modèle, objectif principal, contraintes epsilon
+# et variante de résolution (run epsilon, anchor de la table des gains, mode augmenté...).
+# Valeur : statut, valeurs des objectifs et planning compact (Planning sérialisé en .npz).
+# Seuls les résultats prouvés sont gardés (optimal, infaisable) : une limite de temps ne prouve rien.
+# Quand la taille totale dépasse taille_max_mo, les entrées les moins récemment lues sont supprimées.
+
+STATUTS_PROUVES = ['optimal', 'infeasible']
+
+# Valeurs par défaut de build_model : {} et {'sparse': False} donnent la même clé
+OPTIONS_DEFAUT = {'sparse': False, 'formulation': 'cellule'}
+
+class CacheResultats:
+
+    def __init__(self, chemin, taille_max_mo=500):
+        self.chemin = chemin
+        self.taille_max_mo = taille_max_mo
+        self.trouves = 0
+        self.manques = 0
+        os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+        # Plusieurs processus (anchors, cellules v1 en parallèle) peuvent écrire : journal WAL et attente sur verrou
+        self._connexion = sqlite3.connect(chemin, timeout=60)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute("""CREATE TABLE IF NOT EXISTS resultats (
+            cle TEXT PRIMARY KEY, instance TEXT, primaire TEXT, cle_json TEXT,
+            statut TEXT, objectifs TEXT, planning BLOB, taille INTEGER, dernier_acces REAL)""")
+        self._connexion.commit()
+
+    # Options pour rouvrir le cache dans un processus de calcul
+    def options_processus(self):
+        return {'chemin': self.chemin, 'taille_max_mo': self.taille_max_mo}
+
+    def __len__(self):
+        return self._connexion.execute("SELECT COUNT(*) FROM resultats").fetchone()[0]
+
+    def taille_octets(self):
+        return self._connexion.execute("SELECT COALESCE(SUM(taille), 0) FROM resultats").fetchone()[0]
+
+    def _cle(self, nom_instance, model_options, primary_objective, epsilon_values, variante):
+        contenu = {
+            'instance': load_instance_arrays(nom_instance).content_hash,
+            'options': {**OPTIONS_DEFAUT, **(model_options or {})},
+            'primaire': primary_objective,
+            'epsilon': {obj: float(eps) for obj, eps in sorted(epsilon_values.items())},
+            'variante': variante,
+        }
+        cle_json = json.dumps(contenu, sort_keys=True)
+        return hashlib.sha1(cle_json.encode()).hexdigest(), cle_json
+
+    # Résultat connu : (statut, objectifs, planning), planning et objectifs valant None pour un infaisable ; sinon None
+    def chercher(self, nom_instance, model_options, primary_objective, epsilon_values, variante='epsilon'):
+        cle, _ = self._cle(nom_instance, model_options, primary_objective, epsilon_values, variante)
+        ligne = self._connexion.execute("SELECT statut, objectifs, planning FROM resultats WHERE cle = ?", (cle,)).fetchone()
+        if ligne is None:
+            self.manques += 1
+            return None
+        self.trouves += 1
+        self._connexion.execute("UPDATE resultats SET dernier_acces = ? WHERE cle = ?", (time.time(), cle))
+        self._connexion.commit()
+        statut, objectifs, blob = ligne
+        planning = Planning.charger(io.BytesIO(blob)) if blob is not None else None
+        return statut, json.loads(objectifs) if objectifs else None, planning
+
+    def enregistrer(self, nom_instance, model_options, primary_objective, epsilon_values, statut, objectifs=None, planning=None,
+                    variante='epsilon'):
+        if statut not in STATUTS_PROUVES:
+            return False
+        cle, cle_json = self._cle(nom_instance, model_options, primary_objective, epsilon_values, variante)
+        blob = None
+        if planning is not None:
+            tampon = io.BytesIO()
+            planning.sauvegarder(tampon)
+            blob = tampon.getvalue()
+        objectifs_json = json.dumps({obj: float(v) for obj, v in objectifs.items()}) if objectifs else None
+        taille = len(cle_json) + len(objectifs_json or "") + len(blob or b"")
+        self._connexion.execute("INSERT OR REPLACE INTO resultats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                (cle, nom_instance, primary_objective, cle_json, statut, objectifs_json, blob, taille, time.time()))
+        self._connexion.commit()
+        self._evincer()
+        return True
+
+    # Éviction LRU : on descend à 90 % de la taille maximale pour ne pas évincer à chaque écriture
+    def _evincer(self):
+        taille_max = self.taille_max_mo * 1e6
+        total = self.taille_octets()
+        if total <= taille_max:
+            return
+        a_liberer = total - 0.9 * taille_max
+        cles = []
+        for cle, taille in self._connexion.execute("SELECT cle, taille FROM resultats ORDER BY dernier_acces"):
+            if a_liberer <= 0:
+                break
+            cles.append((cle,))
+            a_liberer -= taille
+        self._connexion.executemany("DELETE FROM resultats WHERE cle = ?", cles)
+        self._connexion.commit()
+
+    def vider(self):
+        self._connexion.execute("DELETE FROM resultats")
+        self._connexion.commit()
+
+    def afficher(self):
+        print(f"Cache {self.chemin} : {len(self)} résultats ({self.taille_octets() / 1e6:.1f} Mo), "
+              f"{self.trouves} trouvés / {self.manques} manqués dans cette session")
+
+    def fermer(self):
+        self._connexion.close()
+
+def cache_depuis_options(options):
+    return CacheResultats(**options) if options else None
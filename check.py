@@ -1,149 +1,118 @@
-import pyomo.environ as pyo
+import numpy as np
+from extraction import load_instance_arrays
+from planning import Planning, extraire_planning
 
-def check_solution(model, tolerance=1e-6):
+# Types de violation, dans l'ordre des vérifications
+TYPES_VIOLATION = ['qualification', 'conges', 'unicite', 'depassement', 'completion', 'coherence_f']
+
+def _violation(type_, gravite, ampleur, message, **indices):
+    return {'type': type_, 'gravite': gravite, 'indices': {k: int(v) for k, v in indices.items()},
+            'ampleur': float(ampleur), 'message': message}
+
+def verifier_solution(solution, tolerance=1e-6, instance=None):
+    """
+    Vérifie une solution (Planning, cf. planning.py, ou modèle résolu dont on extrait le planning)
+    par des réductions sur les cellules affectées (h,s,q,p) du planning, sans tableau dense H×S×Q×P.
+    instance : Instance déjà chargée (obligatoire si le planning n'a pas de nom d'instance, ex. sous-problèmes de lns.py).
+    Renvoie la liste des violations : type, gravité ('erreur' ou 'avertissement'), indices 1-based, ampleur, message.
+    Une liste sans 'erreur' signifie que la solution est valide.
+    """
+    planning = solution if isinstance(solution, Planning) else extraire_planning(solution)
+    instance = instance if instance is not None else load_instance_arrays(planning.nom_instance)
+    cellules = np.unique(planning.cellules, axis=0)        # [k,4] (h,s,q,p), triées
+    h_c, s_c, q_c, p_c = cellules.T
+    c = instance.c                                         # [S,Q]
+    v = instance.v                                         # [S,H]
+    n = instance.n.astype(float)                           # [P,Q]
+    f = planning.f
+
+    violations = []
+
+    # 1. Qualifications : pas d'affectation sans la compétence
+    for h, s, q, p in cellules[c[s_c, q_c] < 0.5]:
+        violations.append(_violation('qualification', 'erreur', 1,
+                                     f"Staff {s+1} (n'a pas Qual {q+1}) est affecté à Proj {p+1} au jour {h+1}.",
+                                     h=h+1, s=s+1, q=q+1, p=p+1))
+
+    # 2. Congés et unicité journalière : nombre d'affectations par (h,s)
+    jours, travail_jour = np.unique(cellules[:, :2], axis=0, return_counts=True)
+    jours = jours.reshape(-1, 2)
+    en_conge = v[jours[:, 1], jours[:, 0]] > 0.5
+    for (h, s), nb in zip(jours[en_conge], travail_jour[en_conge]):
+        violations.append(_violation('conges', 'erreur', nb,
+                                     f"Staff {s+1} travaille le jour {h+1} ({nb} affectations) mais est en congé.",
+                                     h=h+1, s=s+1))
+    multiples = ~en_conge & (travail_jour > 1)
+    for (h, s), nb in zip(jours[multiples], travail_jour[multiples]):
+        violations.append(_violation('unicite', 'erreur', nb - 1,
+                                     f"Staff {s+1} est affecté à {nb} tâches le jour {h+1} (max 1).",
+                                     h=h+1, s=s+1))
+
+    # 3. Jours affectés par projet et qualification : pas de dépassement, couverture complète si le projet est fini
+    travail_pq = np.zeros_like(n)                          # [P,Q]
+    np.add.at(travail_pq, (p_c, q_c), 1)
+    for p, q in np.argwhere(travail_pq > n + tolerance):
+        violations.append(_violation('depassement', 'erreur', travail_pq[p, q] - n[p, q],
+                                     f"Proj {p+1}/Qual {q+1}: {travail_pq[p, q]:.0f} jours affectés (max requis {n[p, q]:.0f}).",
+                                     p=p+1, q=q+1))
+    fini = f > 0.5
+    for p, q in np.argwhere(fini[:, None] & (n > 0) & (travail_pq < n - tolerance)):
+        violations.append(_violation('completion', 'erreur', n[p, q] - travail_pq[p, q],
+                                     f"Proj {p+1} est marqué 'fini' mais Qual {q+1} n'a que {travail_pq[p, q]:.1f} / {n[p, q]:.0f} jours.",
+                                     p=p+1, q=q+1))
+
+    # 4. Cohérence de f avec le travail total du projet
+    requis = n.sum(axis=1)
+    ratio = np.divide(travail_pq.sum(axis=1), requis, out=np.zeros_like(requis), where=requis > 0)
+    for p in np.flatnonzero((requis > 0) & fini & (ratio < 1 - tolerance)):
+        violations.append(_violation('coherence_f', 'erreur', 1 - ratio[p],
+                                     f"Proj {p+1}: f=1 mais ratio travail = {ratio[p]:.2f}.", p=p+1))
+    for p in np.flatnonzero((requis > 0) & ~fini & (ratio >= 1 - tolerance)):
+        violations.append(_violation('coherence_f', 'avertissement', ratio[p],
+                                     f"Proj {p+1}: f=0 mais ratio travail = {ratio[p]:.2f}.", p=p+1))
+
+    return violations
+
+def solution_valide(violations):
+    return not any(v['gravite'] == 'erreur' for v in violations)
+
+def check_solution(solution, tolerance=1e-6, instance=None):
     """
-    Vérifie que la solution (stockée dans model.a et model.f) 
-    respecte toutes les contraintes du problème.
-    
-    Prend en entrée le modèle Pyomo *résolu*.
+    Vérifie que la solution respecte toutes les contraintes du problème, et affiche le rapport.
+
+    Prend en entrée un Planning ou le modèle Pyomo *résolu* (instance : cf. verifier_solution).
     Retourne True si tout est valide, False sinon.
     """
     print("--- DÉBUT DE LA VÉRIFICATION DE LA SOLUTION ---")
-    all_ok = True
-
-    # Accès aux ensembles pour itérer
-    try:
-        H_set = model.H
-        S_set = model.S
-        Q_set = model.Q
-        P_set = model.P
-    except AttributeError:
-        print("ERREUR: Le modèle ne semble pas contenir les ensembles H, S, Q, P.")
-        return False
-
-    # ---
-    # 1. Contrainte de qualification (competences_rule)
-    # ---
-    print("\n## 1. Vérification : Qualifications du personnel")
-    temp_ok = True
-    for h in H_set:
-        for s in S_set:
-            for q in Q_set:
-                # Si la personne n'a PAS la compétence...
-                if model.c[s,q] < 0.5:  
-                    for p in P_set:
-                        # ... elle ne doit jamais y être affectée
-                        if model.a[h,s,q,p].value > tolerance: 
-                            print(f"   ERREUR [Qualification]: Staff {s} (n'a pas Qual {q}) "
-                                  f"est affecté à Proj {p} au jour {h}.")
-                            all_ok = temp_ok = False
-    if temp_ok:
-        print("OK : Personne n'est affecté à une tâche sans la compétence requise.")
-
-    # ---
-    # 2. Contrainte d'unicité journalière et de congés (vacances_rule)
-    # ---
-    print("\n## 2. Vérification : Unicité journalière et congés")
-    temp_ok = True
-    for h in H_set:
-        for s in S_set:
-            # On somme tout le travail de la personne 's' le jour 'h'
-            daily_work = sum(model.a[h,s,q,p].value for q in Q_set for p in P_set) 
-            
-            # Cas 1: Vérification des congés
-            if model.v[s,h] > 0.5:
-                if daily_work > tolerance:
-                    print(f"ERREUR [Congés]: Staff {s} travaille le jour {h} "
-                          f"({daily_work} affectations) mais est en congé.")
-                    all_ok = temp_ok = False
-            
-            # Cas 2: Vérification de l'unicité (s'il n'est pas en congé)
-            else:
-                if daily_work > 1 + tolerance:
-                    print(f"ERREUR [Unicité]: Staff {s} est affecté à {daily_work} tâches "
-                          f"le jour {h} (max 1).")
-                    all_ok = temp_ok = False
-    if temp_ok:
-        print("  OK : Chaque personne a au plus une tâche par jour et ne travaille pas en congé.")
-
-    # ---
-    # 3. Contrainte de couverture des qualifications 
-    # ---
-    print("\n## 3. Vérification : Logique métier de complétion")
-    temp_ok = True
-    
-    # Vérif "non-dépassement" 
-    for p in P_set:
-        for q in Q_set:
-            if model.n[p,q] == 0: continue 
-            
-            total_skill_work = sum(model.a[h,s,q,p].value for h in H_set for s in S_set) 
-            
-            if total_skill_work > model.n[p,q] + tolerance: 
-                print(f"ERREUR [Dépassement]: Proj {p}/Qual {q}: {total_skill_work} jours affectés "
-                      f"(max requis {model.n[p,q]}).") 
-                all_ok = temp_ok = False
-
-    # Vérif logique de complétion
-    for p in P_set:
-        total_work_required_projet = sum(model.n[p,q] for q in Q_set)
-        if total_work_required_projet == 0: continue
-
-        # On regarde si le projet est marqué "fini" (maintenant sans dépendance temporelle)
-        if model.f[p].value > 0.5: 
-            # Si FINI, on vérifie CHAQUE compétence
-            for q in Q_set:
-                if model.n[p,q] > 0:
-                    
-                    total_work_for_skill = sum(model.a[h,s,q,p].value for h in H_set for s in S_set) # (variable)
-                    
-                    if total_work_for_skill < model.n[p,q] - tolerance: 
-                        print(f"ERREUR [Logique Métier]: Proj {p} est marqué 'fini'")
-                        print(f"mais Qual {q} n'a que {total_work_for_skill:.1f} / {model.n[p,q]} jours.") 
-                        all_ok = temp_ok = False
-    
-    if temp_ok:
-        print("  OK : Les projets marqués 'finis' ont bien toutes leurs compétences couvertes.")
-
-    # ---
-    # 4. Contrainte de cohérence (fini_rule)
-    # ---
-    print("\n## 4. Vérification : Cohérence interne (variable 'f' vs 'a')")
-    temp_ok = True
-    for p in P_set:
-        total_work_required = sum(model.n[p,q] for q in Q_set) 
-        if total_work_required == 0: continue
-
-        # Calcul du travail total effectué pour ce projet
-        total_work_done = sum(model.a[t,s,q,p].value for s in S_set for q in Q_set for t in H_set) # (variable)
-        
-        ratio = 0.0
-        if total_work_required > 0:
-            ratio = total_work_done / total_work_required
-        
-        if model.f[p].value > 0.5 and ratio < 1.0 - tolerance: # (variable)
-            print(f"ERREUR [Cohérence f]: Proj {p}: f=1 mais ratio travail = {ratio:.2f}.")
-            all_ok = temp_ok = False
-        
-        if model.f[p].value < 0.5 and ratio >= 1.0 - tolerance: # (variable)
-             print(f"AVERTISSEMENT [Cohérence f]: Proj {p}: f=0 mais ratio travail = {ratio:.2f}.")
- 
-    if temp_ok:
-        print("OK : La variable 'f' est (globalement) cohérente avec les affectations.")
-
-    # ---
-    # 5. Contrainte d'unicité de réalisation
-    # ---
+    violations = verifier_solution(solution, tolerance, instance)
+
+    sections = [
+        ("1. Vérification : Qualifications du personnel", ['qualification'],
+         "OK : Personne n'est affecté à une tâche sans la compétence requise."),
+        ("2. Vérification : Unicité journalière et congés", ['conges', 'unicite'],
+         "OK : Chaque personne a au plus une tâche par jour et ne travaille pas en congé."),
+        ("3. Vérification : Logique métier de complétion", ['depassement', 'completion'],
+         "OK : Les projets marqués 'finis' ont bien toutes leurs compétences couvertes."),
+        ("4. Vérification : Cohérence interne (variable 'f' vs 'a')", ['coherence_f'],
+         "OK : La variable 'f' est (globalement) cohérente avec les affectations."),
+    ]
+    for titre, types, message_ok in sections:
+        print(f"\n## {titre}")
+        trouvees = [v for v in violations if v['type'] in types]
+        for v in trouvees:
+            etiquette = 'ERREUR' if v['gravite'] == 'erreur' else 'AVERTISSEMENT'
+            print(f"   {etiquette} [{v['type']}]: {v['message']}")
+        if not any(v['gravite'] == 'erreur' for v in trouvees):
+            print(f"  {message_ok}")
+
     print("\n## 5. Vérification : Unicité de réalisation")
     print("OK : Garanti par la contrainte (3) de couverture maximale.")
 
-    # ---
-    # CONCLUSION
-    # ---
     print("\n--- FIN DE LA VÉRIFICATION ---")
+    all_ok = solution_valide(violations)
     if all_ok:
         print("\n Félicitations ! La solution semble valide et respecte toutes les contraintes.")
     else:
         print("\n ATTENTION ! La solution est INVALIDE. Des contraintes ont été violées.")
-        
-    return all_ok
\ No newline at end of file
+
+    return all_ok
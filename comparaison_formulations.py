@@ -0,0 +1,66 @@
+import time
+from pyomo.environ import *
+from build_model import build_model, FORMULATIONS
+from solve_model import set_objective
+
+# Taille du modèle : nombre de variables et de contraintes actives
+def taille_modele(model):
+    nb_variables = sum(len(v) for v in model.component_objects(Var, active=True))
+    nb_contraintes = sum(len(c) for c in model.component_objects(Constraint, active=True))
+    return nb_variables, nb_contraintes
+
+# Valeur de la relaxation continue du modèle (plus elle est proche de l'optimum entier, plus la formulation est forte)
+def borne_relaxation(model, solver_name='gurobi'):
+    relaxe = model.clone()
+    TransformationFactory('core.relax_integer_vars').apply_to(relaxe)
+    SolverFactory(solver_name).solve(relaxe)
+    return value(relaxe.obj)
+
+# Compare les formulations (nombre de lignes, borne LP, temps de résolution) sur plusieurs instances
+def comparer_formulations(instances, objectif='profit', formulations=FORMULATIONS, sparse=True,
+                          solver_name='gurobi', time_limit_sec=120):
+    lignes = []
+    for nom_instance in instances:
+        for formulation in formulations:
+            t0 = time.perf_counter()
+            model = build_model(nom_instance, sparse=sparse, formulation=formulation)
+            t_build = time.perf_counter() - t0
+            set_objective(model, objectif)
+            nb_var, nb_cons = taille_modele(model)
+            borne_lp = borne_relaxation(model, solver_name)
+
+            solver = SolverFactory(solver_name)
+            if solver_name.startswith('appsi'):
+                solver.config.time_limit = time_limit_sec
+            else:
+                solver.options['TimeLimit'] = time_limit_sec
+            t0 = time.perf_counter()
+            result = solver.solve(model)
+            t_solve = time.perf_counter() - t0
+
+            lignes.append({
+                'instance': nom_instance,
+                'formulation': formulation,
+                'variables': nb_var,
+                'contraintes': nb_cons,
+                'build_s': t_build,
+                'solve_s': t_solve,
+                'borne_lp': borne_lp,
+                'status': str(result.solver.termination_condition),
+                'objectif': value(model.obj),
+            })
+
+    print(f"{'instance':<8} {'formulation':<18} {'variables':>9} {'contraintes':>11} {'build (s)':>9} {'solve (s)':>9} {'borne LP':>9}  {'status':<12} {objectif}")
+    for l in lignes:
+        print(f"{l['instance']:<8} {l['formulation']:<18} {l['variables']:>9} {l['contraintes']:>11} "
+              f"{l['build_s']:>9.2f} {l['solve_s']:>9.2f} {l['borne_lp']:>9.1f}  {l['status']:<12} {l['objectif']:.0f}")
+    return lignes
+
+
+if __name__ == "__main__":
+
+    INSTANCES = ["toy", "medium", "large"]
+    SOLVEUR = 'gurobi'     # 'gurobi', ou 'appsi_highs' sans licence Gurobi complète
+    TIME_LIMIT_SEC = 120
+
+    comparer_formulations(INSTANCES, solver_name=SOLVEUR, time_limit_sec=TIME_LIMIT_SEC)
@@ -0,0 +1,105 @@
+import time
+import numpy as np
+
+# --- Filtre de Pareto vectorisé
+# valeurs : tableau (n, k), une ligne par point, une colonne par objectif.
+# maximiser : liste de k booléens (True si l'objectif est maximisé), par défaut tout est minimisé.
+# Renvoie un masque booléen des points non dominés. Deux points égaux ne se dominent pas : les doublons sont gardés.
+
+def masque_non_domines(valeurs, maximiser=None, taille_bloc=512):
+    valeurs = np.asarray(valeurs, dtype=float)
+    if valeurs.ndim != 2:
+        raise ValueError("valeurs doit être un tableau (n points, k objectifs)")
+    n, k = valeurs.shape
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+
+    # On se ramène à une minimisation sur toutes les colonnes
+    if maximiser is not None:
+        valeurs = np.where(np.asarray(maximiser, dtype=bool), -valeurs, valeurs)
+
+    if k == 1:
+        return valeurs[:, 0] == valeurs[:, 0].min()
+    if k == 2:
+        return _masque_2_objectifs(valeurs)
+    return _masque_par_blocs(valeurs, taille_bloc)
+
+# Deux objectifs, en O(n log n) : après tri sur (f1, f2), un point est dominé si un point de f1 strictement plus petit
+# a un f2 <= au sien, ou si un point de même f1 a un f2 strictement plus petit.
+def _masque_2_objectifs(valeurs):
+    f1, f2 = valeurs[:, 0], valeurs[:, 1]
+    ordre = np.lexsort((f2, f1))
+    f1_tri, f2_tri = f1[ordre], f2[ordre]
+
+    # Début du groupe de même f1 pour chaque point trié
+    nouveau_groupe = np.r_[True, f1_tri[1:] != f1_tri[:-1]]
+    debut_groupe = np.maximum.accumulate(np.where(nouveau_groupe, np.arange(len(f1_tri)), 0))
+
+    # Plus petit f2 parmi les groupes précédents (inf pour le premier groupe)
+    min_cumule = np.minimum.accumulate(f2_tri)
+    min_precedent = np.where(debut_groupe > 0, min_cumule[np.maximum(debut_groupe - 1, 0)], np.inf)
+
+    domine_tri = (min_precedent <= f2_tri) | (f2_tri > f2_tri[debut_groupe])
+    masque = np.empty(len(f1), dtype=bool)
+    masque[ordre] = ~domine_tri
+    return masque
+
+# b domine a (minimisation), comparaison de tous les couples : résultat (len(a), len(b))
+def _domines_par(a, b):
+    inferieur_ou_egal = (b[None, :, :] <= a[:, None, :]).all(axis=2)
+    strictement = (b[None, :, :] < a[:, None, :]).any(axis=2)
+    return (inferieur_ou_egal & strictement).any(axis=1)
+
+# Trois objectifs ou plus : un point ne peut être dominé que par un point de somme strictement plus petite.
+# On parcourt les points par somme croissante, par blocs : chaque bloc est comparé au front déjà trouvé puis à lui-même.
+def _masque_par_blocs(valeurs, taille_bloc):
+    ordre = np.argsort(valeurs.sum(axis=1), kind='stable')
+    valeurs_tri = valeurs[ordre]
+    garde_tri = np.zeros(len(valeurs_tri), dtype=bool)
+    front = valeurs_tri[:0]
+
+    for debut in range(0, len(valeurs_tri), taille_bloc):
+        bloc = valeurs_tri[debut:debut + taille_bloc]
+        domine = np.zeros(len(bloc), dtype=bool)
+        # Comparaison au front par morceaux pour borner la mémoire (bloc x morceau x k)
+        for d in range(0, len(front), taille_bloc):
+            domine |= _domines_par(bloc, front[d:d + taille_bloc])
+        # Les survivants ne sont comparés qu'entre eux : un point dominé par le front l'est aussi par son dominant
+        survivants = np.flatnonzero(~domine)
+        domine[survivants] = _domines_par(bloc[survivants], bloc[survivants])
+
+        garde_tri[debut:debut + len(bloc)] = ~domine
+        front = np.vstack([front, bloc[~domine]])
+
+    masque = np.empty(len(valeurs), dtype=bool)
+    masque[ordre] = garde_tri
+    return masque
+
+
+# --- Benchmark sur des points synthétiques
+
+# Référence O(n²) : même règle de dominance, sans astuce
+def _masque_naif(valeurs):
+    return ~np.array([_domines_par(valeurs[i:i+1], valeurs)[0] for i in range(len(valeurs))])
+
+def _points_synthetiques(n, k, graine=0):
+    # Valeurs entières, comme les objectifs du modèle (profit, retard, nb_projets_max, duree)
+    rng = np.random.default_rng(graine)
+    return rng.integers(0, 1000, size=(n, k)).astype(float)
+
+def benchmark(tailles=(10_000, 100_000), nb_objectifs=(2, 3, 4), taille_verification=2000):
+    for k in nb_objectifs:
+        # Vérification contre la référence sur un petit échantillon
+        echantillon = _points_synthetiques(taille_verification, k, graine=1)
+        assert (masque_non_domines(echantillon) == _masque_naif(echantillon)).all()
+
+        for n in tailles:
+            valeurs = _points_synthetiques(n, k)
+            t0 = time.perf_counter()
+            masque = masque_non_domines(valeurs)
+            duree = time.perf_counter() - t0
+            print(f"k={k} n={n:>7} : {masque.sum():>6} points non dominés en {duree:.3f}s")
+
+
+if __name__ == "__main__":
+    benchmark()
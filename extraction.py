@@ -1,79 +1,190 @@
 import json
 import os
+import hashlib
+import tempfile
+import numpy as np
 from pyomo.environ import *
 
-def load_instance(instance_name):
+# Compiled copies of the JSON instances (.npz), keyed by a hash of the JSON content
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".instance_cache")
+
+# In-process memo: (path, mtime) -> Instance
+_memo = {}
+
+
+class Instance:
     """
-    Load instance data from JSON file and set up Pyomo model
-    
-    Parameters:
-    instance_name (str): Name of the instance ('toy', 'medium', or 'large')
-    
-    Returns:
-    model: Pyomo ConcreteModel with all parameters and variables set
+    Instance data backed by NumPy arrays (0-based: index p-1, q-1, s-1, h-1)
+
+    n[P,Q] : working days per job per qualification
+    v[S,H] : vacations (1 if on vacation)
+    c[S,Q] : skills (1 if staff has qualification)
+    d, g, r : due date, gain and daily penalty per job
+    """
+
+    def __init__(self, horizon, n, v, c, d, g, r, staff_names, job_names, qual_names):
+        self.horizon = int(horizon)
+        self.n = n
+        self.v = v
+        self.c = c
+        self.d = d
+        self.g = g
+        self.r = r
+        self.staff_names = list(staff_names)
+        self.job_names = list(job_names)
+        self.qual_names = list(qual_names)
+        self.content_hash = None  # SHA-1 of the JSON file, set by load_instance_arrays
+
+    @property
+    def Hmax(self):
+        return self.horizon
+
+    @property
+    def Smax(self):
+        return self.c.shape[0]
+
+    @property
+    def Pmax(self):
+        return self.n.shape[0]
+
+    @property
+    def Qmax(self):
+        return self.n.shape[1]
+
+    def as_dicts(self):
+        """1-based dicts with explicit zeros, as expected by Pyomo Params: n, v, g, c, d, r"""
+        n_values = {(p+1, q+1): int(x) for (p, q), x in np.ndenumerate(self.n)}
+        v_values = {(s+1, h+1): int(x) for (s, h), x in np.ndenumerate(self.v)}
+        c_values = {(s+1, q+1): int(x) for (s, q), x in np.ndenumerate(self.c)}
+        g_values = {p+1: int(x) for p, x in enumerate(self.g)}
+        d_values = {p+1: int(x) for p, x in enumerate(self.d)}
+        r_values = {p+1: int(x) for p, x in enumerate(self.r)}
+        return n_values, v_values, g_values, c_values, d_values, r_values
+
+
+# Instances written by generate_instance.py
+GENERATED_DIR = os.path.join(os.path.dirname(__file__), "generated_instances")
+
+
+def instance_path(instance_name):
     """
-    
-    # Load the JSON data
+    JSON file of an instance: a path to a .json file, or a name ('toy', 'medium', 'large',
+    or a generated instance such as 'large_x4' found in GENERATED_DIR)
+    """
+    if instance_name.endswith(".json") or os.sep in instance_name:
+        return instance_name
     base_path = os.path.dirname(__file__)
     filepath = os.path.join(base_path, f"{instance_name}_instance.json")
-    with open(filepath, "r") as f:
-        data = json.load(f)
-    
-    # Extract data from JSON
+    generated = os.path.join(GENERATED_DIR, f"{instance_name}_instance.json")
+    if not os.path.exists(filepath) and os.path.exists(generated):
+        return generated
+    return filepath
+
+
+def _parse_json(raw):
+    """Build the arrays of an Instance from the JSON content"""
+    data = json.loads(raw)
+
     Hmax = data['horizon']  # Time horizon
     staff = data['staff']   # Staff information
     jobs = data['jobs']     # Job information
     qualifications = data['qualifications']  # Qualifications
-    
-    # Calculate dimensions
-    Smax = len(staff)       # Number of staff members
-    Pmax = len(jobs)        # Number of jobs
-    Qmax = len(qualifications)  # Number of qualifications
-    
-    # Create mappings for indices
-    staff_names = [s['name'] for s in staff]
-    job_names = [j['name'] for j in jobs]
-    qual_names = qualifications
-    
-    # Create qualification to index mapping
-    qual_to_index = {q: i+1 for i, q in enumerate(qualifications)}
-
-    # Parameters initialization
-    n_values = {}  # Number of working days per job per qualification
-    v_values = {}  # Vacations (1 if on vacation, 0 otherwise)
-    g_values = {}  # Gain per project
-    c_values = {}  # Skills (1 if staff has qualification, 0 otherwise)
-    d_values = {}  # Due date per project
-    dp_values = {} # Daily penalty per project
-    
-    # Fill n_values (working days per job per qualification)
-    # Initialize all values to 0 first
-    for p in range(1, Pmax+1):
-        for q in range(1, Qmax+1):
-            n_values[p, q] = 0
-    
-    for p, job in enumerate(jobs, 1):
-        d_values[p] = job['due_date']
-        g_values[p] = job['gain']
-        dp_values[p] = job['daily_penalty']  # Adding daily penalty
+
+    qual_to_index = {q: i for i, q in enumerate(qualifications)}
+    Smax, Pmax, Qmax = len(staff), len(jobs), len(qualifications)
+
+    n = np.zeros((Pmax, Qmax), dtype=np.int32)
+    d = np.zeros(Pmax, dtype=np.int32)
+    g = np.zeros(Pmax, dtype=np.int32)
+    r = np.zeros(Pmax, dtype=np.int32)
+    for p, job in enumerate(jobs):
+        d[p] = job['due_date']
+        g[p] = job['gain']
+        r[p] = job['daily_penalty']
         for qual, days in job['working_days_per_qualification'].items():
-            q = qual_to_index[qual]
-            n_values[p, q] = days
-    
-    # Fill c_values (skills matrix)
-    for s, staff_member in enumerate(staff, 1):
-        for q, qual in enumerate(qualifications, 1):
-            if qual in staff_member['qualifications']:
-                c_values[s, q] = 1
-            else:
-                c_values[s, q] = 0
-    
-    # Fill v_values (vacations)
-    for s, staff_member in enumerate(staff, 1):
-        for h in range(1, Hmax+1):
-            if h in staff_member['vacations']:
-                v_values[s, h] = 1
-            else:
-                v_values[s, h] = 0
-
-    return Hmax, Smax, Pmax,Qmax,n_values,v_values,g_values,c_values,d_values,dp_values, staff_names, job_names, qual_names
+            n[p, qual_to_index[qual]] = days
+
+    c = np.zeros((Smax, Qmax), dtype=np.int8)
+    v = np.zeros((Smax, Hmax), dtype=np.int8)
+    for s, staff_member in enumerate(staff):
+        c[s, [qual_to_index[q] for q in staff_member['qualifications']]] = 1
+        # Vacation days outside the horizon are ignored, as before
+        days = [h - 1 for h in staff_member['vacations'] if 1 <= h <= Hmax]
+        v[s, days] = 1
+
+    return Instance(Hmax, n, v, c, d, g, r,
+                    [s['name'] for s in staff], [j['name'] for j in jobs], qualifications)
+
+
+def _save_npz(instance, cache_file):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    # One temporary file per writer: worker processes loading the same instance cold never share it
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_file), suffix=".tmp.npz", delete=False) as tmp:
+        np.savez(tmp, horizon=instance.horizon, n=instance.n, v=instance.v, c=instance.c,
+                 d=instance.d, g=instance.g, r=instance.r,
+                 staff_names=np.array(instance.staff_names, dtype=str),
+                 job_names=np.array(instance.job_names, dtype=str),
+                 qual_names=np.array(instance.qual_names, dtype=str))
+    # Atomic replace: a concurrent reader never sees a half-written file
+    try:
+        os.replace(tmp.name, cache_file)
+    except OSError:
+        os.remove(tmp.name)
+        raise
+
+
+def _load_npz(cache_file):
+    with np.load(cache_file, allow_pickle=False) as f:
+        return Instance(f['horizon'], f['n'], f['v'], f['c'], f['d'], f['g'], f['r'],
+                        f['staff_names'].tolist(), f['job_names'].tolist(), f['qual_names'].tolist())
+
+
+def load_instance_arrays(instance_name, use_cache=True):
+    """
+    Load an instance as an Instance object (NumPy arrays)
+
+    Repeated loads in the same process come from a memo keyed by (path, mtime).
+    Otherwise the compiled .npz copy in CACHE_DIR is used when the JSON content hash matches;
+    it is (re)written after parsing the JSON.
+    """
+    filepath = instance_path(instance_name)
+    key = (os.path.abspath(filepath), os.path.getmtime(filepath))
+    if use_cache and key in _memo:
+        return _memo[key]
+
+    with open(filepath, "rb") as f:
+        raw = f.read()
+
+    instance = None
+    content_hash = hashlib.sha1(raw).hexdigest()
+    cache_file = os.path.join(CACHE_DIR, content_hash + ".npz")
+    if use_cache and os.path.exists(cache_file):
+        try:
+            instance = _load_npz(cache_file)
+        except (OSError, ValueError, KeyError):
+            instance = None  # unreadable cache: parse the JSON again
+    if instance is None:
+        instance = _parse_json(raw)
+        if use_cache:
+            _save_npz(instance, cache_file)
+    instance.content_hash = content_hash
+
+    if use_cache:
+        _memo[key] = instance
+    return instance
+
+
+def load_instance(instance_name):
+    """
+    Load instance data from JSON file (through the array cache, see load_instance_arrays)
+
+    Parameters:
+    instance_name (str): Name of the instance ('toy', 'medium', 'large', a generated instance) or path to a JSON file
+
+    Returns:
+    Hmax, Smax, Pmax, Qmax, then the 1-based dicts n, v, g, c, d, daily penalty, and the staff, job and qualification names
+    """
+    instance = load_instance_arrays(instance_name)
+    n_values, v_values, g_values, c_values, d_values, dp_values = instance.as_dicts()
+    return (instance.Hmax, instance.Smax, instance.Pmax, instance.Qmax, n_values, v_values, g_values, c_values, d_values, dp_values,
+            instance.staff_names, instance.job_names, instance.qual_names)
@@ -0,0 +1,127 @@
+import json
+import math
+import os
+import numpy as np
+from extraction import GENERATED_DIR
+
+# --- Générateur d'instances synthétiques (même schéma JSON que toy/medium/large)
+
+# Paramètres proches de l'instance 'large' (36 jours, 6 personnes, 10 qualifications, 25 projets)
+PARAMETRES_LARGE = {
+    'horizon': 36,
+    'nb_staff': 6,
+    'nb_qualifications': 10,
+    'qualifications_par_personne': (2, 5),
+    'nb_jobs': 25,
+    'qualifications_par_projet': (1, 4),
+    'jours_par_qualification': (1, 8),
+    'loi_charge': 'uniforme',
+    'densite_vacances': 0.1,
+    'tension_echeances': 0.6,
+}
+
+LOIS_CHARGE = ['uniforme', 'geometrique']
+
+def _noms_qualifications(nb_qualifications):
+    if nb_qualifications <= 26:
+        return [chr(ord('A') + i) for i in range(nb_qualifications)]
+    return [f"Q{i+1}" for i in range(nb_qualifications)]
+
+# Jours de travail demandés pour une qualification d'un projet
+#   'uniforme'    : entier uniforme entre min et max
+#   'geometrique' : beaucoup de petites tâches et quelques grosses (moyenne au milieu de l'intervalle), tronqué à max
+def _tirer_charge(rng, loi_charge, jours_min, jours_max, taille):
+    if loi_charge == 'uniforme':
+        return rng.integers(jours_min, jours_max + 1, size=taille)
+    if loi_charge == 'geometrique':
+        moyenne = (jours_min + jours_max) / 2
+        tirage = jours_min - 1 + rng.geometric(1 / max(1.0, moyenne - jours_min + 1), size=taille)
+        return np.clip(tirage, jours_min, jours_max)
+    raise ValueError(f"Loi de charge inconnue : {loi_charge}")
+
+# Instance synthétique au format JSON (dict), reproductible pour une graine donnée.
+# densite_vacances : probabilité qu'une personne soit absente un jour donné
+# tension_echeances : 0 = toutes les échéances en fin d'horizon, 1 = échéances tirées sur tout l'horizon
+def generate_instance(horizon=36, nb_staff=6, nb_qualifications=10, qualifications_par_personne=(2, 5), nb_jobs=25,
+                      qualifications_par_projet=(1, 4), jours_par_qualification=(1, 8), loi_charge='uniforme',
+                      densite_vacances=0.1, tension_echeances=0.6, gain=(10, 60), penalite=3, graine=0):
+    rng = np.random.default_rng(graine)
+    qualifications = _noms_qualifications(nb_qualifications)
+
+    staff = []
+    for s in range(nb_staff):
+        nb_q = rng.integers(qualifications_par_personne[0], min(qualifications_par_personne[1], nb_qualifications) + 1)
+        quals = sorted(rng.choice(nb_qualifications, size=nb_q, replace=False).tolist())
+        vacances = (np.flatnonzero(rng.random(horizon) < densite_vacances) + 1).tolist()
+        staff.append({'name': f"Staff{s+1}", 'qualifications': quals, 'vacations': vacances})
+
+    # Chaque qualification est détenue par au moins une personne
+    for q in range(nb_qualifications):
+        if not any(q in s['qualifications'] for s in staff):
+            staff[rng.integers(nb_staff)]['qualifications'].append(q)
+    for s in staff:
+        s['qualifications'] = [qualifications[q] for q in sorted(s['qualifications'])]
+
+    jobs = []
+    for p in range(nb_jobs):
+        nb_q = rng.integers(qualifications_par_projet[0], min(qualifications_par_projet[1], nb_qualifications) + 1)
+        quals = sorted(rng.choice(nb_qualifications, size=nb_q, replace=False).tolist())
+        jours = _tirer_charge(rng, loi_charge, jours_par_qualification[0], jours_par_qualification[1], nb_q)
+
+        # Échéance au moins égale à la plus grosse tâche, et dans l'horizon
+        echeance = int(round(rng.uniform(1 - tension_echeances, 1) * horizon))
+        echeance = int(min(horizon, max(echeance, jours.max())))
+
+        jobs.append({
+            'name': f"Job{p+1}",
+            'gain': int(5 * round(rng.integers(gain[0], gain[1] + 1) / 5)),
+            'due_date': echeance,
+            'daily_penalty': penalite,
+            'working_days_per_qualification': {qualifications[q]: int(j) for q, j in zip(quals, jours)},
+        })
+
+    return {'horizon': horizon, 'qualifications': qualifications, 'staff': staff, 'jobs': jobs}
+
+# Écrit l'instance dans GENERATED_DIR sous le nom '<nom>_instance.json' : load_instance(nom) la retrouve ensuite
+def write_instance(data, nom, dossier=GENERATED_DIR):
+    os.makedirs(dossier, exist_ok=True)
+    chemin = os.path.join(dossier, f"{nom}_instance.json")
+    with open(chemin, "w") as f:
+        json.dump(data, f, indent=1)
+    return chemin
+
+# Paramètres d'une instance 'facteur' fois plus grande que la base :
+# personnes et projets multipliés par le facteur, horizon et qualifications par sa racine (horizon plafonné à un an).
+# La durée des tâches suit l'horizon pour garder le même rapport charge / capacité.
+def parametres_echelle(facteur, base=PARAMETRES_LARGE):
+    racine = math.sqrt(facteur)
+    parametres = dict(base)
+    parametres['nb_staff'] = int(round(base['nb_staff'] * facteur))
+    parametres['nb_jobs'] = int(round(base['nb_jobs'] * facteur))
+    parametres['horizon'] = int(min(365, round(base['horizon'] * racine)))
+    parametres['nb_qualifications'] = int(round(base['nb_qualifications'] * racine))
+    jours_min, jours_max = base['jours_par_qualification']
+    parametres['jours_par_qualification'] = (jours_min, int(round(jours_max * parametres['horizon'] / base['horizon'])))
+    return parametres
+
+# Échelle de tailles pour les benchmarks : écrit 'large_x2', 'large_x4', ... et renvoie leurs noms
+def size_ladder(facteurs=(2, 4, 8, 16, 32, 64), base=PARAMETRES_LARGE, prefixe='large', graine=0, dossier=GENERATED_DIR):
+    noms = []
+    for facteur in facteurs:
+        nom = f"{prefixe}_x{facteur}"
+        write_instance(generate_instance(**parametres_echelle(facteur, base), graine=graine), nom, dossier)
+        noms.append(nom)
+    return noms
+
+
+if __name__ == "__main__":
+
+    FACTEURS = (2, 4, 8, 16, 32, 64)
+    GRAINE = 0
+
+    for nom in size_ladder(FACTEURS, graine=GRAINE):
+        with open(os.path.join(GENERATED_DIR, f"{nom}_instance.json")) as f:
+            data = json.load(f)
+        charge = sum(sum(j['working_days_per_qualification'].values()) for j in data['jobs'])
+        print(f"{nom:<10} horizon={data['horizon']:>3}  staff={len(data['staff']):>4}  "
+              f"qualifications={len(data['qualifications']):>3}  jobs={len(data['jobs']):>5}  jours demandés={charge}")
@@ -0,0 +1,172 @@
+import time
+import numpy as np
+from extraction import load_instance_arrays
+from planning import Planning
+
+# --- Planning glouton, sans solveur
+# Les projets sont pris un par un, du plus rentable par jour de travail au moins rentable (puis par échéance) ;
+# chaque qualification d'un projet reçoit les jours libres les plus tôt des personnes qualifiées.
+# Un projet n'est gardé que s'il peut être fini et qu'il rapporte plus que son retard ne coûte, sinon ses jours sont rendus.
+# Respecte compétences (c), vacances (v), une tâche par personne et par jour, et charge par qualification (n).
+# Des bornes epsilon sur les objectifs minimisés (nb_projets_max, retard, duree) peuvent être imposées :
+# une personne au plafond ne rejoint plus de nouveau projet, un projet qui ferait dépasser retard ou duree est écarté.
+# Une borne sur le profit (maximisé) ne peut pas être imposée par construction.
+#
+# Les jours pris à une personne sont toujours ses premiers jours libres : il suffit de retenir combien
+# de ses jours libres sont déjà pris (pris[s]) ; jour_du_rang[s,k] donne son k-ième jour libre.
+# Une allocation se fait en quelques opérations NumPy sur les 'besoin' prochains jours libres des personnes qualifiées,
+# sans parcourir l'horizon.
+
+class _EtatGlouton:
+
+    def __init__(self, instance):
+        libre = instance.v == 0                                                 # [S,H]
+        H = libre.shape[1]
+        # jour_du_rang[s,k] : k-ième jour libre de s (0-based), H au-delà de ses jours libres ; prolongé de max(n)
+        # colonnes pour lire les 'besoin' jours suivant n'importe quel rang sans déborder
+        largeur = H + int(instance.n.max(initial=0))
+        self.jour_du_rang = np.full((instance.Smax, largeur), H, dtype=np.int32)
+        self.jour_du_rang[:, :H] = np.where(np.sort(~libre, axis=1, kind='stable'), H,
+                                            np.argsort(~libre, axis=1, kind='stable'))
+        self._jours_plats = self.jour_du_rang.ravel()
+        self._largeur = largeur
+        self.horizon = H
+        self.pris = np.zeros(instance.Smax, dtype=np.int64)
+        self._rangs = np.arange(largeur, dtype=np.int32)
+        # Les personnes les moins polyvalentes sont prises en premier à jour égal, pour garder les autres
+        polyvalence = instance.c.sum(axis=1)
+        self.qualifies = [s[np.argsort(polyvalence[s], kind='stable')]
+                          for s in (np.flatnonzero(instance.c[:, q]) for q in range(instance.Qmax))]
+
+    # Donne 'besoin' jours de la qualification q au plus tôt ; renvoie (personnes, jours) des cellules prises, ou None
+    # autorises : masque [S] des personnes qui peuvent être prises (None : toutes)
+    def allouer(self, q, besoin, autorises=None):
+        staff = self.qualifies[q]
+        if autorises is not None:
+            staff = staff[autorises[staff]]
+        m = len(staff)
+        if m == 0:
+            return None
+        # Les 'besoin' plus petites clés (jour, ordre dans staff) parmi les 'besoin' prochains jours libres de chacun :
+        # tous les jours libres restants avant le dernier jour T utilisé, puis le jour T dans l'ordre de staff
+        debuts = staff * self._largeur + self.pris[staff]
+        jours = self._jours_plats.take((debuts[:, None] + self._rangs[:besoin]).ravel())
+        cles = jours * m + np.repeat(self._rangs[:m], besoin)
+        if besoin < len(cles):
+            cles.partition(besoin - 1)
+            cles = cles[:besoin]
+        if cles.max() >= self.horizon * m:
+            return None
+        jours, indices = np.divmod(cles, m)
+        self.pris[staff] += np.bincount(indices, minlength=m)
+        return staff[indices], jours
+
+    # Rend les jours pris aux personnes d'un projet abandonné (une entrée par jour rendu)
+    def rendre(self, personnes):
+        self.pris -= np.bincount(personnes, minlength=len(self.pris))
+
+# Ordre de traitement des projets : gain par jour de travail décroissant, puis échéance, puis pénalité décroissante
+def ordre_projets(instance):
+    charge = instance.n.sum(axis=1)
+    densite = instance.g / np.maximum(1, charge)
+    return np.lexsort((-instance.r, instance.d, -densite))
+
+# Planning glouton de l'instance (Planning, cf. planning.py), avec la valeur des quatre objectifs
+# epsilon_values : bornes {objectif: epsilon} à respecter (cf. en-tête), comme pour un run epsilon-constraint
+def planning_glouton(nom_instance, epsilon_values=None):
+    t0 = time.perf_counter()
+    instance = load_instance_arrays(nom_instance)
+    P, Q = instance.n.shape
+    etat = _EtatGlouton(instance)
+    rarete = np.array([len(s) for s in etat.qualifies])
+    # Qualifications de chaque projet, les plus rares d'abord
+    quals_projet = [quals[np.argsort(rarete[quals], kind='stable')] for quals in map(np.flatnonzero, instance.n)]
+    epsilon_values = epsilon_values or {}
+    max_projets = int(np.floor(epsilon_values['nb_projets_max'] + 1e-6)) if 'nb_projets_max' in epsilon_values else None
+    max_retard = epsilon_values.get('retard', np.inf)
+    max_duree = epsilon_values.get('duree', np.inf)
+    projets_par_personne = np.zeros(instance.Smax, dtype=np.int32)
+    nb_retard, duree = 0, 0
+
+    blocs = []  # (jours, personnes, q, p) des qualifications allouées
+    f = np.zeros(P, dtype=np.int8)
+    fin = np.zeros(P, dtype=np.int32)
+    debut = np.zeros(P, dtype=np.int32)
+    R = np.zeros(P, dtype=np.int32)
+    for p in ordre_projets(instance):
+        quals = quals_projet[p]
+        if len(quals) == 0:
+            continue
+        # Les personnes déjà prises pour ce projet restent autorisées même au plafond
+        autorises = projets_par_personne < max_projets if max_projets is not None else None
+        cellules = []
+        for q in quals:
+            alloue = etat.allouer(q, instance.n[p, q], autorises)
+            if alloue is None:
+                break
+            cellules.append((q, *alloue))
+            if autorises is not None:
+                autorises[alloue[0]] = True
+        else:
+            jour_fin = max(jours.max() for _, _, jours in cellules) + 1
+            retard = max(0, jour_fin - instance.d[p])
+            premier = min(jours.min() for _, _, jours in cellules) + 1
+            debut_p = premier if premier >= 2 else 0
+            if (instance.g[p] - instance.r[p] * retard > 0 and nb_retard + (retard > 0) <= max_retard + 1e-6
+                    and duree + jour_fin - debut_p <= max_duree + 1e-6):
+                f[p], fin[p], R[p], debut[p] = 1, jour_fin, retard, debut_p
+                nb_retard += retard > 0
+                duree += jour_fin - debut_p
+                if max_projets is not None:
+                    projets_par_personne[np.unique(np.concatenate([personnes for _, personnes, _ in cellules]))] += 1
+                blocs.extend((jours, personnes, q, p) for q, personnes, jours in cellules)
+                continue
+        # Projet impossible à finir ou pas rentable : ses jours sont rendus
+        if cellules:
+            etat.rendre(np.concatenate([personnes for _, personnes, _ in cellules]))
+
+    cellules = np.empty((0, 4), dtype=np.int32)
+    if blocs:
+        tailles = [len(jours) for jours, _, _, _ in blocs]
+        cellules = np.column_stack([np.concatenate([b[0] for b in blocs]), np.concatenate([b[1] for b in blocs]),
+                                    np.repeat([b[2] for b in blocs], tailles), np.repeat([b[3] for b in blocs], tailles)])
+    dimensions = (instance.horizon, instance.Smax, Q, P)
+    planning = Planning(nom_instance, dimensions, cellules, f, fin, debut, R,
+                        meta={'source': 'glouton', 'solve_s': time.perf_counter() - t0})
+    planning.objectifs = evaluer_objectifs(planning, instance)
+    return planning
+
+# Valeur des objectifs de build_model pour un planning, calculée sur les tableaux (sans modèle Pyomo)
+def evaluer_objectifs(planning, instance=None):
+    instance = instance if instance is not None else load_instance_arrays(planning.nom_instance)
+    S, P = planning.dimensions[1], planning.dimensions[3]
+    paires = np.zeros((S, P), dtype=bool)
+    paires[planning.cellules[:, 1], planning.cellules[:, 3]] = True
+    return {
+        'profit': float((planning.f * instance.g - planning.R * instance.r).sum()),
+        'retard': float((planning.R > 0).sum()),
+        'nb_projets_max': float(paires.sum(axis=1).max()) if S else 0.0,
+        'duree': float((planning.fin - planning.debut).sum()),
+    }
+
+# Planning des cellules données avec f, fin, debut et R au plus juste (comme warm_start.completer_solution).
+# Les cellules des projets non finis sont retirées : elles ne rapportent rien et ne peuvent que dégrader les objectifs.
+def planning_serre(nom_instance, cellules, instance=None, meta=None):
+    instance = instance if instance is not None else load_instance_arrays(nom_instance)
+    P, Q = instance.n.shape
+    cellules = np.asarray(cellules, dtype=np.int32).reshape(-1, 4)
+    travail = np.zeros((P, Q), dtype=np.int32)
+    np.add.at(travail, (cellules[:, 3], cellules[:, 2]), 1)
+    f = (travail >= instance.n).all(axis=1)
+    cellules = cellules[f[cellules[:, 3]]]
+
+    fin = np.zeros(P, dtype=np.int32)
+    premier = np.full(P, np.iinfo(np.int32).max, dtype=np.int32)
+    np.maximum.at(fin, cellules[:, 3], cellules[:, 0] + 1)
+    np.minimum.at(premier, cellules[:, 3], cellules[:, 0] + 1)
+    debut = np.where((fin > 0) & (premier >= 2), premier, 0)
+    R = np.maximum(0, fin - instance.d) * (fin > 0)
+
+    planning = Planning(nom_instance, (instance.horizon, instance.Smax, Q, P), cellules, f, fin, debut, R, meta=meta)
+    planning.objectifs = evaluer_objectifs(planning, instance)
+    return planning
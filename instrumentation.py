@@ -0,0 +1,124 @@
+import cProfile
+import json
+import math
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# --- Journal structuré des runs
+# Un événement par résolution (anchor, run epsilon, résolution unique) et par construction de modèle :
+# instance, phase, vecteur epsilon, temps de construction / préparation / résolution, statut, gap, nœuds, objectifs.
+# Les événements sont ajoutés à un fichier JSONL (une ligne par événement, écrite tout de suite : un balayage
+# interrompu garde son journal) et/ou gardés en mémoire dans journal.evenements.
+
+class JournalRuns:
+
+    # profil_construction : cProfile autour de build_model, statistiques écrites dans '<chemin>.build_<n>.prof'
+    # memoire_construction : pic mémoire Python (tracemalloc) pendant build_model
+    def __init__(self, chemin=None, en_memoire=True, profil_construction=False, memoire_construction=False):
+        self.chemin = chemin
+        self.en_memoire = en_memoire
+        self.profil_construction = profil_construction
+        self.memoire_construction = memoire_construction
+        self.evenements = []
+        self._nb_profils = 0
+        if chemin:
+            os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+
+    # Options pour recréer le journal dans un processus de calcul (les événements n'y sont écrits que dans le fichier)
+    def options_processus(self):
+        return {'chemin': self.chemin, 'en_memoire': False,
+                'profil_construction': self.profil_construction, 'memoire_construction': self.memoire_construction}
+
+    def enregistrer(self, phase, **champs):
+        evenement = {'t': time.time(), 'pid': os.getpid(), 'phase': phase, **champs}
+        if self.en_memoire:
+            self.evenements.append(evenement)
+        if self.chemin:
+            # Ouverture en ajout à chaque événement : plusieurs processus peuvent écrire dans le même fichier
+            with open(self.chemin, "a") as f:
+                f.write(json.dumps(evenement, default=_json_defaut) + "\n")
+        return evenement
+
+    # Chronomètre la construction du modèle (et la profile si demandé), puis enregistre un événement 'build'
+    @contextmanager
+    def construction(self, **champs):
+        profil = cProfile.Profile() if self.profil_construction else None
+        if self.memoire_construction:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        if profil:
+            profil.enable()
+        try:
+            yield
+        finally:
+            if profil:
+                profil.disable()
+            champs['build_s'] = time.perf_counter() - t0
+            if self.memoire_construction:
+                champs['peak_python_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+                tracemalloc.stop()
+            if profil:
+                self._nb_profils += 1
+                base = self.chemin or "journal"
+                champs['profil'] = f"{base}.build_{os.getpid()}_{self._nb_profils}.prof"
+                profil.dump_stats(champs['profil'])
+            self.enregistrer('build', **champs)
+
+# Valeurs numpy / Pyomo : conversion en float pour json
+def _json_defaut(valeur):
+    try:
+        return float(valeur)
+    except (TypeError, ValueError):
+        return str(valeur)
+
+def journal_depuis_options(options):
+    return JournalRuns(**options) if options else None
+
+# Contexte de construction : instrumenté si un journal est fourni, sinon sans effet
+def construction_instrumentee(journal, **champs):
+    if journal is None:
+        return nullcontext()
+    return journal.construction(**champs)
+
+# Gap MIP, nombre de nœuds et temps du solveur pour le dernier solve.
+# Solveur persistant : attributs du modèle Gurobi ; sinon, gap déduit des bornes renvoyées par Pyomo.
+def statistiques_solveur(solver, result):
+    stats = {'mip_gap': None, 'nodes': None, 'solver_runtime_s': None}
+    if hasattr(solver, 'get_model_attr'):
+        for cle, attribut in [('mip_gap', 'MIPGap'), ('nodes', 'NodeCount'), ('solver_runtime_s', 'Runtime')]:
+            try:
+                stats[cle] = solver.get_model_attr(attribut)
+            except Exception:
+                pass  # attribut absent (pas de solution, modèle continu...)
+    else:
+        try:
+            haut, bas = result.problem.upper_bound, result.problem.lower_bound
+            if haut is not None and bas is not None and math.isfinite(haut) and math.isfinite(bas):
+                stats['mip_gap'] = abs(haut - bas) / max(1e-10, abs(haut))
+        except AttributeError:
+            pass
+    if stats['mip_gap'] is not None and not math.isfinite(stats['mip_gap']):
+        stats['mip_gap'] = None
+    return stats
+
+def lire_journal(chemin):
+    with open(chemin) as f:
+        return [json.loads(ligne) for ligne in f if ligne.strip()]
+
+# Résumé par phase : nombre d'événements, temps de construction / résolution cumulés, run le plus long, statuts
+def resume_par_phase(evenements):
+    resume = {}
+    for e in evenements:
+        r = resume.setdefault(e['phase'], {'nb': 0, 'build_s': 0.0, 'solve_s': 0.0, 'max_solve_s': 0.0, 'statuts': {}})
+        r['nb'] += 1
+        r['build_s'] += e.get('build_s') or 0.0
+        r['solve_s'] += e.get('solve_s') or 0.0
+        r['max_solve_s'] = max(r['max_solve_s'], e.get('solve_s') or 0.0)
+        if 'status' in e:
+            r['statuts'][e['status']] = r['statuts'].get(e['status'], 0) + 1
+    for phase, r in resume.items():
+        print(f"{phase:<9} {r['nb']:>6} événements  construction {r['build_s']:>8.2f}s  résolution {r['solve_s']:>8.2f}s "
+              f"(max {r['max_solve_s']:.2f}s)  {r['statuts']}")
+    return resume
@@ -0,0 +1,245 @@
+import math
+import time
+import numpy as np
+from pyomo.environ import Constraint, Objective, Set, SolverFactory, minimize
+from build_model import build_model, get_objective_expression, OBJECTIVE_SENSE, FORMULATIONS
+from extraction import load_instance_arrays, Instance
+from heuristique import planning_glouton, planning_serre
+from planning import extraire_planning
+from warm_start import completer_solution
+
+# --- Recherche à grand voisinage (LNS) pour les instances trop grosses pour le MIP complet
+# Part d'un planning réalisable (planning glouton par défaut) et répète : libérer un voisinage, le réoptimiser
+# avec un petit sous-MIP, garder le résultat s'il améliore l'objectif.
+# Un voisinage est un ensemble de projets libérés, toutes les autres affectations restant figées :
+#   'projets'   : un projet tiré au hasard et les projets qui demandent les mêmes qualifications
+#   'fenetre'   : une fenêtre de jours ; projets entièrement planifiés dans la fenêtre et projets non planifiés, replanifiés dans la fenêtre
+#   'personnes' : des personnes aux compétences proches ; projets faits uniquement par elles et projets non planifiés, replanifiés avec elles
+# Le sous-MIP est build_model (mode sparse) sur une sous-instance : les projets libérés, les jours déjà pris par les
+# affectations figées comptés comme des vacances. profit, retard et duree se séparent par projet (la part des projets figés
+# est une constante) ; pour nb_projets_max, les projets figés de chaque personne sont ajoutés au second membre de max_projets.
+# Les contraintes epsilon portent sur la valeur globale des objectifs. Un planning de départ qui viole un epsilon
+# (ex. profit, que le planning glouton ne peut pas imposer) est d'abord réparé : l'objectif violé est optimisé à sa place.
+# Le nombre de projets libérés s'adapte : +1 après un sous-MIP prouvé vite, -1 après un sous-MIP arrêté par sa limite de temps.
+
+VOISINAGES = ['fenetre', 'projets', 'personnes']
+
+class MoteurLNS:
+
+    # temps_sec : temps accordé à chaque appel d'ameliorer (construction des sous-problèmes comprise)
+    # taille : nombre de projets libérés par voisinage au départ
+    # limite_sous_mip_sec : limite de temps de chaque sous-MIP
+    # patience : nombre de voisinages d'affilée sans amélioration avant d'arrêter (None : seul le temps arrête)
+    # voisinages : voisinages essayés à tour de rôle ; formulation : cf. build_model.FORMULATIONS
+    # graine : graine du tirage des voisinages ; threads : threads Gurobi par sous-MIP (None : réglage de Gurobi)
+    def __init__(self, temps_sec=60.0, taille=6, limite_sous_mip_sec=10.0, patience=50, voisinages=tuple(VOISINAGES),
+                 formulation='cellule', graine=0, threads=None, tee=False):
+        inconnus = [v for v in voisinages if v not in VOISINAGES]
+        if inconnus or not voisinages:
+            raise ValueError(f"Voisinages inconnus : {inconnus or voisinages}")
+        if formulation not in FORMULATIONS:
+            raise ValueError(f"Formulation inconnue : {formulation}")
+        self.temps_sec = temps_sec
+        self.taille = taille
+        self.limite_sous_mip_sec = limite_sous_mip_sec
+        self.patience = patience
+        self.voisinages = list(voisinages)
+        self.formulation = formulation
+        self.graine = graine
+        self.threads = threads
+        self.tee = tee
+
+    # Options pour recréer le moteur dans un processus de calcul
+    def options_processus(self):
+        return {'temps_sec': self.temps_sec, 'taille': self.taille, 'limite_sous_mip_sec': self.limite_sous_mip_sec,
+                'patience': self.patience, 'voisinages': self.voisinages, 'formulation': self.formulation, 'graine': self.graine,
+                'threads': self.threads, 'tee': self.tee}
+
+    # Améliore le planning (Planning ; None : planning glouton respectant les epsilon qu'il peut respecter) sur l'objectif donné,
+    # sous les bornes epsilon_values {objectif: epsilon}. temps_max : plafond du temps de l'appel (ex. temps restant d'un budget).
+    # Renvoie le meilleur planning trouvé ; planning.meta['lns'] résume la recherche et planning.meta['epsilon_violes']
+    # liste les epsilon que la réparation n'a pas pu satisfaire.
+    def ameliorer(self, nom_instance, objectif, planning=None, epsilon_values=None, temps_max=None):
+        t0 = time.perf_counter()
+        echeance = t0 + (self.temps_sec if temps_max is None else min(self.temps_sec, temps_max))
+        instance = load_instance_arrays(nom_instance)
+        epsilon_values = {obj: eps for obj, eps in (epsilon_values or {}).items() if obj != objectif}
+        depart = planning if planning is not None else planning_glouton(nom_instance, epsilon_values)
+        courant = planning_serre(nom_instance, depart.cellules, instance, depart.meta)
+        initial = dict(courant.objectifs)
+
+        rng = np.random.default_rng(self.graine)
+        solver = SolverFactory('gurobi_persistent')
+        taille = max(1, min(self.taille, instance.Pmax))
+        taille_max = instance.Pmax
+        stats = {'iterations': 0, 'ameliorations': 0, 'sous_mip_s': 0.0, 'par_voisinage': {v: [0, 0] for v in self.voisinages}}
+        sans_amelioration = 0
+        prouve = False
+
+        while self.patience is None or sans_amelioration < self.patience:
+            restant = echeance - time.perf_counter()
+            if restant <= 0.1:
+                break
+            voisinage = self.voisinages[stats['iterations'] % len(self.voisinages)]
+            stats['iterations'] += 1
+            projets, bloque = _tirer_voisinage(voisinage, instance, courant, taille, rng)
+            if len(projets) == 0:
+                sans_amelioration += 1
+                continue
+            cible, bornes = _cible(objectif, courant.objectifs, epsilon_values)
+
+            model = _sous_probleme(instance, courant, projets, bloque, cible, bornes, self.formulation)
+            solver.set_instance(model)
+            solver.options['TimeLimit'] = max(0.1, min(self.limite_sous_mip_sec, echeance - time.perf_counter()))
+            if self.threads is not None:
+                solver.options['Threads'] = self.threads
+            t1 = time.perf_counter()
+            try:
+                result = solver.solve(model, tee=self.tee, warmstart=True, load_solutions=False)
+            except Exception as erreur:
+                # Sous-MIP refusé (ex. licence limitée en taille) : les voisinages de cette taille ne sont plus tirés
+                print(f"[INFO] LNS : sous-MIP de {len(projets)} projets refusé par le solveur ({erreur})")
+                taille_max = len(projets) - 1
+                taille = max(1, min(taille, taille_max))
+                sans_amelioration += 1
+                if taille_max < 1:
+                    break
+                continue
+            duree_s = time.perf_counter() - t1
+            stats['sous_mip_s'] += duree_s
+            stats['par_voisinage'][voisinage][0] += 1
+            sous_prouve = str(result.solver.termination_condition) == 'optimal'
+
+            if solver.get_model_attr('SolCount') > 0:
+                solver.load_vars()
+                cellules = extraire_planning(model).cellules
+                cellules[:, 3] = projets[cellules[:, 3]]
+                libres = np.isin(courant.cellules[:, 3], projets)
+                candidat = planning_serre(nom_instance, np.concatenate([courant.cellules[~libres], cellules]), instance,
+                                          courant.meta)
+                if _ameliore(cible, candidat.objectifs[cible], courant.objectifs[cible]):
+                    courant = candidat
+                    stats['ameliorations'] += 1
+                    stats['par_voisinage'][voisinage][1] += 1
+                    sans_amelioration = 0
+                else:
+                    sans_amelioration += 1
+            else:
+                sans_amelioration += 1
+
+            # Tous les projets libérés sans restriction de jours ni de personnes : le sous-MIP était le problème complet
+            if sous_prouve and bloque is None and len(projets) == instance.Pmax and cible == objectif:
+                prouve = True
+                break
+            if sous_prouve and duree_s < solver.options['TimeLimit'] / 4:
+                taille = min(taille_max, taille + 1)
+            elif not sous_prouve:
+                taille = max(1, taille - 1)
+
+        violes = [obj for obj, eps in epsilon_values.items() if not _respecte(obj, courant.objectifs[obj], eps)]
+        stats['sous_mip_s'] = round(stats['sous_mip_s'], 3)
+        courant.meta.update(source='lns', epsilon=epsilon_values, epsilon_violes=violes, prouve=prouve,
+                            solve_s=time.perf_counter() - t0, lns=stats)
+        print(f"LNS : {stats['iterations']} voisinages, {stats['ameliorations']} améliorations en {time.perf_counter() - t0:.1f}s, "
+              f"{objectif} {initial[objectif]:g} -> {courant.objectifs[objectif]:g}" + (f", epsilon violés : {violes}" if violes else ""))
+        return courant
+
+def lns_depuis_options(options):
+    return MoteurLNS(**options) if options else None
+
+# LNS sur un seul objectif (ou sous des bornes epsilon) depuis le planning glouton ou le planning donné ; options : cf. MoteurLNS
+def ameliorer_lns(nom_instance, objectif, planning=None, epsilon_values=None, **options):
+    return MoteurLNS(**options).ameliorer(nom_instance, objectif, planning, epsilon_values)
+
+def _respecte(obj, valeur, eps, tol=1e-6):
+    return valeur <= eps + tol if OBJECTIVE_SENSE[obj] == minimize else valeur >= eps - tol
+
+def _ameliore(obj, nouveau, ancien, tol=1e-6):
+    return nouveau < ancien - tol if OBJECTIVE_SENSE[obj] == minimize else nouveau > ancien + tol
+
+# Objectif du prochain sous-MIP et bornes de ses contraintes epsilon.
+# Tant qu'un epsilon est violé, le premier objectif violé est optimisé ; les autres objectifs violés ne doivent pas se dégrader.
+def _cible(objectif, objectifs, epsilon_values):
+    violes = [obj for obj, eps in epsilon_values.items() if not _respecte(obj, objectifs[obj], eps)]
+    bornes = {obj: (objectifs[obj] if obj in violes else eps) for obj, eps in epsilon_values.items()}
+    if not violes:
+        return objectif, bornes
+    del bornes[violes[0]]
+    return violes[0], bornes
+
+# Tirage d'un voisinage : (projets libérés, masque [S,H] des jours interdits aux projets libérés ou None)
+def _tirer_voisinage(voisinage, instance, planning, taille, rng):
+    P, S, H = instance.Pmax, instance.Smax, instance.horizon
+    cellules = planning.cellules
+
+    if voisinage == 'projets':
+        demande = instance.n > 0
+        germe = rng.integers(P)
+        proximite = demande.astype(np.int32) @ demande[germe] + rng.random(P)
+        proximite[germe] = np.inf
+        return np.sort(np.argsort(-proximite, kind='stable')[:taille]), None
+
+    bloque = np.ones((S, H), dtype=bool)
+    if voisinage == 'fenetre':
+        largeur = min(H, max(2, math.ceil(H * taille / P)))
+        h1 = rng.integers(H - largeur + 1)
+        bloque[:, h1:h1 + largeur] = False
+    else:
+        nb = min(S, max(1, math.ceil(S * taille / P)))
+        germe = rng.integers(S)
+        proximite = instance.c.astype(np.int32) @ instance.c[germe] + rng.random(S)
+        proximite[germe] = np.inf
+        bloque[np.argsort(-proximite, kind='stable')[:nb]] = False
+
+    # Projets dont aucune cellule n'est hors du voisinage : d'abord les projets planifiés, complétés par des non planifiés
+    hors = np.zeros(P, dtype=bool)
+    hors[cellules[bloque[cellules[:, 1], cellules[:, 0]], 3]] = True
+    planifies = rng.permutation(np.flatnonzero(planning.f.astype(bool) & ~hors))
+    non_planifies = rng.permutation(np.flatnonzero(~planning.f.astype(bool) & ~hors))
+    projets = np.concatenate([planifies, non_planifies])[:taille]
+    return np.sort(projets), bloque
+
+# Sous-MIP du voisinage : build_model sur la sous-instance des projets libérés, objectif 'cible', bornes epsilon globales.
+# Le planning courant des projets libérés est chargé dans les variables (démarrage à chaud, toujours réalisable).
+def _sous_probleme(instance, planning, projets, bloque, cible, bornes, formulation):
+    libres = np.isin(planning.cellules[:, 3], projets)
+    fixes = planning.cellules[~libres]
+    v = instance.v.copy()
+    v[fixes[:, 1], fixes[:, 0]] = 1
+    if bloque is not None:
+        v[bloque] = 1
+    sous_instance = Instance(instance.horizon, instance.n[projets], v, instance.c, instance.d[projets], instance.g[projets],
+                             instance.r[projets], instance.staff_names, [instance.job_names[p] for p in projets], instance.qual_names)
+    model = build_model(sous_instance, sparse=True, formulation=formulation)
+
+    # nb_projets_max reste global : les projets figés de chaque personne s'ajoutent à ceux du sous-problème
+    paires = np.zeros((instance.Smax, instance.Pmax), dtype=bool)
+    paires[fixes[:, 1], fixes[:, 3]] = True
+    base = paires.sum(axis=1)
+    model.del_component(model.max_projets_constraints)
+    def max_projets_rule(model, s):
+        return model.N_projets >= int(base[s-1]) + sum(model.k[s, p] for p in model.P)
+    model.max_projets_constraints = Constraint(model.S, rule=max_projets_rule)
+
+    # Part des projets figés dans les objectifs séparables
+    figes = np.setdiff1d(np.arange(instance.Pmax), projets)
+    constantes = {
+        'profit': float((planning.f * instance.g - planning.R * instance.r)[figes].sum()),
+        'retard': float((planning.R[figes] > 0).sum()),
+        'nb_projets_max': 0.0,
+        'duree': float((planning.fin - planning.debut)[figes].sum()),
+    }
+    model.BORNES = Set(initialize=list(bornes), ordered=True)
+    def epsilon_rule(model, obj):
+        expr = get_objective_expression(model, obj) + constantes[obj]
+        return expr <= bornes[obj] if OBJECTIVE_SENSE[obj] == minimize else expr >= bornes[obj]
+    model.epsilon_constraints = Constraint(model.BORNES, rule=epsilon_rule)
+    model.obj = Objective(expr=get_objective_expression(model, cible), sense=OBJECTIVE_SENSE[cible])
+
+    position = np.full(instance.Pmax, -1)
+    position[projets] = np.arange(len(projets))
+    courantes = planning.cellules[libres].copy()
+    courantes[:, 3] = position[courantes[:, 3]]
+    completer_solution(model, [tuple(cell) for cell in (courantes + 1).tolist()])
+    model.N_projets.set_value(max(int(base[s-1]) + sum(int(model.k[s, p].value) for p in model.P) for s in model.S))
+    return model
@@ -1,9 +1,15 @@
+import os
 import numpy as np
-from solve_model import solve_multiobjective_epsilon_constraint_v1, solve_multiobjective_epsilon_constraint_v2, filter_dominated_solutions, solve_with_specific_epsilons, get_obj_value
+from solve_model import solve_multiobjective_epsilon_constraint_v1, solve_multiobjective_epsilon_constraint_v2, filter_dominated_solutions, solve_with_specific_epsilons
 from pareto import plot_pareto_front
 from visualise import afficher_solution
+from stockage_front import ouvrir_front
+from cache_resultats import CacheResultats
+from budget import BudgetTemps
+from suivi_progression import SuiviProgression
+from heuristique import planning_glouton
+from lns import MoteurLNS
 import warnings
-from pyomo.environ import value
 
 # Ignorer les avertissements spécifiques de Pyomo s'ils apparaissent
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -34,12 +40,50 @@ if __name__ == "__main__":
     # Temps de résolution max On garde cette limite grande pour ne pas avoir à s'en servir. Elle est là au cas où.
     TIME_LIMIT_SEC = 180
 
+    # Temps total accordé à la recherche du front (cf. budget.py), table des gains comprise : la limite de chaque
+    # résolution est alors tirée du temps restant (TIME_LIMIT_SEC n'est plus utilisée). None : pas de budget global
+    BUDGET_TOTAL_SEC = None
+
+    # Suivi de la progression de Gurobi dans chaque run (cf. suivi_progression.py) : {} pour le seul suivi,
+    # ex. {'plateau_sec': 30, 'gap_arret': 0.01} pour arrêter un run dont l'incumbent stagne. None : pas de suivi
+    SUIVI_PROGRESSION = None
+
+    # Recherche à grand voisinage (cf. lns.py) sur les runs non prouvés optimaux et sur le planning de repli de la
+    # résolution unique, ex. {'temps_sec': 60, 'taille': 6}. None : pas de LNS
+    LNS = None
+
     # Nombre de points du front de Pareto (pour solve_multiobjective_epsilon_constraint_v1)
     NB_POINTS_PARETO = 10
+
+    # Dossier où le front et le planning de chaque point sont stockés (cf. stockage_front.py), None pour ne rien écrire
+    STOCKAGE_FRONT = None   # ex. os.path.join("fronts", NOM_INSTANCE)
+
+    # Cache des résolutions entre sessions (cf. cache_resultats.py) : table des gains, runs epsilon et résolution unique
+    # déjà prouvés ne sont pas relancés. None pour le désactiver
+    FICHIER_CACHE = None   # ex. os.path.join(".solve_cache", "resultats.sqlite")
+    TAILLE_MAX_CACHE_MO = 500
+
+    # Dossier de reprise de la recherche v2 (cf. reprise.py) : relancer main.py après une interruption reprend
+    # après le dernier run enregistré. None pour ne rien enregistrer
+    POINT_DE_REPRISE = None   # ex. os.path.join("checkpoints", NOM_INSTANCE)
+
+    # Résolution unique : si Gurobi est indisponible ou ne trouve rien, afficher le planning glouton (cf. heuristique.py)
+    REPLI_GLOUTON = True
+
+    # Point du front stocké dans STOCKAGE_FRONT à afficher (indice dans le front) ; None : résolution avec VALEURS_EPSILON_MANUELLES
+    POINT_A_AFFICHER = None
+
+    # Options de construction du modèle (voir build_model)
+    OPTIONS_MODELE = {
+        'sparse': True,   # n'indexer a[h,s,q,p] que sur les affectations admissibles
+    }
     
     # ==============================================
     
-
+    cache = CacheResultats(FICHIER_CACHE, TAILLE_MAX_CACHE_MO) if FICHIER_CACHE else None
+    budget = BudgetTemps(BUDGET_TOTAL_SEC) if BUDGET_TOTAL_SEC else None
+    suivi = SuiviProgression(**SUIVI_PROGRESSION) if SUIVI_PROGRESSION is not None else None
+    lns = MoteurLNS(**LNS) if LNS is not None else None
 
     print(f"Lancement de l'optimisation multi-objectif pour l'instance : {NOM_INSTANCE}")
     print(f"Objectif principal : profit (maximisé)")
@@ -54,12 +98,20 @@ if __name__ == "__main__":
         secondary_objectives=SECONDAIRES,
         #nb_epsilon_steps=NB_POINTS_PARETO,
         tee=False, # Mettre à True pour voir le log détaillé de Gurobi
-        time_limit_sec=TIME_LIMIT_SEC
+        time_limit_sec=TIME_LIMIT_SEC,
+        model_options=OPTIONS_MODELE,
+        store=STOCKAGE_FRONT,
+        cache=cache,
+        checkpoint=POINT_DE_REPRISE,
+        budget=budget,
+        suivi=suivi,
+        lns=lns
     )
 
     # Etape 2: Filtrer les résultats pour ne garder que le front de Pareto
+    # (les solveurs renvoient déjà le contenu de leur archive de Pareto : le filtre ne fait que le confirmer)
     print(f"\n--- Filtrage des solutions dominées ---")
-    print(f"Points trouvés (bruts) : {len(all_results)}")
+    print(f"Points trouvés (archive) : {len(all_results)}")
     
     pareto_results = filter_dominated_solutions(points=all_results, primary_objective=PRIMAIRE, secondary_objectives=SECONDAIRES)
     print(f"Points sur le front de Pareto (non-dominés) : {len(pareto_results)}")
@@ -88,46 +140,54 @@ if __name__ == "__main__":
 
 
 
-    print(f"Lancement d'une analyse de scénario unique pour l'instance : {NOM_INSTANCE}")
-    print(f"Objectif principal : profit (maximisé)")
-    print(f"Contraintes Epsilon manuelles : {VALEURS_EPSILON_MANUELLES}")
+    if POINT_A_AFFICHER is not None:
+        # Planning déjà stocké avec le front : pas de nouvelle résolution
+        if STOCKAGE_FRONT is None:
+            raise ValueError("POINT_A_AFFICHER demande un front stocké : renseigner STOCKAGE_FRONT")
+        front = ouvrir_front(STOCKAGE_FRONT)
+        print(f"Planning du point {POINT_A_AFFICHER} du front stocké dans {STOCKAGE_FRONT} : {front.point(POINT_A_AFFICHER)}")
+        planning, result = front.planning(POINT_A_AFFICHER), None
 
-    ## Lancer la résolution unique
+    else:
+        print(f"Lancement d'une analyse de scénario unique pour l'instance : {NOM_INSTANCE}")
+        print(f"Objectif principal : profit (maximisé)")
+        print(f"Contraintes Epsilon manuelles : {VALEURS_EPSILON_MANUELLES}")
+
+        ## Lancer la résolution unique
+
+        # 'tee=True' est utile ici pour voir le détail de cette unique résolution
+        planning, result = solve_with_specific_epsilons(
+            nom_instance=NOM_INSTANCE,
+            primary_objective=PRIMAIRE,
+            secondary_objectives=SECONDAIRES,
+            epsilon_values=VALEURS_EPSILON_MANUELLES,
+            tee=True,
+            model_options=OPTIONS_MODELE,
+            warm_start=planning_glouton(NOM_INSTANCE),
+            cache=cache,
+            repli_glouton=REPLI_GLOUTON,
+            lns=lns
+        )
 
-    # 'tee=True' est utile ici pour voir le détail de cette unique résolution
-    model, result = solve_with_specific_epsilons(
-        nom_instance=NOM_INSTANCE,
-        primary_objective=PRIMAIRE,
-        secondary_objectives=SECONDAIRES,
-        epsilon_values=VALEURS_EPSILON_MANUELLES,
-        tee=True 
-    )
-    print("--- Valeurs des variables model.z[p, h] ---")
-
-    ## Itérer et afficher
-
-    # Itère sur tous les jeux d'indices (p, h) de la variable z
-    for p in model.P:
-        for h in model.H:
-            # Utiliser value() pour récupérer la valeur numérique de la variable
-            z_valeur = value(model.z[p, h])
-            
-            # Afficher uniquement les valeurs non nulles pour la clarté
-            if abs(z_valeur) > 1e-6: # Utiliser une petite tolérance pour les valeurs proches de zéro
-                print(f"z[{p}, {h}] = {z_valeur:.4f}")
     # Etape 2: Afficher le planning si la solution est trouvée
-    if model is not None and result is not None:
+    # (planning compact extrait du modèle, cf. planning.py : le modèle Pyomo n'est plus gardé)
+    if planning is not None:
+        # Premier jour affecté lu sur les cellules : debut n'est fixé par le modèle que si 'duree' est un objectif
+        print("--- Premier et dernier jour de travail des projets réalisés ---")
+        premier = np.full(len(planning.fin), np.iinfo(np.int32).max)
+        np.minimum.at(premier, planning.cellules[:, 3], planning.cellules[:, 0] + 1)
+        for p in np.flatnonzero(planning.fin > 0):
+            print(f"Projet {p+1} : jours {premier[p]} à {planning.fin[p]}")
+
         print("\n--- Affichage du planning pour la solution trouvée ---")
         
         # Appeler la fonction de visualisation de planning
-        afficher_solution(model, result)
+        afficher_solution(planning, result)
         
         # Afficher les valeurs d'objectif finales
         print("\n--- Valeurs d'objectif pour cette solution ---")
-        all_objs = ["profit"] + SECONDAIRES
-        for obj in all_objs:
-            val = get_obj_value(model, obj)
+        for obj, val in planning.objectifs.items():
             print(f" -> {obj}: {val:.2f}")
 
     else:
-        print("\nAucune solution trouvée pour ces contraintes. Aucun planning à afficher.")
+        print("\nAucune solution trouvée pour ces contraintes. Aucun planning à afficher.")
@@ -0,0 +1,63 @@
+import json
+import numpy as np
+from pyomo.environ import value
+from build_model import get_objective_expression
+
+# --- Planning compact d'une solution
+# Les affectations résolues sont lues une seule fois dans le modèle et gardées sous forme de tableaux NumPy :
+# cellules (h,s,q,p) non nulles (format COO, indices 0-based comme dans extraction.Instance) et vecteurs par projet.
+# Visualisation, vérification et stockage n'ont plus besoin du modèle Pyomo, qu'on peut libérer entre deux runs.
+
+class Planning:
+
+    # cellules : tableau [k,4] int32 des affectations (h,s,q,p), 0-based
+    # f, fin, debut, R : vecteurs [P] (projet fini, jour de fin, jour de début, jours de retard)
+    # dimensions : (H, S, Q, P) ; objectifs : valeurs des objectifs de la solution (facultatif)
+    # meta : informations sur la résolution (epsilon, statut, temps...), sérialisables en JSON
+    def __init__(self, nom_instance, dimensions, cellules, f, fin, debut, R, objectifs=None, meta=None):
+        self.nom_instance = nom_instance
+        self.dimensions = tuple(int(x) for x in dimensions)
+        self.cellules = np.asarray(cellules, dtype=np.int32).reshape(-1, 4)
+        self.f = np.asarray(f, dtype=np.int8)
+        self.fin = np.asarray(fin, dtype=np.int32)
+        self.debut = np.asarray(debut, dtype=np.int32)
+        self.R = np.asarray(R, dtype=np.int32)
+        self.objectifs = dict(objectifs or {})
+        self.meta = dict(meta or {})
+
+    def __len__(self):
+        return len(self.cellules)
+
+    # Cellules affectées en indices Pyomo (1-based), format des affectations de warm_start.preparer_demarrage
+    def affectations(self):
+        return [tuple(cell) for cell in (self.cellules + 1).tolist()]
+
+    def sauvegarder(self, chemin):
+        np.savez_compressed(chemin, nom_instance=np.array(self.nom_instance or ""), dimensions=np.array(self.dimensions),
+                            cellules=self.cellules, f=self.f, fin=self.fin, debut=self.debut, R=self.R,
+                            objectifs_noms=np.array(list(self.objectifs), dtype=str),
+                            objectifs_valeurs=np.array(list(self.objectifs.values()), dtype=float),
+                            meta=np.array(json.dumps(self.meta)))
+
+    @classmethod
+    def charger(cls, chemin):
+        with np.load(chemin, allow_pickle=False) as d:
+            objectifs = dict(zip(d['objectifs_noms'].tolist(), d['objectifs_valeurs'].tolist()))
+            return cls(str(d['nom_instance']) or None, d['dimensions'], d['cellules'], d['f'], d['fin'], d['debut'], d['R'], objectifs,
+                       json.loads(str(d['meta'])))
+
+def _vecteur(var, indices):
+    return np.rint([var[i].value or 0.0 for i in indices])
+
+# Lecture en bloc de la solution chargée dans le modèle.
+# objectives : objectifs dont la valeur est gardée dans planning.objectifs ; meta : cf. Planning
+def extraire_planning(model, objectives=(), seuil=0.5, meta=None):
+    valeurs = np.array([var.value if var.value is not None else 0.0 for var in model.a.values()])
+    cles = np.array(list(model.a.keys()), dtype=np.int32).reshape(-1, 4)
+    cellules = cles[valeurs > seuil] - 1
+
+    P = list(model.P)
+    dimensions = (len(model.H), len(model.S), len(model.Q), len(model.P))
+    objectifs = {obj: value(get_objective_expression(model, obj)) for obj in objectives}
+    return Planning(getattr(model, 'nom_instance', None), dimensions, cellules,
+                    _vecteur(model.f, P), _vecteur(model.fin, P), _vecteur(model.debut, P), _vecteur(model.R, P), objectifs, meta)
@@ -0,0 +1,106 @@
+import json
+import os
+from planning import Planning
+
+# --- Point de reprise d'une recherche v2
+# Le dossier contient un journal 'runs.jsonl' (une ligne par événement, ajoutée puis synchronisée sur disque) :
+#   1re ligne      : configuration de la recherche (instance, objectifs, options...)
+#   ligne 'bornes' : table des gains et bornes calculées
+#   ligne 'run'    : vecteur epsilon, statut et point de chaque run résolu (ou lu dans le cache)
+# et le planning de chaque run qui a donné un point ('planning_<i>.npz', écrit avant la ligne qui le référence).
+# La recherche est déterministe à résultats de runs donnés : une recherche relancée rejoue le journal au lieu de résoudre,
+# (mémo, démarrage à chaud et archive sont reconstruits à l'identique), puis continue après le dernier run enregistré.
+# Une dernière ligne tronquée (arrêt pendant l'écriture) est ignorée.
+
+FICHIER_JOURNAL = "runs.jsonl"
+
+class Reprise:
+
+    def __init__(self, dossier, configuration):
+        self.dossier = dossier
+        self.configuration = json.loads(json.dumps(configuration, sort_keys=True))
+        self.bornes = None
+        self.payoff_table = None
+        self._runs = []
+        self._position = 0
+
+        chemin = os.path.join(dossier, FICHIER_JOURNAL)
+        evenements = _lire_lignes(chemin) if os.path.exists(chemin) else []
+        if evenements and evenements[0].get('configuration') != self.configuration:
+            raise ValueError(f"Le point de reprise {dossier} vient d'une autre recherche : {evenements[0].get('configuration')}")
+
+        if not evenements:
+            # Nouveau point de reprise : le dossier n'est jamais vidé, il doit être absent, vide ou ne contenir qu'un
+            # journal sans événement complet (arrêt pendant l'écriture de la 1re ligne)
+            os.makedirs(dossier, exist_ok=True)
+            autres = set(os.listdir(dossier)) - {FICHIER_JOURNAL, FICHIER_JOURNAL + ".tmp"}
+            if autres:
+                raise ValueError(f"{dossier} n'est pas un point de reprise et n'est pas vide : {sorted(autres)}")
+            self._reecrire([{'configuration': self.configuration}])
+        else:
+            # Réécrit le journal sans une éventuelle ligne tronquée avant d'y ajouter de nouvelles lignes
+            self._reecrire(evenements)
+            for e in evenements[1:]:
+                if e['type'] == 'bornes':
+                    self.bornes, self.payoff_table = e['bornes'], e['payoff_table']
+                elif e['type'] == 'run':
+                    self._runs.append(e)
+        if self._runs:
+            print(f"[INFO] Reprise depuis {dossier} : {len(self._runs)} runs déjà résolus seront rejoués")
+
+    @property
+    def runs_rejoues(self):
+        return self._position
+
+    def _ajouter(self, evenement):
+        with open(os.path.join(self.dossier, FICHIER_JOURNAL), "a") as f:
+            f.write(json.dumps(evenement, default=float) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _reecrire(self, evenements):
+        chemin = os.path.join(self.dossier, FICHIER_JOURNAL)
+        with open(chemin + ".tmp", "w") as f:
+            for e in evenements:
+                f.write(json.dumps(e) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(chemin + ".tmp", chemin)
+
+    def enregistrer_bornes(self, bornes, payoff_table):
+        self.bornes, self.payoff_table = bornes, payoff_table
+        self._ajouter({'type': 'bornes', 'bornes': bornes, 'payoff_table': payoff_table})
+
+    # Résultat enregistré du prochain run, s'il est déjà dans le journal : (statut, point, planning), sinon None
+    def rejouer(self, epsilon_values):
+        if self._position >= len(self._runs):
+            return None
+        run = self._runs[self._position]
+        if run['epsilon'] != {obj: float(eps) for obj, eps in epsilon_values.items()}:
+            raise RuntimeError(f"Reprise impossible : run {self._position} enregistré pour {run['epsilon']}, demandé pour {epsilon_values}")
+        self._position += 1
+        planning = Planning.charger(os.path.join(self.dossier, run['planning'])) if run.get('planning') else None
+        return run['status'], run['point'], planning
+
+    def enregistrer(self, epsilon_values, status_str, point, planning=None):
+        numero = len(self._runs)
+        run = {'type': 'run', 'epsilon': {obj: float(eps) for obj, eps in epsilon_values.items()}, 'status': status_str,
+               'point': point, 'planning': None}
+        if point is not None and planning is not None:
+            run['planning'] = f"planning_{numero}.npz"
+            tmp = os.path.join(self.dossier, f"planning_{numero}.tmp.npz")
+            planning.sauvegarder(tmp)
+            os.replace(tmp, os.path.join(self.dossier, run['planning']))
+        self._ajouter(run)
+        self._runs.append(run)
+        self._position = len(self._runs)
+
+def _lire_lignes(chemin):
+    evenements = []
+    with open(chemin) as f:
+        for ligne in f:
+            try:
+                evenements.append(json.loads(ligne))
+            except json.JSONDecodeError:
+                break  # ligne tronquée : tout ce qui suit est ignoré
+    return evenements
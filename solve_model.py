@@ -1,8 +1,33 @@
 from pyomo.environ import *
 import numpy as np
+import functools
 import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from build_model import build_model, get_objective_expression, OBJECTIVE_SENSE
 from pyomo.opt import SolverStatus, TerminationCondition
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+from pyomo.common.errors import ApplicationError
+from warm_start import preparer_demarrage
+from dominance import masque_non_domines
+from archive import ArchivePareto
+from planning import extraire_planning
+from stockage_front import ecrire_front
+from instrumentation import construction_instrumentee, journal_depuis_options, statistiques_solveur
+from cache_resultats import cache_depuis_options
+from reprise import Reprise
+from extraction import load_instance_arrays
+from budget import STATUT_EPUISE, GAP_PROUVE, budget_depuis_options, majorant_runs_v2
+from suivi_progression import suivi_depuis_options
+from heuristique import planning_glouton, planning_serre
+from lns import lns_depuis_options
+
+try:
+    from gurobipy import GurobiError
+except ImportError:  # interface par fichier LP sans gurobipy
+    GurobiError = None
 
 # Récupérer l'expression de l'objectif 
 def get_obj_value(model, obj_name_str):
@@ -15,7 +40,7 @@ def get_obj_value(model, obj_name_str):
         return float('nan')
 
 #Définir l'objectif principal du modèle
-def set_objective(model, obj_name_str):
+def set_objective(model, obj_name_str, solver=None):
     if hasattr(model, 'obj'):
         model.del_component(model.obj)
         
@@ -23,33 +48,271 @@ def set_objective(model, obj_name_str):
     expr = get_objective_expression(model, obj_name_str)
     model.obj = Objective(expr=expr, sense=sense)
 
+    # Le solveur persistant doit être prévenu du changement d'objectif
+    if _is_persistent(solver):
+        solver.set_objective(model.obj)
+
+# --- Solveur persistant : le modèle est construit une seule fois puis gardé en mémoire dans Gurobi
+
+# Erreurs du solveur lui-même (interface absente, licence, serveur de licences, modèle trop gros pour la licence),
+# seules rattrapées par le repli glouton : une erreur de construction du modèle n'est jamais masquée
+ERREURS_SOLVEUR = (ApplicationError,) if GurobiError is None else (ApplicationError, GurobiError)
+
+# Crée le solveur Gurobi (persistant par défaut, sinon via écriture d'un fichier LP à chaque résolution)
+def _make_solver(persistent=True):
+    return SolverFactory('gurobi_persistent' if persistent else 'gurobi')
+
+def _is_persistent(solver):
+    return isinstance(solver, PersistentSolver)
+
+# Charge le modèle dans le solveur persistant (une seule fois après sa construction)
+def _attach_model(model, solver):
+    if _is_persistent(solver):
+        solver.set_instance(model)
+
+# Active ou désactive une contrainte (simple ou indexée) en gardant le solveur persistant synchronisé
+def _set_constraint_active(solver, constraint, active):
+    constraints = constraint.values() if constraint.is_indexed() else [constraint]
+    for con in constraints:
+        if con.active == active:
+            continue
+        if active:
+            con.activate()
+            if _is_persistent(solver):
+                solver.add_constraint(con)
+        else:
+            if _is_persistent(solver):
+                solver.remove_constraint(con)
+            con.deactivate()
+
+# Construit le modèle une seule fois avec une contrainte epsilon par objectif secondaire.
+# Les seconds membres sont des Params mutables : d'un run à l'autre seule leur valeur change.
+# augmented=True (AUGMECON2) : chaque contrainte epsilon reçoit une variable d'écart eps_slack et devient une égalité.
+# journal : JournalRuns (instrumentation.py), qui chronomètre (et profile sur demande) la construction
+def build_epsilon_model(nom_instance, primary_objective, secondary_objectives, model_options=None, augmented=False, journal=None):
+    with construction_instrumentee(journal, instance=nom_instance, model_options=model_options or {}):
+        model = build_model(nom_instance, **(model_options or {}))
+    set_objective(model, primary_objective)
+
+    model.SEC = Set(initialize=secondary_objectives, ordered=True)
+    model.eps = Param(model.SEC, mutable=True, initialize=0)
+    if augmented:
+        model.eps_slack = Var(model.SEC, domain=NonNegativeReals)
+
+    # La contrainte est <= si on minimise, >= si on maximise
+    def epsilon_rule(model, sec_obj):
+        expr = get_objective_expression(model, sec_obj)
+        if augmented:
+            if OBJECTIVE_SENSE[sec_obj] == minimize:
+                return expr + model.eps_slack[sec_obj] == model.eps[sec_obj]
+            return expr - model.eps_slack[sec_obj] == model.eps[sec_obj]
+        if OBJECTIVE_SENSE[sec_obj] == minimize:
+            return expr <= model.eps[sec_obj]
+        return expr >= model.eps[sec_obj]
+    model.epsilon_constraints = Constraint(model.SEC, rule=epsilon_rule)
+
+    # Contraintes utilisées seulement par le calcul des bornes (voir _calculate_bounds)
+    model.at_least_one_project = Constraint(expr=sum(model.f[p] for p in model.P) >= 1)
+    model.at_least_one_project.deactivate()
+
+    # Table des gains lexicographique : on fige la valeur optimale d'un objectif avant d'optimiser le suivant
+    model.LEX = Set(initialize=list(OBJECTIVE_SENSE), ordered=True)
+    model.lex_value = Param(model.LEX, mutable=True, initialize=0)
+    def lexicographic_rule(model, obj):
+        expr = get_objective_expression(model, obj)
+        if OBJECTIVE_SENSE[obj] == minimize:
+            return expr <= model.lex_value[obj]
+        return expr >= model.lex_value[obj]
+    model.lexicographic_constraints = Constraint(model.LEX, rule=lexicographic_rule)
+    model.lexicographic_constraints.deactivate()
+    return model
+
+# Objectif augmenté (AUGMECON2) : objectif principal + petite récompense sur les écarts des contraintes epsilon,
+# pondérée lexicographiquement (10^-k) et normalisée par l'amplitude de chaque objectif.
+# Tous les objectifs sont entiers : avec delta < 1 la récompense ne peut pas changer la valeur optimale de l'objectif
+# principal, elle départage seulement les solutions de même valeur (plus de points faiblement dominés).
+def set_augmented_objective(model, primary_objective, bounds, solver=None, delta=0.5):
+    if hasattr(model, 'obj'):
+        model.del_component(model.obj)
+
+    reward = 0
+    plus_petit_gain = delta
+    model.amplitudes_recompense = {}
+    for k, sec_obj in enumerate(model.SEC):
+        amplitude = abs(bounds[sec_obj]['worst'] - bounds[sec_obj]['best']) or 1.0
+        model.amplitudes_recompense[sec_obj] = float(amplitude)
+        reward += 10 ** (-k) * model.eps_slack[sec_obj] / amplitude
+        plus_petit_gain = min(plus_petit_gain, delta * 10 ** (-k) / amplitude)
+
+    sense = OBJECTIVE_SENSE[primary_objective]
+    signe = 1 if sense == maximize else -1
+    expr = get_objective_expression(model, primary_objective) + signe * delta * reward
+    model.obj = Objective(expr=expr, sense=sense)
+
+    # Le MIPGap relatif par défaut (1e-4) est plus grand que la récompense d'une unité d'écart :
+    # on arrête plutôt sur un écart absolu inférieur à ce plus petit gain
+    if solver is not None:
+        solver.options['MIPGap'] = 0
+        solver.options['MIPGapAbs'] = plus_petit_gain / 2
+
+    if _is_persistent(solver):
+        solver.set_objective(model.obj)
+
+# Met à jour les seconds membres des contraintes epsilon.
+# Le solveur persistant a figé les anciennes valeurs : on retire et on rajoute les lignes concernées.
+def set_epsilon_values(model, solver, epsilon_values):
+    for sec_obj, eps_val in epsilon_values.items():
+        model.eps[sec_obj] = eps_val
+        _set_constraint_active(solver, model.epsilon_constraints[sec_obj], False)
+        _set_constraint_active(solver, model.epsilon_constraints[sec_obj], True)
+
+# Résout le problème mono-objectif d'un 'anchor point' et renvoie sa ligne de la table des gains.
+# En mode lexicographique, la valeur de l'anchor est ensuite figée et les autres objectifs sont optimisés
+# l'un après l'autre (chacun figé à son tour) : la ligne ne contient plus de valeurs arbitraires.
+def _solve_anchor(model, solver, obj_name, all_objectives, tee=False, lexicographic=False, journal=None):
+    t0 = time.perf_counter()
+    set_objective(model, obj_name, solver)
+    # Chaque anchor part de zéro (sans la solution de l'anchor précédent) : sa ligne ne dépend pas de l'ordre des anchors,
+    # ni de leur répartition entre processus
+    if _is_persistent(solver):
+        solver.reset()
+
+    # Si on minimise (duree, retard, etc.), on veut éviter la solution triviale (0) en forçant le modèle à faire au moins 1 projet.
+    # On ne le fait pas pour 'profit' car son sens est 'maximize'.
+    _set_constraint_active(solver, model.at_least_one_project, OBJECTIVE_SENSE[obj_name] == minimize)
+
+    result = solver.solve(model, tee=tee)
+    status_str = str(result.solver.termination_condition)
+    nb_solves = 1
+    # Lu tout de suite : Gurobi oublie ces attributs dès que le modèle est modifié
+    stats = statistiques_solveur(solver, result) if journal is not None else {}
+
+    if lexicographic and status_str in ['optimal', 'maxTimeLimit', 'feasible']:
+        order = [obj_name] + [other_obj for other_obj in all_objectives if other_obj != obj_name]
+        for fixed_obj, next_obj in zip(order[:-1], order[1:]):
+            model.lex_value[fixed_obj] = get_obj_value(model, fixed_obj)
+            _set_constraint_active(solver, model.lexicographic_constraints[fixed_obj], True)
+            set_objective(model, next_obj, solver)
+            lex_result = solver.solve(model, tee=tee, warmstart=True)
+            nb_solves += 1
+            # La ligne n'est prouvée que si chaque étape l'est : le premier statut non optimal est celui de l'anchor
+            # (ex. 'maxTimeLimit', alors la ligne n'est pas mise en cache)
+            lex_status = str(lex_result.solver.termination_condition)
+            if status_str == 'optimal' and lex_status != 'optimal':
+                status_str = lex_status
+            if journal is not None:
+                stats = statistiques_solveur(solver, lex_result)
+        for fixed_obj in order[:-1]:
+            _set_constraint_active(solver, model.lexicographic_constraints[fixed_obj], False)
+
+    # Stocker les résultats pour cet 'anchor point'
+    # La ligne est évaluée sur le planning lui-même (cf. heuristique.planning_serre) : hors de l'objectif optimisé,
+    # N_projets, R, fin... ne sont bornés que d'un côté et le solveur peut leur laisser n'importe quelle valeur admissible
+    if (result.problem.number_of_solutions or 0) > 0:
+        objectifs = planning_serre(model.nom_instance, extraire_planning(model).cellules).objectifs
+        row = {other_obj: objectifs[other_obj] for other_obj in all_objectives}
+    else:
+        row = {other_obj: get_obj_value(model, other_obj) for other_obj in all_objectives}
+    _set_constraint_active(solver, model.at_least_one_project, False)
+    timing = {'seconds': time.perf_counter() - t0, 'status': status_str, 'solves': nb_solves}
+    if journal is not None:
+        journal.enregistrer('anchor', instance=model.nom_instance, objective=obj_name, lexicographic=lexicographic, solves=nb_solves,
+                            build_s=0.0, solve_s=timing['seconds'], status=status_str, objectives=row, **stats)
+    return row, timing
+
+# Anchor résolu dans un processus séparé : modèle et environnement Gurobi propres, limite de temps propre
+def _solve_anchor_in_process(args):
+    nom_instance, obj_name, all_objectives, model_options, persistent, time_limit_sec, threads, lexicographic, journal_options = args
+    t0 = time.perf_counter()
+    journal = journal_depuis_options(journal_options)
+    solver = _make_solver(persistent)
+    solver.options['Threads'] = threads
+    if time_limit_sec and time_limit_sec > 0:
+        solver.options['TimeLimit'] = time_limit_sec
+    model = build_epsilon_model(nom_instance, obj_name, [], model_options, journal=journal)
+    _attach_model(model, solver)
+    row, timing = _solve_anchor(model, solver, obj_name, all_objectives, lexicographic=lexicographic, journal=journal)
+    timing['build_seconds'] = time.perf_counter() - t0 - timing['seconds']
+    return row, timing
+
 # Calcule les bornes min et max pour tous les objectifs
-def _calculate_bounds(nom_instance, all_objectives, solver, tee=False):
+# Si 'model' est fourni (modèle epsilon déjà chargé dans le solveur), il est réutilisé au lieu d'être reconstruit.
+# n_workers > 1 : les anchors sont résolus en parallèle, chacun dans son processus avec la limite anchor_time_limit_sec.
+# lexicographic=True : table des gains lexicographique, d'où un nadir ('worst') moins lâche. Avec plus de deux objectifs,
+# le nadir lu sur une table lexicographique peut être trop optimiste (des points du front seraient perdus) : refusé.
+# cache : CacheResultats ; les anchors déjà connus ne sont pas résolus (ni le modèle construit s'ils le sont tous).
+# Renvoie les bornes, la table des gains et le temps de chaque anchor.
+def _calculate_bounds(nom_instance, all_objectives, solver, tee=False, model_options=None, model=None,
+                      n_workers=1, anchor_time_limit_sec=None, persistent=True, lexicographic=False, journal=None, cache=None):
+
+    if lexicographic and len(all_objectives) > 2:
+        raise ValueError("Table des gains lexicographique : nadir exact pour deux objectifs seulement "
+                         f"({len(all_objectives)} objectifs demandés)")
 
     print("--- Calcul des bornes ---")
     bounds = {}
     payoff_table = {}
+    timings = {}
 
+    # La ligne d'un anchor dépend de la liste des objectifs (ordre lexicographique) : elle fait partie de la clé
+    variante = f"anchor:{'lexicographique' if lexicographic else 'simple'}:{','.join(all_objectives)}"
+    a_resoudre = []
     for obj_name in all_objectives:
-        print(f"Optimisation pour : {obj_name}")
-        model = build_model(nom_instance)
-        set_objective(model, obj_name)
-        
-        
-        # Si on minimise (duree, retard, etc.), on veut éviter la solution triviale (0) en forçant le modèle à faire au moins 1 projet.
-        # On ne le fait pas pour 'profit' car son sens est 'maximize'.
-        if OBJECTIVE_SENSE[obj_name] == minimize:
-            print("  (Ajout contrainte : au moins 1 projet)")
-            model.at_least_one_project = Constraint(expr=sum(model.f[p] for p in model.P) >= 1)
+        connu = cache.chercher(nom_instance, model_options, obj_name, {}, variante) if cache is not None else None
+        if connu is not None and connu[0] == 'optimal':
+            payoff_table[obj_name] = connu[1]
+            timings[obj_name] = {'seconds': 0.0, 'status': 'cache', 'solves': 0}
+            print(f"Anchor {obj_name} : ligne de la table des gains lue dans le cache")
+        else:
+            a_resoudre.append(obj_name)
 
-        solver.solve(model, tee=tee)
-        
-        # Stocker les résultats pour cet 'anchor point'
-        payoff_table[obj_name] = {}
-        for other_obj in all_objectives:
-            payoff_table[obj_name][other_obj] = get_obj_value(model, other_obj)
-        
-        # Stocker la meilleure valeur (diagonale de la table)
+    n_workers = max(1, min(n_workers, os.cpu_count() or 1, len(a_resoudre)))
+    if n_workers > 1:
+        threads = _threads_per_worker(n_workers)
+        if anchor_time_limit_sec is None:
+            anchor_time_limit_sec = solver.options.get('TimeLimit', 0)
+        print(f"[INFO] {len(a_resoudre)} anchors sur {n_workers} processus x {threads} threads Gurobi")
+        journal_options = journal.options_processus() if journal is not None else None
+        tasks = [(nom_instance, obj_name, all_objectives, model_options, persistent, anchor_time_limit_sec, threads, lexicographic, journal_options)
+                 for obj_name in a_resoudre]
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            for obj_name, (row, timing) in zip(a_resoudre, executor.map(_solve_anchor_in_process, tasks)):
+                payoff_table[obj_name] = row
+                timings[obj_name] = timing
+
+    elif a_resoudre:
+        if model is None:
+            model = build_epsilon_model(nom_instance, all_objectives[0], [], model_options, journal=journal)
+            _attach_model(model, solver)
+
+        # Les contraintes epsilon ne s'appliquent pas au calcul des bornes
+        _set_constraint_active(solver, model.epsilon_constraints, False)
+
+        time_limit = solver.options.get('TimeLimit')
+        if anchor_time_limit_sec is not None:
+            solver.options['TimeLimit'] = anchor_time_limit_sec
+
+        for obj_name in a_resoudre:
+            print(f"Optimisation pour : {obj_name}")
+            if OBJECTIVE_SENSE[obj_name] == minimize:
+                print("  (Ajout contrainte : au moins 1 projet)")
+            payoff_table[obj_name], timings[obj_name] = _solve_anchor(model, solver, obj_name, all_objectives, tee, lexicographic, journal)
+
+        if anchor_time_limit_sec is not None:
+            # Réécrite explicitement sur un solveur persistant, qui garderait sinon la limite des anchors
+            if time_limit is not None:
+                solver.options['TimeLimit'] = time_limit
+            elif _is_persistent(solver):
+                solver.options['TimeLimit'] = float('inf')
+            else:
+                solver.options.pop('TimeLimit', None)
+
+    if cache is not None:
+        for obj_name in a_resoudre:
+            cache.enregistrer(nom_instance, model_options, obj_name, {}, timings[obj_name]['status'], payoff_table[obj_name], variante=variante)
+
+    # Stocker la meilleure valeur (diagonale de la table)
+    for obj_name in all_objectives:
         bounds[obj_name] = {'best': payoff_table[obj_name][obj_name]}
         
     # Utiliser la table pour trouver les pires valeurs (nadir)
@@ -66,14 +329,446 @@ def _calculate_bounds(nom_instance, all_objectives, solver, tee=False):
     print("Bornes calculées (Best / Worst):")
     for obj, b in bounds.items():
         print(f"  {obj}: {b['best']:.2f} (best) ... {b['worst']:.2f} (worst)")
+    for obj, t in timings.items():
+        print(f"  Anchor {obj}: {t['seconds']:.2f}s ({t['status']})")
     print("------------------------------------------")
-    return bounds
+    return bounds, payoff_table, timings
+
+# --- Mémo des runs epsilon déjà résolus
+# Un vecteur epsilon infaisable rend infaisable tout vecteur au moins aussi strict ;
+# une solution optimale pour un vecteur plus lâche, qui respecte déjà le nouveau vecteur, reste optimale pour lui.
+
+def nouveau_memo():
+    return {'infaisables': [], 'optimaux': [], 'evites_infaisables': 0, 'evites_solutions': 0}
+
+# True si eps_a est au moins aussi strict que eps_b sur tous les objectifs de eps_b
+def _au_moins_aussi_strict(eps_a, eps_b):
+    for obj, eps in eps_b.items():
+        if obj not in eps_a:
+            return False
+        if OBJECTIVE_SENSE[obj] == minimize and eps_a[obj] > eps:
+            return False
+        if OBJECTIVE_SENSE[obj] != minimize and eps_a[obj] < eps:
+            return False
+    return True
+
+def _respecte_epsilon(point, epsilon_values, tol=1e-6):
+    for obj, eps in epsilon_values.items():
+        if OBJECTIVE_SENSE[obj] == minimize and point[obj] > eps + tol:
+            return False
+        if OBJECTIVE_SENSE[obj] != minimize and point[obj] < eps - tol:
+            return False
+    return True
+
+# Réponse connue pour ce vecteur epsilon : ('infeasible', None, None), ('optimal', point, planning) ou None s'il faut résoudre
+def _memo_chercher(memo, epsilon_values):
+    for eps in memo['infaisables']:
+        if _au_moins_aussi_strict(epsilon_values, eps):
+            memo['evites_infaisables'] += 1
+            return 'infeasible', None, None
+    for eps, point, planning in memo['optimaux']:
+        if _au_moins_aussi_strict(epsilon_values, eps) and _respecte_epsilon(point, epsilon_values):
+            memo['evites_solutions'] += 1
+            return 'optimal', dict(point), planning
+    return None
+
+# Seuls les résultats prouvés (infaisable, optimal) sont gardés : une limite de temps ne prouve rien
+def _memo_ajouter(memo, epsilon_values, status_str, point, planning=None):
+    if status_str == 'infeasible':
+        memo['infaisables'].append(dict(epsilon_values))
+    elif status_str == 'optimal':
+        memo['optimaux'].append((dict(epsilon_values), dict(point), planning))
+
+def afficher_memo(memo):
+    total = memo['evites_infaisables'] + memo['evites_solutions']
+    print(f"Appels au solveur évités par le mémo : {total} "
+          f"({memo['evites_infaisables']} infaisables, {memo['evites_solutions']} solutions réutilisées)")
+
+# Variante de résolution pour la clé du cache (cache_resultats.py) : en mode augmenté, l'objectif dépend
+# des amplitudes de la récompense (et donc de la table des gains)
+def _variante_cache(model):
+    if hasattr(model, 'eps_slack'):
+        return "epsilon_augmente:" + json.dumps(model.amplitudes_recompense, sort_keys=True)
+    return "epsilon"
+
+# Résultat d'un run : vecteur epsilon, statut, point trouvé (ou None), son planning, origine de la réponse
+# ('solveur', 'memo', 'cache', 'reprise', 'budget'), temps de résolution et preuve d'optimalité
+# (un point 'maxTimeLimit' ou 'feasible' n'est que la meilleure solution trouvée dans le temps imparti)
+# et, pour une résolution suivie (cf. suivi_progression.py), sa progression
+def _resultat_run(epsilon_values, status_str, point, planning, source, solve_s=0.0, progression=None):
+    return {'epsilon': dict(epsilon_values), 'status': status_str, 'point': point, 'planning': planning if point else None,
+            'source': source, 'solve_s': solve_s, 'prouve': status_str == 'optimal', 'progression': progression}
+
+# Résolution interrompue par l'arrêt sur plateau : la meilleure solution trouvée est gardée, comme à une limite de temps
+def _statut_apres_suivi(status_str, result, progression):
+    if progression is not None and progression['arret_plateau'] and (result.problem.number_of_solutions or 0) > 0:
+        print(f"--- ARRÊT : incumbent stable depuis {progression['derniere_amelioration_s']:.1f}s ---")
+        return 'feasible'
+    return status_str
+
+# Champs du journal pour une résolution suivie : événements (t, incumbent, borne, gap) et arrêt sur plateau
+def _champs_progression(progression):
+    if progression is None:
+        return {}
+    return {'progression': progression['evenements'], 'derniere_amelioration_s': progression['derniere_amelioration_s'],
+            'arret_plateau': progression['arret_plateau']}
+
+def _compter(budget, run):
+    if budget is not None:
+        budget.observer(run)
+    return run
+
+# LNS (lns.py) sur un run sans preuve d'optimalité, depuis le planning du run (ou le planning glouton s'il n'a pas de point).
+# Renvoie (statut, point, planning) : le point LNS ('feasible' s'il n'y en avait pas) n'est gardé que s'il respecte les epsilon,
+# sinon le run est rendu tel quel. Sous un budget, la LNS ne dispose que du temps restant.
+def _ameliorer_par_lns(lns, nom_instance, epsilon_values, all_objectives, status_str, point, planning, budget=None):
+    ameliore = lns.ameliorer(nom_instance, all_objectives[0], planning if point else None, epsilon_values,
+                             budget.restant() if budget is not None else None)
+    if ameliore.meta['epsilon_violes']:
+        return status_str, point, planning
+    status_str = status_str if point else 'feasible'
+    point = {'status': status_str, **{obj: ameliore.objectifs[obj] for obj in all_objectives}}
+    print(f"-> Résultat (LNS) : {point}")
+    return status_str, point, ameliore
+
+# Gap MIP relatif réellement appliqué à la dernière résolution : paramètre du modèle Gurobi pour le solveur persistant
+# (qui garde la dernière valeur reçue), options du solveur sinon
+def _gap_tolere(solver):
+    if hasattr(solver, 'get_gurobi_param_info'):
+        return solver.get_gurobi_param_info('MIPGap')[2]
+    return solver.options.get('MIPGap', GAP_PROUVE)
+
+# Un run epsilon-constraint sur le modèle déjà chargé : mise à jour des epsilon, démarrage à chaud, résolution.
+# Renvoie le résultat du run (cf. _resultat_run) et le planning à utiliser comme démarrage du run suivant
+# (Planning, cf. planning.py) : quand un point est trouvé, ce planning est le sien.
+# Avec un memo (cf. nouveau_memo), les vecteurs dont la réponse est déjà connue ne sont pas résolus.
+# Avec un cache (CacheResultats), les runs déjà prouvés lors d'une session précédente non plus.
+# Avec une reprise (reprise.py), les runs déjà enregistrés sont rejoués et les nouveaux enregistrés.
+# Avec un budget (BudgetTemps, budget.py), TimeLimit et MIPGap sont réglés avant chaque résolution ; une solution
+# 'optimal' obtenue avec un gap relâché est rendue comme 'feasible' (non prouvée : ni mémo, ni cache).
+# Budget épuisé : le run n'est pas résolu (statut STATUT_EPUISE), sauf si le mémo, la reprise ou le cache y répondent.
+# Avec un suivi (SuiviProgression, callback déjà installé sur le solveur), la progression de la résolution est gardée dans le run.
+# Avec une LNS (MoteurLNS, lns.py), un run résolu sans preuve d'optimalité est amélioré par recherche à grand voisinage.
+def _solve_epsilon_run(model, solver, epsilon_values, all_objectives, tee=False, incumbent=None, warm_start=True, memo=None, journal=None, cache=None,
+                       reprise=None, budget=None, suivi=None, lns=None):
+
+    if memo is not None:
+        connu = _memo_chercher(memo, epsilon_values)
+        if connu is not None:
+            status_str, point, planning = connu
+            if point is None:
+                print("--- INFÉISABLE (déjà prouvé pour un epsilon plus lâche) ---")
+            else:
+                print(f"-> Résultat (mémo) : {point}")
+                incumbent = planning
+            if journal is not None:
+                journal.enregistrer('epsilon', instance=model.nom_instance, epsilon=epsilon_values, memo=True, build_s=0.0,
+                                    prep_s=0.0, solve_s=0.0, status=status_str,
+                                    objectives={obj: point[obj] for obj in all_objectives} if point else None)
+            return _compter(budget, _resultat_run(epsilon_values, status_str, point, planning, 'memo')), incumbent
+
+    if reprise is not None:
+        connu = reprise.rejouer(epsilon_values)
+        if connu is not None:
+            status_str, point, planning = connu
+            print(f"-> Résultat (reprise) : {point if point else status_str}")
+            if point:
+                incumbent = planning
+            if memo is not None:
+                _memo_ajouter(memo, epsilon_values, status_str, point, planning)
+            return _compter(budget, _resultat_run(epsilon_values, status_str, point, planning, 'reprise')), incumbent
+
+    if cache is not None:
+        connu = cache.chercher(model.nom_instance, model.options_modele, all_objectives[0], epsilon_values, _variante_cache(model))
+        if connu is not None:
+            status_str, objectifs, planning = connu
+            point = None
+            if status_str == 'optimal':
+                point = {'status': status_str, **{obj: objectifs[obj] for obj in all_objectives}}
+                incumbent = planning
+                print(f"-> Résultat (cache) : {point}")
+            else:
+                print("--- MODÈLE INFÉISABLE (cache) ---")
+            if memo is not None:
+                _memo_ajouter(memo, epsilon_values, status_str, point, planning)
+            if reprise is not None:
+                reprise.enregistrer(epsilon_values, status_str, point, planning)
+            if journal is not None:
+                journal.enregistrer('epsilon', instance=model.nom_instance, epsilon=epsilon_values, memo=False, cache=True, build_s=0.0,
+                                    prep_s=0.0, solve_s=0.0, status=status_str, objectives=objectifs)
+            return _compter(budget, _resultat_run(epsilon_values, status_str, point, planning, 'cache')), incumbent
+
+    limite, gap = None, None
+    if budget is not None:
+        if budget.epuise():
+            print("--- BUDGET DE TEMPS ÉPUISÉ : run non résolu ---")
+            return _compter(budget, _resultat_run(epsilon_values, STATUT_EPUISE, None, None, 'budget')), incumbent
+        # Objectif augmenté : MIPGap 0 (cf. set_augmented_objective) hors relâchement
+        limite, gap = budget.regler(solver, 0 if hasattr(model, 'amplitudes_recompense') else GAP_PROUVE)
+        print(f"   (budget : limite {limite:.1f}s" + (f", gap MIP {gap:.2%})" if gap is not None else ")"))
+
+    t0 = time.perf_counter()
+    # Mettre à jour les seconds membres des contraintes Epsilon
+    set_epsilon_values(model, solver, epsilon_values)
+
+    # Démarrage à chaud depuis le planning du run précédent (réparé s'il viole les nouveaux epsilon)
+    start = warm_start and preparer_demarrage(model, incumbent, epsilon_values)
+
+    # Résoudre le modèle contraint
+    t1 = time.perf_counter()
+    if suivi is not None:
+        suivi.demarrer_run(model.obj.sense)
+    result = solver.solve(model, tee=tee, warmstart=start)
+    t2 = time.perf_counter()
+    progression = suivi.terminer_run() if suivi is not None else None
+    status_str = _statut_apres_suivi(str(result.solver.termination_condition), result, progression)
+    # Lu tout de suite : Gurobi oublie ces attributs dès que le modèle est modifié
+    stats = statistiques_solveur(solver, result)
+    if status_str == 'optimal' and _gap_tolere(solver) > GAP_PROUVE and not (stats['mip_gap'] is not None and stats['mip_gap'] <= GAP_PROUVE):
+        status_str = 'feasible'
+
+    # Stocker les résultats
+    point = None
+    if status_str in ['optimal', 'maxTimeLimit', 'feasible']:
+        if status_str == 'maxTimeLimit':
+            print("--- ATTENTION : LIMITE DE TEMPS ATTEINTE ---")
+
+        point = {'status': status_str}
+        for obj in all_objectives:
+            point[obj] = get_obj_value(model, obj)
+
+        print(f"-> Résultat : {point}")
+        meta = {'epsilon': dict(epsilon_values), 'solve_s': t2 - t1, 'warm_start': bool(start), 'prouve': status_str == 'optimal',
+                'mip_gap': stats['mip_gap']}
+        if limite is not None:
+            meta.update(time_limit=limite, mip_gap_tolere=gap)
+        if progression is not None:
+            meta.update(derniere_amelioration_s=progression['derniere_amelioration_s'], arret_plateau=progression['arret_plateau'])
+        incumbent = extraire_planning(model, all_objectives, meta=meta)
+        if memo is not None:
+            _memo_ajouter(memo, epsilon_values, status_str, point, incumbent)
+
+    elif status_str == 'infeasible':
+        print("--- MODÈLE INFÉISABLE (Epsilon trop strict) ---")
+        if memo is not None:
+            _memo_ajouter(memo, epsilon_values, status_str, None)
+        # Nous n'ajoutons pas ce point au front
+    else:
+        print(f"--- ÉCHEC DE LA RÉSOLUTION (Status: {status_str}) ---")
+
+    if lns is not None and status_str not in ['optimal', 'infeasible']:
+        status_str, point, incumbent = _ameliorer_par_lns(lns, model.nom_instance, epsilon_values, all_objectives, status_str, point,
+                                                          incumbent, budget)
+
+    if cache is not None:
+        cache.enregistrer(model.nom_instance, model.options_modele, all_objectives[0], epsilon_values, status_str,
+                          point and {obj: point[obj] for obj in all_objectives}, incumbent if point else None, _variante_cache(model))
+    if reprise is not None:
+        reprise.enregistrer(epsilon_values, status_str, point, incumbent if point else None)
+
+    if journal is not None:
+        journal.enregistrer('epsilon', instance=model.nom_instance, epsilon=epsilon_values, memo=False, warm_start=bool(start),
+                            build_s=0.0, prep_s=t1 - t0, solve_s=t2 - t1, status=status_str,
+                            objectives={obj: point[obj] for obj in all_objectives} if point else None, **stats,
+                            **_champs_progression(progression))
+    return _compter(budget, _resultat_run(epsilon_values, status_str, point, incumbent, 'solveur', t2 - t1, progression)), incumbent
+
+# Ligne interne de la grille v1 en mode augmenté (AUGMECON2), parcourue de l'epsilon le plus lâche au plus strict.
+# L'écart sur l'objectif interne indique combien de pas de grille donneraient la même solution : on les saute.
+# Dès qu'un run est infaisable, les suivants (plus stricts) le sont aussi : on arrête la ligne.
+# Renvoie les résultats des runs de la ligne (cf. _resultat_run) et le planning de démarrage du run suivant.
+def _solve_epsilon_line(model, solver, outer_values, inner_obj, inner_values, all_objectives, tee=False, incumbent=None, warm_start=True, memo=None, journal=None, cache=None,
+                        budget=None, suivi=None, lns=None):
+    runs = []
+    step = abs(inner_values[1] - inner_values[0]) if len(inner_values) > 1 else 0
+    i = 0
+    while i < len(inner_values):
+        epsilon_values = dict(outer_values)
+        epsilon_values[inner_obj] = inner_values[i]
+        print(f"\n[Run] Résolution pour Epsilon = {epsilon_values}")
+
+        run, incumbent = _solve_epsilon_run(model, solver, epsilon_values, all_objectives, tee=tee, incumbent=incumbent, warm_start=warm_start,
+                                            memo=memo, journal=journal, cache=cache, budget=budget, suivi=suivi, lns=lns)
+        runs.append(run)
+        point = run['point']
+        if not point:
+            break
+
+        # Écart = epsilon - valeur obtenue (dans le sens de l'objectif) : lu sur le point, qu'il vienne du solveur, du mémo ou du cache
+        ecart = abs(epsilon_values[inner_obj] - point[inner_obj])
+        bypass = int(np.floor(ecart / step + 1e-6)) if step > 0 else 0
+        if bypass > 0:
+            print(f"   (écart {ecart:.2f} : {bypass} pas sautés)")
+        i += 1 + bypass
+    return runs, incumbent
+
+# --- Exécution parallèle de la grille epsilon (v1)
+# Chaque processus construit son propre modèle une fois (initializer) puis résout les cellules qu'on lui confie.
+# _worker : modèle, solveur, planning de démarrage et options de _solve_epsilon_run du processus.
+
+_worker = {}
+
+# Nombre de threads Gurobi par processus : le total ne doit jamais dépasser le nombre de coeurs
+def _threads_per_worker(n_workers, threads_per_worker=None):
+    nb_coeurs = os.cpu_count() or 1
+    max_threads = max(1, nb_coeurs // n_workers)
+    if threads_per_worker is None:
+        return max_threads
+    return max(1, min(threads_per_worker, max_threads))
+
+# Options passées par nom (cf. _options_worker) : les objets non transmissibles arrivent sous forme d'options_processus()
+def _init_epsilon_worker(*, nom_instance, primary_objective, secondary_objectives, model_options, persistent, time_limit_sec, threads, tee, warm_start,
+                         augmented_bounds=None, use_memo=True, journal_options=None, cache_options=None, budget_options=None, suivi_options=None,
+                         lns_options=None):
+    budget = budget_depuis_options(budget_options)  # le temps de construction du modèle compte dans le budget
+    journal = journal_depuis_options(journal_options)
+    solver = _make_solver(persistent)
+    solver.options['Threads'] = threads
+    if time_limit_sec > 0:
+        solver.options['TimeLimit'] = time_limit_sec
+    model = build_epsilon_model(nom_instance, primary_objective, secondary_objectives, model_options, augmented=augmented_bounds is not None, journal=journal)
+    _attach_model(model, solver)
+    suivi = suivi_depuis_options(suivi_options)
+    if suivi is not None:
+        suivi.installer(solver)
+    if augmented_bounds is not None:
+        set_augmented_objective(model, primary_objective, augmented_bounds, solver)
+    _worker.update(model=model, solver=solver, all_objectives=[primary_objective] + secondary_objectives,
+                   incumbent=planning_glouton(nom_instance) if warm_start else None,
+                   options_run=dict(tee=tee, warm_start=warm_start, memo=nouveau_memo() if use_memo else None, journal=journal,
+                                    cache=cache_depuis_options(cache_options), budget=budget, suivi=suivi,
+                                    lns=lns_depuis_options(lns_options)))
+
+def _solve_epsilon_cell(task):
+    i, total_runs, epsilon_values = task
+    print(f"\n[Run {i+1}/{total_runs}] (processus {os.getpid()}) Résolution pour Epsilon = {epsilon_values}")
+    run, _worker['incumbent'] = _solve_epsilon_run(_worker['model'], _worker['solver'], epsilon_values, _worker['all_objectives'],
+                                                   incumbent=_worker['incumbent'], **_worker['options_run'])
+    return run
+
+# Mode augmenté : l'unité de travail est une ligne interne complète (le saut AUGMECON2 est séquentiel)
+def _solve_epsilon_line_task(task):
+    i, total_lines, outer_values, inner_obj, inner_values = task
+    print(f"\n[Ligne {i+1}/{total_lines}] (processus {os.getpid()}) Epsilon externes = {outer_values}")
+    runs, _worker['incumbent'] = _solve_epsilon_line(_worker['model'], _worker['solver'], outer_values, inner_obj, inner_values,
+                                                     _worker['all_objectives'], incumbent=_worker['incumbent'], **_worker['options_run'])
+    return runs
+
+# Résout toutes les cellules (ou lignes) de la grille sur n_workers processus.
+# executor.map rend les résultats dans l'ordre de la grille : le résultat ne dépend pas de l'ordonnancement.
+# Les résultats sont rendus au fur et à mesure (générateur), pour être archivés sans attendre la fin de la grille.
+# Si le consommateur s'arrête avant la fin, les cellules pas encore commencées sont annulées.
+# worker_options : arguments nommés de _init_epsilon_worker.
+def _solve_epsilon_grid_parallel(tasks, n_workers, worker_options, task_function=_solve_epsilon_cell):
+    # Des paquets de cellules voisines par processus pour garder l'intérêt du démarrage à chaud
+    chunksize = max(1, len(tasks) // (4 * n_workers))
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=functools.partial(_init_epsilon_worker, **worker_options)) as executor:
+        try:
+            yield from executor.map(task_function, tasks, chunksize=chunksize)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+# Archive le point ; si le front est stocké, garde aussi son planning (plannings : id(point) -> Planning).
+# Renvoie True si le point est entré dans l'archive.
+def _archiver(archive, point, planning, plannings):
+    if not archive.inserer(point):
+        return False
+    if plannings is not None:
+        plannings[id(point)] = planning
+        # Oublier les plannings des points évincés de l'archive
+        if len(plannings) > 2 * len(archive) + 100:
+            gardes = {id(p) for p in archive.points()}
+            for cle in [cle for cle in plannings if cle not in gardes]:
+                del plannings[cle]
+    return True
+
+def _stocker_front(store, points, plannings, all_objectives):
+    if store is None or not points:
+        return
+    ecrire_front(store, points, [plannings[id(p)] for p in points], all_objectives)
+    print(f"Front et plannings de {len(points)} points écrits dans {store}")
+
+# Limite de temps de chaque résolution de la table des gains sous un budget (None : limite du solveur)
+def _limite_anchors(budget, all_objectives, lexicographic):
+    if budget is None:
+        return None
+    return budget.limite_bornes(len(all_objectives) ** 2 if lexicographic else len(all_objectives))
+
+# Cas sans objectif secondaire de v1/v2 : un seul run, rendu puis renvoyé comme front
+# Avec une LNS, une résolution sans preuve d'optimalité est améliorée (cf. _ameliorer_par_lns)
+def _iter_mono_objectif(nom_instance, primary_objective, solver, tee, model_options, store, budget=None, suivi=None, lns=None):
+    print("\n--- Optimisation mono-objectif ---")
+    print(f"Objectif principal : {primary_objective}")
+    model = build_model(nom_instance, **(model_options or {}))
+    set_objective(model, primary_objective)
+    _attach_model(model, solver)
+    if budget is not None:
+        budget.prevoir(1)
+        budget.regler(solver)
+    if suivi is not None and suivi.installer(solver):
+        suivi.demarrer_run(model.obj.sense)
+    t0 = time.perf_counter()
+    result = solver.solve(model, tee=tee)
+    solve_s = time.perf_counter() - t0
+    progression = suivi.terminer_run() if suivi is not None else None
+    status_str = _statut_apres_suivi(str(result.solver.termination_condition), result, progression)
+
+    point, planning = None, None
+    if status_str == 'optimal':
+        point = {'status': 'Optimal', primary_objective: get_obj_value(model, primary_objective)}
+        planning = extraire_planning(model, [primary_objective], meta={'epsilon': {}, 'solve_s': solve_s, 'warm_start': False})
+        print(f"Solution trouvée : {point}")
+    else:
+        print(f"Échec de la résolution : {result.solver.termination_condition}")
+        if lns is not None:
+            if (result.problem.number_of_solutions or 0) > 0:
+                point = {'status': status_str, primary_objective: get_obj_value(model, primary_objective)}
+                planning = extraire_planning(model, [primary_objective], meta={'epsilon': {}, 'solve_s': solve_s, 'warm_start': False})
+            status_str, point, planning = _ameliorer_par_lns(lns, nom_instance, {}, [primary_objective], status_str, point, planning, budget)
+    run = _compter(budget, _resultat_run({}, status_str, point, planning, 'solveur', solve_s, progression))
+    yield {**run, 'archive': point is not None, 'depuis_debut_s': solve_s}
+    if point is None:
+        return []
+    _stocker_front(store, [point], {id(point): planning}, [primary_objective])
+    return [point]
+
+# Vide un générateur de runs (iter_multiobjective_epsilon_constraint_v1/_v2) et renvoie le front qu'il renvoie à la fin
+def _vider(runs):
+    while True:
+        try:
+            next(runs)
+        except StopIteration as fin:
+            return fin.value
 
 # --Version 1 : exploration du front avec linspace et un intervalle choisi --> pratique pour obtenir la forme du front de Pareto sans être forcément exhaustif, 
 # notamment pour réduire le temps lors de la minimisation de la durée
-def solve_multiobjective_epsilon_constraint_v1(nom_instance, primary_objective, secondary_objectives=[], nb_epsilon_steps=5, tee=False, time_limit_sec=60):
+# n_workers > 1 : les cellules de la grille sont résolues en parallèle, avec threads_per_worker threads Gurobi par processus
+# augmented=True : epsilon-constraint augmenté (AUGMECON2), avec saut des pas de grille redondants sur l'objectif interne
+# use_memo=True : cf. v2 (utile surtout en mode augmenté, où la grille va du plus lâche au plus strict)
+# journal : JournalRuns (instrumentation.py), un événement par construction, anchor et run
+# store : dossier où écrire le front et le planning de chacun de ses points (cf. stockage_front.py)
+# cache : CacheResultats (cache_resultats.py) consulté avant chaque anchor et chaque run, rempli avec les résultats prouvés
+# budget : BudgetTemps (budget.py), temps total de la recherche ; remplace time_limit_sec (limite et gap réglés run par run)
+# suivi : SuiviProgression (suivi_progression.py), progression (t, incumbent, borne, gap) de chaque run et arrêt sur plateau
+# lns : MoteurLNS (lns.py), recherche à grand voisinage sur les runs non prouvés optimaux (limite de temps, plateau, gap relâché)
+# ou sans solution ; sous un budget, elle puise dans le temps restant
+# Les points sont gardés dans une archive de Pareto au fil des runs : seuls les points non dominés sont renvoyés
+def solve_multiobjective_epsilon_constraint_v1(*args, **kwargs):
+    return _vider(iter_multiobjective_epsilon_constraint_v1(*args, **kwargs))
+
+# Version générateur de v1 (mêmes paramètres) : chaque run est rendu dès qu'il est résolu, sous la forme d'un dict
+#   epsilon, status, point (None si pas de solution), planning, source ('solveur', 'memo', 'cache', 'reprise'), solve_s,
+#   archive (le point est entré dans l'archive), depuis_debut_s (temps écoulé depuis le début de la recherche)
+# Le front final est la valeur de retour du générateur (StopIteration.value, ou 'front = yield from ...').
+# Le consommateur peut arrêter la recherche en cours de route (break, close()) : le front n'est alors pas stocké.
+def iter_multiobjective_epsilon_constraint_v1(nom_instance, primary_objective, secondary_objectives=[], nb_epsilon_steps=5, tee=False, time_limit_sec=60, model_options=None, persistent=True, warm_start=True, n_workers=1, threads_per_worker=None, lexicographic_bounds=False, augmented=False, use_memo=True, journal=None, store=None, cache=None, budget=None,
+                                              suivi=None, lns=None):
     
-    solver = SolverFactory('gurobi')
+    debut = time.perf_counter()
+    if budget is not None:
+        budget.demarrer()
+        time_limit_sec = 0
+    solver = _make_solver(persistent)
     if time_limit_sec > 0:
         solver.options['TimeLimit'] = time_limit_sec
         print(f"[INFO] Limite de temps Gurobi réglée à {time_limit_sec} secondes.")
@@ -82,96 +777,142 @@ def solve_multiobjective_epsilon_constraint_v1(nom_instance, primary_objective,
     
     # --- Cas 1 : Optimisation simple (aucun objectif secondaire) ---
     if not secondary_objectives:
-        print("\n--- Optimisation mono-objectif ---")
-        print(f"Objectif principal : {primary_objective}")
-        model = build_model(nom_instance)
-        set_objective(model, primary_objective)
-        result = solver.solve(model, tee=tee)
-        
-        if result.solver.termination_condition == TerminationCondition.optimal:
-            point = {'status': 'Optimal'}
-            for obj in all_objectives:
-                point[obj] = get_obj_value(model, obj)
-            print(f"Solution trouvée : {point}")
-            return [point]
-        else:
-            print(f"Échec de la résolution : {result.solver.termination_condition}")
-            return []
+        return (yield from _iter_mono_objectif(nom_instance, primary_objective, solver, tee, model_options, store, budget, suivi, lns))
 
     # --- Cas 2 : Optimisation Multi-objectif ---
     
+    # Le modèle est construit une seule fois et gardé dans le solveur pour tous les runs
+    model = build_epsilon_model(nom_instance, primary_objective, secondary_objectives, model_options, augmented=augmented, journal=journal)
+    _attach_model(model, solver)
+    if suivi is not None and not suivi.installer(solver):
+        suivi = None
+
     # 1. Calculer les bornes 
-    bounds = _calculate_bounds(nom_instance, all_objectives, solver, tee=False) # 'tee' forcé à False ici pour la clarté
+    bounds, payoff_table, _ = _calculate_bounds(nom_instance, all_objectives, solver, tee=False, model_options=model_options, model=model,
+                                                n_workers=n_workers, persistent=persistent, lexicographic=lexicographic_bounds, journal=journal,
+                                                cache=cache, anchor_time_limit_sec=_limite_anchors(budget, all_objectives, lexicographic_bounds)) # 'tee' forcé à False ici pour la clarté
+    if augmented:
+        set_augmented_objective(model, primary_objective, bounds, solver)
+    else:
+        set_objective(model, primary_objective, solver)
 
     # 2. Générer les grilles d'epsilon
+    # En mode augmenté, chaque grille va de l'epsilon le plus lâche (worst) au plus strict (best)
     epsilon_ranges = {}
     for sec_obj in secondary_objectives:
         b = bounds[sec_obj]
-        epsilon_ranges[sec_obj] = np.linspace(b['best'], b['worst'], nb_epsilon_steps)
+        if augmented:
+            epsilon_ranges[sec_obj] = np.linspace(b['worst'], b['best'], nb_epsilon_steps)
+        else:
+            epsilon_ranges[sec_obj] = np.linspace(b['best'], b['worst'], nb_epsilon_steps)
         print(f"Grille Epsilon pour '{sec_obj}' (de {b['best']:.2f} à {b['worst']:.2f})")
 
     # Utiliser itertools.product pour créer la grille N-dimensionnelle
     epsilon_grids = [epsilon_ranges[sec_obj] for sec_obj in secondary_objectives]
-    pareto_points = []
+    archive = ArchivePareto(all_objectives)
+    plannings = {} if store is not None else None
+    memo = nouveau_memo() if use_memo else None
+    # Planning du dernier run résolu, pour le démarrage à chaud ; le premier run part du planning glouton (heuristique.py)
+    incumbent = planning_glouton(nom_instance) if warm_start else None
 
-    total_runs = len(list(itertools.product(*epsilon_grids)))
+    def _publier(run):
+        # En parallèle, chaque processus a son propre budget : celui-ci ne fait que compter les runs
+        if budget is not None and n_workers > 1:
+            budget.observer(run)
+        run['archive'] = bool(run['point']) and _archiver(archive, run['point'], run['planning'], plannings)
+        run['depuis_debut_s'] = time.perf_counter() - debut
+        return run
+
+    grid = [dict(zip(secondary_objectives, epsilon_tuple)) for epsilon_tuple in itertools.product(*epsilon_grids)]
+    total_runs = len(grid)
     print(f"\n--- Lancement de {total_runs} optimisations Epsilon-Constraint ---")
+    if budget is not None:
+        budget.prevoir(total_runs)
 
     # 3. Itérer sur la grille d'epsilon
-    for i, epsilon_tuple in enumerate(itertools.product(*epsilon_grids)):
-        
-        epsilon_values = dict(zip(secondary_objectives, epsilon_tuple))
-        print(f"\n[Run {i+1}/{total_runs}] Résolution pour Epsilon = {epsilon_values}")
+    n_workers = max(1, min(n_workers, os.cpu_count() or 1, total_runs))
+    threads = _threads_per_worker(n_workers, threads_per_worker)
+    worker_options = dict(nom_instance=nom_instance, primary_objective=primary_objective, secondary_objectives=secondary_objectives,
+                          model_options=model_options, persistent=persistent, time_limit_sec=time_limit_sec, threads=threads, tee=tee,
+                          warm_start=warm_start, augmented_bounds=bounds if augmented else None, use_memo=use_memo,
+                          journal_options=journal.options_processus() if journal is not None else None,
+                          cache_options=cache.options_processus() if cache is not None else None,
+                          budget_options=budget.options_processus(-(-total_runs // n_workers)) if budget is not None else None,
+                          suivi_options=suivi.options_processus() if suivi is not None else None,
+                          lns_options=lns.options_processus() if lns is not None else None)
 
-        model = build_model(nom_instance)
-        
-        # Définir l'objectif principal
-        set_objective(model, primary_objective)
-        
-        # Ajouter les contraintes Epsilon
-        model.epsilon_constraints = ConstraintList()
-        for sec_obj, eps_val in epsilon_values.items():
-            expr = get_objective_expression(model, sec_obj)
-            
-            # La contrainte est <= si on minimise, >= si on maximise
-            if OBJECTIVE_SENSE[sec_obj] == minimize:
-                model.epsilon_constraints.add(expr <= eps_val)
-            else:
-                model.epsilon_constraints.add(expr >= eps_val)
-
-        # Résoudre le modèle contraint
-        result = solver.solve(model, tee=tee)
-        
-        status_str = str(result.solver.termination_condition)
-        
-        # 4. Stocker les résultats
-        if status_str in ['optimal', 'maxTimeLimit', 'feasible']:
-            if status_str == 'maxTimeLimit':
-                print("--- ATTENTION : LIMITE DE TEMPS ATTEINTE ---")
-            
-            point = {'status': status_str}
-            for obj in all_objectives:
-                point[obj] = get_obj_value(model, obj)
-            
-            print(f"-> Résultat : {point}")
-            pareto_points.append(point)
-            
-        elif status_str == 'infeasible':
-            print("--- MODÈLE INFESABLE (Epsilon trop strict) ---")
-            # Nous n'ajoutons pas ce point au front
+    if augmented:
+        # Une ligne par combinaison des objectifs externes, l'objectif interne (le dernier) est parcouru avec saut
+        inner_obj = secondary_objectives[-1]
+        outer_grid = [dict(zip(secondary_objectives[:-1], outer_tuple)) for outer_tuple in itertools.product(*epsilon_grids[:-1])]
+        lines = [(i, len(outer_grid), outer_values, inner_obj, list(epsilon_ranges[inner_obj])) for i, outer_values in enumerate(outer_grid)]
+        n_workers = min(n_workers, len(lines))
+        if n_workers > 1:
+            print(f"[INFO] Exécution parallèle : {n_workers} processus x {threads} threads Gurobi")
+            for runs in _solve_epsilon_grid_parallel(lines, n_workers, worker_options, _solve_epsilon_line_task):
+                for run in runs:
+                    yield _publier(run)
         else:
-            print(f"--- ÉCHEC DE LA RÉSOLUTION (Status: {status_str}) ---")
+            for i, _, outer_values, inner_obj, inner_values in lines:
+                print(f"\n[Ligne {i+1}/{len(lines)}] Epsilon externes = {outer_values}")
+                runs, incumbent = _solve_epsilon_line(model, solver, outer_values, inner_obj, inner_values, all_objectives, tee=tee, incumbent=incumbent,
+                                                      warm_start=warm_start, memo=memo, journal=journal, cache=cache, budget=budget, suivi=suivi, lns=lns)
+                for run in runs:
+                    yield _publier(run)
 
-    # Nettoyer l'option du solveur
-    if time_limit_sec > 0:
-        solver.options.pop('TimeLimit', None)
+    elif n_workers > 1:
+        print(f"[INFO] Exécution parallèle : {n_workers} processus x {threads} threads Gurobi")
+        tasks = [(i, total_runs, epsilon_values) for i, epsilon_values in enumerate(grid)]
+        for run in _solve_epsilon_grid_parallel(tasks, n_workers, worker_options):
+            yield _publier(run)
+
+    else:
+        for i, epsilon_values in enumerate(grid):
+            print(f"\n[Run {i+1}/{total_runs}] Résolution pour Epsilon = {epsilon_values}")
+
+            run, incumbent = _solve_epsilon_run(model, solver, epsilon_values, all_objectives, tee=tee, incumbent=incumbent, warm_start=warm_start,
+                                                memo=memo, journal=journal, cache=cache, budget=budget, suivi=suivi, lns=lns)
+            yield _publier(run)
+
+    print(f"\nGrille terminée. {len(archive)} points non dominés dans l'archive.")
+    if memo is not None and n_workers == 1:
+        afficher_memo(memo)
+    if cache is not None:
+        cache.afficher()
+    if budget is not None:
+        budget.afficher()
+    if suivi is not None and n_workers == 1:
+        print(f"Runs arrêtés sur plateau : {suivi.nb_arrets}")
 
+    pareto_points = archive.points()
+    _stocker_front(store, pareto_points, plannings, all_objectives)
     return pareto_points
 
 # --Version 2 : exploration du front par epsilon constraint
-def solve_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective, secondary_objectives=[], tee=False, time_limit_sec=60):
+# n_workers > 1 : les anchors de la table des gains sont résolus en parallèle
+# augmented=True : epsilon-constraint augmenté (AUGMECON2), le saut vers l'epsilon suivant se lit sur l'écart de la contrainte
+# use_memo=True : les runs dont la réponse se déduit d'un run déjà résolu (infaisable ou solution réutilisable) sont évités
+# journal : JournalRuns (instrumentation.py), un événement par construction, anchor et run
+# store, cache : cf. v1
+# checkpoint : dossier de reprise (reprise.py) ; bornes et runs y sont enregistrés après chaque résolution,
+# une recherche interrompue puis relancée avec les mêmes paramètres reprend après le dernier run enregistré
+# budget : cf. v1 ; le nombre de runs restants est estimé d'après l'avancement de la recherche (cf. BudgetTemps.avancer) :
+# avant le premier run, par l'étendue de la boucle interne seule.
+# Avec checkpoint, les runs non résolus faute de temps ne sont pas enregistrés : une relance avec un nouveau budget les reprend.
+# suivi, lns : cf. v1
+def solve_multiobjective_epsilon_constraint_v2(*args, **kwargs):
+    return _vider(iter_multiobjective_epsilon_constraint_v2(*args, **kwargs))
+
+# Version générateur de v2 (mêmes paramètres) : runs rendus au fil de la recherche, cf. iter_multiobjective_epsilon_constraint_v1.
+# Avec checkpoint, une recherche arrêtée par le consommateur reprend au run suivant lors de l'appel suivant.
+def iter_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective, secondary_objectives=[], tee=False, time_limit_sec=60, model_options=None, persistent=True, warm_start=True, n_workers=1, lexicographic_bounds=False, augmented=False, use_memo=True, journal=None, store=None, cache=None,
+                                              checkpoint=None, budget=None, suivi=None, lns=None):
     
-    solver = SolverFactory('gurobi')
+    debut = time.perf_counter()
+    if budget is not None:
+        budget.demarrer()
+        time_limit_sec = 0
+    solver = _make_solver(persistent)
     if time_limit_sec > 0:
         solver.options['TimeLimit'] = time_limit_sec
         print(f"[INFO] Limite de temps Gurobi réglée à {time_limit_sec} secondes.")
@@ -180,67 +921,76 @@ def solve_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective,
     
     # --- Cas 1 : Optimisation simple (aucun objectif secondaire) ---
     if not secondary_objectives:
-        print("\n--- Optimisation mono-objectif ---")
-        print(f"Objectif principal : {primary_objective}")
-        model = build_model(nom_instance)
-        set_objective(model, primary_objective)
-        result = solver.solve(model, tee=tee)
-        
-        if result.solver.termination_condition == TerminationCondition.optimal:
-            point = {'status': 'Optimal'}
-            for obj in all_objectives:
-                point[obj] = get_obj_value(model, obj)
-            print(f"Solution trouvée : {point}")
-            return [point]
-        else:
-            print(f"Échec de la résolution : {result.solver.termination_condition}")
-            return []
+        return (yield from _iter_mono_objectif(nom_instance, primary_objective, solver, tee, model_options, store, budget, suivi, lns))
 
     # --- Cas 2 : Optimisation Multi-objectif ---
     
-    # 1. Calculer les bornes
-    bounds = _calculate_bounds(nom_instance, all_objectives, solver, tee=False)
+    # Le modèle est construit une seule fois et gardé dans le solveur pour tous les runs
+    model = build_epsilon_model(nom_instance, primary_objective, secondary_objectives, model_options, augmented=augmented, journal=journal)
+    _attach_model(model, solver)
+    if suivi is not None and not suivi.installer(solver):
+        suivi = None
+
+    # 1. Calculer les bornes (ou les relire dans le point de reprise)
+    reprise = None
+    if checkpoint is not None:
+        # Tout ce qui change la suite des runs fait partie de la configuration
+        reprise = Reprise(checkpoint, {
+            'instance': load_instance_arrays(nom_instance).content_hash, 'options': model.options_modele,
+            'primary': primary_objective, 'secondaries': secondary_objectives, 'time_limit_sec': time_limit_sec,
+            'warm_start': warm_start, 'lexicographic_bounds': lexicographic_bounds, 'augmented': augmented, 'use_memo': use_memo,
+        })
+    if reprise is not None and reprise.bornes is not None:
+        bounds, payoff_table = reprise.bornes, reprise.payoff_table
+        print(f"Bornes relues dans le point de reprise : {bounds}")
+    else:
+        bounds, payoff_table, _ = _calculate_bounds(nom_instance, all_objectives, solver, tee=False, model_options=model_options, model=model,
+                                                    n_workers=n_workers, persistent=persistent, lexicographic=lexicographic_bounds, journal=journal,
+                                                    cache=cache, anchor_time_limit_sec=_limite_anchors(budget, all_objectives, lexicographic_bounds))
+        if reprise is not None:
+            reprise.enregistrer_bornes(bounds, payoff_table)
+    if augmented:
+        set_augmented_objective(model, primary_objective, bounds, solver)
+    else:
+        set_objective(model, primary_objective, solver)
+
+    # Les points non dominés sont archivés dès qu'ils sont trouvés
+    archive = ArchivePareto(all_objectives)
+    plannings = {} if store is not None else None
 
-    pareto_points = []
-    
     # --- Définition des fonctions internes ---
 
-    def _solve_single_epsilon_run(epsilon_values):
+    # Planning du dernier run résolu, pour le démarrage à chaud ; le premier run part du planning glouton (heuristique.py)
+    incumbent = planning_glouton(nom_instance) if warm_start else None
+    memo = nouveau_memo() if use_memo else None
 
-        model = build_model(nom_instance)
-        set_objective(model, primary_objective)
-        
-        model.epsilon_constraints = ConstraintList()
-        for sec_obj, eps_val in epsilon_values.items():
-            expr = get_objective_expression(model, sec_obj)
-            
-            if OBJECTIVE_SENSE[sec_obj] == minimize:
-                model.epsilon_constraints.add(expr <= eps_val)
-            else:
-                model.epsilon_constraints.add(expr >= eps_val)
+    # Avancement de la recherche, pour le budget : position de chaque boucle dans l'étendue de son objectif (0 : 'worst',
+    # 1 : 'best') et pas déjà faits par chaque boucle
+    fractions = [0.0] * len(secondary_objectives)
+    pas = [[] for _ in secondary_objectives]
 
-        # Résoudre le modèle contraint
-        result = solver.solve(model, tee=tee)
-        status_str = str(result.solver.termination_condition)
-        
-        # Stocker les résultats
-        if status_str in ['optimal', 'maxTimeLimit', 'feasible']:
-            if status_str == 'maxTimeLimit':
-                print("--- ATTENTION : LIMITE DE TEMPS ATTEINTE ---")
-            
-            point = {'status': status_str}
-            for obj in all_objectives:
-                point[obj] = get_obj_value(model, obj)
-            
-            print(f"-> Résultat : {point}")
-            return point
-            
-        elif status_str == 'infeasible':
-            print("--- MODÈLE INFÉISABLE (Epsilon trop strict) ---")
-            return None
-        else:
-            print(f"--- ÉCHEC DE LA RÉSOLUTION (Status: {status_str}) ---")
-            return None
+    def _fraction(obj, eps):
+        etendue = abs(bounds[obj]['worst'] - bounds[obj]['best'])
+        return min(1.0, abs(eps - bounds[obj]['worst']) / etendue) if etendue > 0 else 1.0
+
+    # Part de l'espace des epsilon parcourue : une itération d'une boucle couvre son pas moyen (à défaut, tout ce qui
+    # reste de son étendue), parcouru par les boucles internes
+    def _avancement():
+        total, largeur = 0.0, 1.0
+        for k, fraction in enumerate(fractions):
+            total += largeur * fraction
+            largeur *= min(float(np.mean(pas[k])), 1.0 - fraction) if pas[k] else 1.0 - fraction
+        return total
+
+    def _solve_single_epsilon_run(epsilon_values):
+        nonlocal incumbent
+        if budget is not None:
+            budget.avancer(_avancement())
+        run, incumbent = _solve_epsilon_run(model, solver, epsilon_values, all_objectives, tee=tee, incumbent=incumbent, warm_start=warm_start,
+                                            memo=memo, journal=journal, cache=cache, reprise=reprise, budget=budget, suivi=suivi, lns=lns)
+        run['archive'] = bool(run['point']) and _archiver(archive, run['point'], run['planning'], plannings)
+        run['depuis_debut_s'] = time.perf_counter() - debut
+        return run
 
     def _recursive_adaptive_search(
         remaining_objectives,  # La liste des objectifs à traiter
@@ -250,6 +1000,7 @@ def solve_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective,
         # 1. Identifier l'objectif de cette boucle
         obj_to_iterate = remaining_objectives[0]
         is_innermost_loop = (len(remaining_objectives) == 1)
+        niveau = len(secondary_objectives) - len(remaining_objectives)
         
         # 2. Définir les bornes de la boucle
         current_eps = bounds[obj_to_iterate]['worst']
@@ -264,6 +1015,7 @@ def solve_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective,
             # 4. Préparer les contraintes pour ce run
             constraints_for_this_run = current_constraints.copy()
             constraints_for_this_run[obj_to_iterate] = current_eps
+            fractions[niveau] = _fraction(obj_to_iterate, current_eps)
             
             points_from_this_step = []
             
@@ -272,14 +1024,15 @@ def solve_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective,
                 # --- CAS DE BASE ---
                 # Nous sommes dans la boucle la plus interne. On résout.
                 print(f"\n[Run] Résolution pour Epsilon = {constraints_for_this_run}")
-                point = _solve_single_epsilon_run(constraints_for_this_run)
-                if point:
-                    points_from_this_step.append(point)
+                run = _solve_single_epsilon_run(constraints_for_this_run)
+                yield run
+                if run['point']:
+                    points_from_this_step.append(run['point'])
             
             else:
                 # --- ÉTAPE RÉCURSIVE ---
                 # Appeler la fonction pour le prochain objectif
-                points_from_inner_loop = _recursive_adaptive_search(
+                points_from_inner_loop = yield from _recursive_adaptive_search(
                     remaining_objectives[1:], # Le reste de la liste
                     constraints_for_this_run   # Les contraintes actuelles + la nôtre
                 )
@@ -301,8 +1054,17 @@ def solve_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective,
             # On prend la valeur obtenue (la plus contraignante)
             
             resulting_values = [p[obj_to_iterate] for p in points_from_this_step]
-            
-            if sense == minimize:
+
+            if augmented:
+                # AUGMECON2 : tous les epsilon couverts par le plus petit écart de la contrainte donnent les mêmes points,
+                # on saute directement après (écart = |epsilon - valeur obtenue|). Sur une boucle externe, sauter
+                # plus loin (à la valeur la plus contraignante) ferait perdre des points du front.
+                ecart = min(abs(current_eps - v) for v in resulting_values)
+                next_eps = current_eps - ecart - 0.5 if sense == minimize else current_eps + ecart + 0.5
+                if next_eps < end_bound if sense == minimize else next_eps > end_bound:
+                    break
+
+            elif sense == minimize:
                 # valeur obtenue = la plus petite valeur de l'objectif
                 trigger_value = min(resulting_values)
                 # "strictement inférieure... moins 0.5"
@@ -320,6 +1082,7 @@ def solve_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective,
                     break
             
             # Mettre à jour l'epsilon pour la prochaine itération de la boucle "while"
+            pas[niveau].append(_fraction(obj_to_iterate, next_eps) - fractions[niveau])
             current_eps = next_eps
             
         # Renvoyer tous les points trouvés par cette boucle et ses sous-boucles
@@ -327,18 +1090,29 @@ def solve_multiobjective_epsilon_constraint_v2(nom_instance, primary_objective,
 
     # --- Lancement de la recherche récursive ---
     print(f"\n--- Lancement de la recherche adaptative Epsilon-Constraint ---")
+    if budget is not None:
+        budget.prevoir(majorant_runs_v2(bounds, secondary_objectives[-1:]))
     
-    pareto_points = _recursive_adaptive_search(
+    # Les points renvoyés par la récursion ne servent qu'à calculer les sauts : le front est dans l'archive
+    yield from _recursive_adaptive_search(
         secondary_objectives, # La liste complète pour démarrer
         {}                    # Commencer avec un dict de contraintes vide
     )
+    pareto_points = archive.points()
 
-    # Nettoyer l'option du solveur
-    if time_limit_sec > 0:
-        solver.options.pop('TimeLimit', None)
-
-    print(f"\nRecherche terminée. {len(pareto_points)} points trouvés.")
+    print(f"\nRecherche terminée. {len(pareto_points)} points non dominés dans l'archive.")
+    if memo is not None:
+        afficher_memo(memo)
+    if cache is not None:
+        cache.afficher()
+    if reprise is not None:
+        print(f"Runs rejoués depuis le point de reprise : {reprise.runs_rejoues}")
+    if budget is not None:
+        budget.afficher()
+    if suivi is not None:
+        print(f"Runs arrêtés sur plateau : {suivi.nb_arrets}")
 
+    _stocker_front(store, pareto_points, plannings, all_objectives)
     return pareto_points
 
 # Filtre les points obtenus pour ne garder que les solutions non dominées
@@ -354,111 +1128,135 @@ def filter_dominated_solutions(points, primary_objective, secondary_objectives):
     if not valid_points:
         return []
 
-    filtered_points = []
-    
-    # Ne pas se comparer à soi-même
-    for i, point_a in enumerate(valid_points):
-        is_dominated = False
-        for j, point_b in enumerate(valid_points):
-            if i == j:
-                continue
- 
-
-            # Est-ce que point_b domine point_a ?
-            # b doit être meilleur ou égal sur tous les objectifs et strictement meilleur sur au moins un objectif.
-            
-            b_is_better_or_equal = True
-            b_is_strictly_better = False
-
-            for obj in all_objectives:
-                #on manipule des valeurs entières
-                val_a = int(round(point_a[obj]))
-                val_b = int(round(point_b[obj]))
-
-                sense = OBJECTIVE_SENSE[obj]
-
-                if sense == maximize: # Ex: profit
-                    if val_b < val_a:
-                        b_is_better_or_equal = False
-                        break # b n'est pas meilleur ou égal
-                    if val_b > val_a:
-                        b_is_strictly_better = True
-                
-                elif sense == minimize: # Ex: duree, retard
-                    if val_b > val_a:
-                        b_is_better_or_equal = False
-                        break # b n'est pas meilleur ou égal
-                    if val_b < val_a:
-                        b_is_strictly_better = True
-            
-            if b_is_better_or_equal and b_is_strictly_better:
-                # 'point_b' domine 'point_a'
-                is_dominated = True
-                break # 'point_a' est dominé, inutile de continuer
-        
-        if not is_dominated:
-            filtered_points.append(point_a)
-            
-    return filtered_points
+    # On manipule des valeurs entières : arrondi, puis filtre vectorisé (cf. dominance.py)
+    valeurs = np.rint([[p[obj] for obj in all_objectives] for p in valid_points])
+    masque = masque_non_domines(valeurs, [OBJECTIVE_SENSE[obj] == maximize for obj in all_objectives])
+    return [p for p, garde in zip(valid_points, masque) if garde]
+
+# Planning de repli quand le solveur n'a rien donné : planning glouton (heuristique.py), amélioré par LNS si lns est donné
+# (lns.py, sur l'objectif principal), epsilon violés signalés
+def _repli_glouton(nom_instance, epsilon_values, erreur, primary_objective=None, lns=None):
+    planning = planning_glouton(nom_instance, epsilon_values)
+    if lns is not None:
+        planning = lns.ameliorer(nom_instance, primary_objective, planning, epsilon_values)
+    violes = [obj for obj, eps in epsilon_values.items()
+              if not _respecte_epsilon({obj: planning.objectifs[obj]}, {obj: eps})]
+    planning.meta.update(repli=str(erreur), epsilon_violes=violes)
+    print(f"--- REPLI : planning {'LNS' if lns is not None else 'glouton'} ({erreur}) : {planning.objectifs}" + (f", epsilon violés : {violes}" if violes else "") + " ---")
+    return planning
 
 # Résolution d'un unique problème d'optimisation multicritère avec des bornes prédéfinies
-def solve_with_specific_epsilons(nom_instance, primary_objective, secondary_objectives, epsilon_values,tee=False):
+# 'warm_start' : planning voisin déjà connu (Planning ou liste de cellules (h,s,q,p) en indices Pyomo, cf. Planning.affectations) utilisé comme MIP start
+# Renvoie (planning, result) : planning compact de la solution (cf. planning.py), ou (None, None) sans solution.
+# Le modèle Pyomo n'est plus renvoyé (il était le premier élément du couple) : les valeurs utiles en sont lues avant sa
+# libération, planning.cellules (h,s,q,p) pour les affectations a, planning.f/fin/debut/R et planning.objectifs
+# 'cache' : CacheResultats consulté avant de construire le modèle ; result vaut alors None si la réponse vient du cache
+# 'suivi' : SuiviProgression ; progression et arrêt sur plateau sont gardés dans planning.meta
+# 'repli_glouton' : si Gurobi est indisponible (licence, serveur : ERREURS_SOLVEUR) ou ne trouve aucune solution, pas même
+# un incumbent avant la limite de temps, renvoie (planning glouton, None) ;
+# ce planning respecte les epsilon des objectifs minimisés, pas forcément celui du profit (cf. planning.meta['epsilon_violes'])
+# 'lns' : MoteurLNS (lns.py) ; une solution non prouvée optimale ('feasible', 'maxTimeLimit') et le planning de repli sont améliorés par LNS
+def solve_with_specific_epsilons(nom_instance, primary_objective, secondary_objectives, epsilon_values,tee=False, model_options=None, persistent=True, warm_start=None, journal=None, cache=None,
+                                suivi=None, repli_glouton=False, lns=None):
     print(f"\n--- Lancement d'une résolution unique avec contraintes Epsilon manuelles ---")
     print(f" Objectif Primaire: {primary_objective}")
     
-    # 1. Créer un nouveau solveur 
-    solver = SolverFactory('gurobi') 
-    
-    # 2. Construire le modèle
-    model = build_model(nom_instance)
-    
-    # 3. Définir l'objectif principal
-    set_objective(model, primary_objective)
-    
-    # 4. Ajouter les contraintes Epsilon basées sur le dict 'epsilon_values'
-    model.epsilon_constraints = ConstraintList()
-    
     if not secondary_objectives:
         print(" (Aucun objectif secondaire, résolution simple)")
 
+    # 1. Vérifier les valeurs Epsilon fournies avant de construire le modèle
     for sec_obj in secondary_objectives:
         if sec_obj not in epsilon_values:
             print(f"[ERREUR] '{sec_obj}' est listé comme secondaire mais n'a pas de valeur Epsilon fournie.")
             print(f"   Valeurs fournies : {epsilon_values}")
             return None, None
-        
-        eps_val = epsilon_values[sec_obj]
-        expr = get_objective_expression(model, sec_obj)
-        sense = OBJECTIVE_SENSE[sec_obj]
-        
-        # La contrainte est <= si on minimise (ex: retard), >= si on maximise
-        if sense == minimize:
-            # Ex: 'retard' <= 50
-            model.epsilon_constraints.add(expr <= eps_val)
-            print(f"   Ajout contrainte : {sec_obj} <= {eps_val}")
-        else:
-            # Ex: 'un_objectif_max' >= 100
-            model.epsilon_constraints.add(expr >= eps_val)
-            print(f"   Ajout contrainte : {sec_obj} >= {eps_val}")
+    epsilon_contraintes = {sec_obj: epsilon_values[sec_obj] for sec_obj in secondary_objectives}
+
+    # Réponse déjà prouvée lors d'une session précédente : pas de modèle à construire
+    if cache is not None:
+        connu = cache.chercher(nom_instance, model_options, primary_objective, epsilon_contraintes)
+        if connu is not None:
+            status_str, objectifs, planning = connu
+            if journal is not None:
+                journal.enregistrer('specific', instance=nom_instance, epsilon=epsilon_contraintes, cache=True, build_s=0.0, solve_s=0.0,
+                                    status=status_str, objectives=objectifs)
+            if status_str == 'optimal':
+                print(f"-> Solution unique lue dans le cache : {objectifs}")
+                return planning, None
+            print(f"--- MODÈLE INFÉISABLE (cache) ---")
+            return None, None
+
+    # 2. Construire le modèle (objectif principal + contraintes Epsilon)
+    t0 = time.perf_counter()
+    model = build_epsilon_model(nom_instance, primary_objective, secondary_objectives, model_options, journal=journal)
+
+    # 3. Fixer les seconds membres des contraintes Epsilon
+    # La contrainte est <= si on minimise (ex: retard), >= si on maximise
+    set_epsilon_values(model, None, epsilon_contraintes)
+    for sec_obj in secondary_objectives:
+        signe = '<=' if OBJECTIVE_SENSE[sec_obj] == minimize else '>='
+        print(f"   Ajout contrainte : {sec_obj} {signe} {epsilon_values[sec_obj]}")
 
-    # 5. Résoudre le modèle contraint
+    # 4. Démarrage à chaud si un planning voisin est fourni
+    start = preparer_demarrage(model, warm_start, epsilon_contraintes)
+    if start:
+        print("   Démarrage à chaud depuis le planning fourni")
+
+    # 5. Charger le modèle dans le solveur et le résoudre
+    # Sans licence ou sans serveur Gurobi (seules erreurs rattrapées), repli_glouton=True renvoie le planning glouton
     print("\nLancement du solveur Gurobi...")
-    result = solver.solve(model, tee=tee)
+    try:
+        solver = _make_solver(persistent)
+        solver.available(exception_flag=True)
+        _attach_model(model, solver)
+        build_s = time.perf_counter() - t0
+        if suivi is not None and suivi.installer(solver):
+            suivi.demarrer_run(model.obj.sense)
+        t0 = time.perf_counter()
+        result = solver.solve(model, tee=tee, warmstart=start)
+        solve_s = time.perf_counter() - t0
+    except ERREURS_SOLVEUR as erreur:
+        if not repli_glouton:
+            raise
+        return _repli_glouton(nom_instance, epsilon_contraintes, erreur, primary_objective, lns), None
+
+    progression = suivi.terminer_run() if suivi is not None else None
     
-    status_str = str(result.solver.termination_condition)
+    status_str = _statut_apres_suivi(str(result.solver.termination_condition), result, progression)
+    # Une limite de temps atteinte avec un incumbent donne une solution (non prouvée), comme 'feasible'
+    solution = status_str in ['optimal', 'feasible'] or (status_str == 'maxTimeLimit' and (result.problem.number_of_solutions or 0) > 0)
+    if journal is not None:
+        journal.enregistrer('specific', instance=nom_instance, epsilon={sec_obj: epsilon_values[sec_obj] for sec_obj in secondary_objectives},
+                            warm_start=bool(start), build_s=build_s, solve_s=solve_s, status=status_str,
+                            objectives={obj: get_obj_value(model, obj) for obj in [primary_objective] + secondary_objectives} if solution else None,
+                            **statistiques_solveur(solver, result), **_champs_progression(progression))
     
-    # 6. Retourner le modèle résolu et le résultat
-    if status_str in ['optimal', 'feasible']:
+    # 6. Retourner le planning de la solution (le modèle n'est pas gardé) et le résultat
+    planning = None
+    if solution:
+        meta = {'epsilon': epsilon_contraintes, 'solve_s': solve_s, 'warm_start': bool(start), 'prouve': status_str == 'optimal'}
+        if progression is not None:
+            meta.update(derniere_amelioration_s=progression['derniere_amelioration_s'], arret_plateau=progression['arret_plateau'],
+                        progression=progression['evenements'])
+        planning = extraire_planning(model, [primary_objective] + secondary_objectives, meta=meta)
+    if cache is not None:
+        cache.enregistrer(nom_instance, model_options, primary_objective, epsilon_contraintes, status_str,
+                          planning.objectifs if planning is not None else None, planning)
+
+    if solution and status_str != 'optimal' and lns is not None:
+        ameliore = lns.ameliorer(nom_instance, primary_objective, planning, epsilon_contraintes)
+        if not ameliore.meta['epsilon_violes']:
+            planning = ameliore
+
+    if solution:
         print(f"-> Solution unique trouvée (Status: {status_str})")
-        return model, result
+        return planning, result
     elif status_str == 'infeasible':
         print(f"--- ÉCHEC : MODÈLE INFÉISABLE ---")
         print("     Vérifiez vos contraintes Epsilon, elles sont probablement trop strictes.")
         return None, None
     else:
         print(f"--- ÉCHEC de la résolution (Status: {status_str}) ---")
+        if repli_glouton:
+            return _repli_glouton(nom_instance, epsilon_contraintes, f"aucune solution ({status_str})", primary_objective, lns), None
         return None, None
-
-
-
-
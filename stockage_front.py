@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import numpy as np
+from planning import Planning
+
+# --- Stockage d'un front de Pareto sur disque : objectifs, métadonnées et planning de chaque point
+# Un dossier par front, en colonnes NumPy (.npy) :
+#   objectifs.npy [N,k]    valeurs des objectifs, dans l'ordre de front.json['objectives']
+#   cellules.npy  [T,4]    cellules (h,s,q,p) de tous les plannings mis bout à bout (0-based)
+#   offsets.npy   [N+1]    le planning du point i occupe cellules[offsets[i]:offsets[i+1]] (format CSR)
+#   projets.npy   [N,4,P]  vecteurs f, fin, debut, R de chaque point
+#   front.json             instance, dimensions, objectifs, statut et métadonnées de résolution de chaque point
+# Les .npy sont ouverts en mmap : lire le planning d'un point ne charge que ses cellules.
+
+FICHIERS = ['objectifs.npy', 'cellules.npy', 'offsets.npy', 'projets.npy', 'front.json']
+
+# Un dossier existant n'est supprimé que s'il est vide ou ne contient que des fichiers d'un front
+# (front.json obligatoire, sauf pour le dossier temporaire d'une écriture interrompue) : sinon ValueError
+def _verifier_remplacable(dossier, temporaire=False):
+    if not os.path.exists(dossier):
+        return
+    contenu = set(os.listdir(dossier)) if os.path.isdir(dossier) else None
+    if contenu is None or not contenu <= set(FICHIERS) or (contenu and not temporaire and 'front.json' not in contenu):
+        raise ValueError(f"{dossier} existe et ne contient pas un front stocké : il n'est pas remplacé")
+
+# Écrit le front (points renvoyés par v1/v2 et leurs plannings, dans le même ordre) dans 'dossier'.
+# Le dossier est écrit à côté puis renommé : un front déjà stocké n'est jamais à moitié remplacé.
+# Un dossier existant qui n'est pas un front (cf. _verifier_remplacable) n'est jamais écrasé.
+def ecrire_front(dossier, points, plannings, objectives):
+    if len(points) != len(plannings):
+        raise ValueError(f"{len(points)} points mais {len(plannings)} plannings")
+    if not plannings:
+        raise ValueError("Front vide : rien à stocker")
+
+    tmp = dossier.rstrip(os.sep) + ".tmp"
+    _verifier_remplacable(dossier)
+    _verifier_remplacable(tmp, temporaire=True)
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    tailles = [len(planning) for planning in plannings]
+    np.save(os.path.join(tmp, 'objectifs.npy'), np.array([[p[obj] for obj in objectives] for p in points], dtype=float))
+    np.save(os.path.join(tmp, 'cellules.npy'), np.concatenate([planning.cellules for planning in plannings]))
+    np.save(os.path.join(tmp, 'offsets.npy'), np.concatenate([[0], np.cumsum(tailles)]).astype(np.int64))
+    np.save(os.path.join(tmp, 'projets.npy'),
+            np.array([[planning.f, planning.fin, planning.debut, planning.R] for planning in plannings], dtype=np.int32))
+    with open(os.path.join(tmp, 'front.json'), "w") as f:
+        json.dump({
+            'instance': plannings[0].nom_instance,
+            'dimensions': plannings[0].dimensions,
+            'objectives': list(objectives),
+            'points': [{'status': p['status'], **planning.meta} for p, planning in zip(points, plannings)],
+        }, f, indent=1)
+
+    if os.path.exists(dossier):
+        shutil.rmtree(dossier)
+    os.replace(tmp, dossier)
+    return dossier
+
+class StockFront:
+
+    def __init__(self, dossier):
+        self.dossier = dossier
+        with open(os.path.join(dossier, 'front.json')) as f:
+            self._meta = json.load(f)
+        self.nom_instance = self._meta['instance']
+        self.dimensions = tuple(self._meta['dimensions'])
+        self.objectives = self._meta['objectives']
+        self.objectifs = np.load(os.path.join(dossier, 'objectifs.npy'))
+        self._offsets = np.load(os.path.join(dossier, 'offsets.npy'))
+        self._cellules = np.load(os.path.join(dossier, 'cellules.npy'), mmap_mode='r')
+        self._projets = np.load(os.path.join(dossier, 'projets.npy'), mmap_mode='r')
+
+    def __len__(self):
+        return len(self.objectifs)
+
+    # Le point i au format des solveurs ({'status': ..., objectif: valeur})
+    def point(self, i):
+        return {'status': self._meta['points'][i]['status'], **dict(zip(self.objectives, self.objectifs[i].tolist()))}
+
+    def points(self):
+        return [self.point(i) for i in range(len(self))]
+
+    # Planning du point i, lu à la demande
+    def planning(self, i):
+        debut, fin = self._offsets[i], self._offsets[i + 1]
+        f, fin_p, debut_p, R = np.array(self._projets[i])
+        meta = {k: v for k, v in self._meta['points'][i].items() if k != 'status'}
+        return Planning(self.nom_instance, self.dimensions, np.array(self._cellules[debut:fin]), f, fin_p, debut_p, R,
+                        dict(zip(self.objectives, self.objectifs[i].tolist())), meta)
+
+def ouvrir_front(dossier):
+    return StockFront(dossier)
@@ -0,0 +1,100 @@
+import math
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
+
+try:
+    from gurobipy import GRB
+except ImportError:  # interface par fichier LP sans gurobipy : pas de callbacks
+    GRB = None
+
+# --- Suivi de la progression de Gurobi pendant une résolution (callbacks du solveur persistant)
+# Chaque résolution suivie donne une liste d'événements (t, incumbent, borne, gap) : une ligne à chaque nouvelle
+# solution (MIPSOL) et au plus une toutes les intervalle_sec secondes pendant le branch-and-bound (MIP).
+# Arrêt sur plateau (facultatif) : la résolution est interrompue quand l'incumbent ne s'est pas amélioré depuis
+# plateau_sec secondes et que le gap est sous gap_arret (s'il est donné). La solution gardée n'est pas prouvée optimale.
+# Seules les résolutions ouvertes par demarrer_run() sont suivies : les anchors de la table des gains ne sont jamais arrêtés.
+# Le callback de Pyomo reçoit le modèle Pyomo et le solveur Pyomo, pas le modèle gurobipy, et le solveur ne propose pas
+# d'interruption : le modèle gurobipy chargé dans le solveur est relevé à l'installation, uniquement pour l'arrêt sur
+# plateau ; s'il n'est pas accessible, la progression est suivie sans arrêt.
+
+class SuiviProgression:
+
+    def __init__(self, plateau_sec=None, gap_arret=None, intervalle_sec=1.0):
+        self.plateau_sec = plateau_sec
+        self.gap_arret = gap_arret
+        self.intervalle_sec = intervalle_sec
+        self.nb_arrets = 0
+        self._actif = False
+        self._sens = 1
+        self._modele_gurobi = None
+        self._reinitialiser()
+
+    # Options pour recréer le suivi dans un processus de calcul
+    def options_processus(self):
+        return {'plateau_sec': self.plateau_sec, 'gap_arret': self.gap_arret, 'intervalle_sec': self.intervalle_sec}
+
+    # Installe le callback sur le solveur ; renvoie False si le solveur n'en accepte pas (interface par fichier LP)
+    def installer(self, solver):
+        if GRB is None or not isinstance(solver, PersistentSolver):
+            print("[INFO] Suivi de progression indisponible : il faut l'interface 'gurobi_persistent'")
+            return False
+        self._modele_gurobi = getattr(solver, '_solver_model', None)
+        if self.plateau_sec is not None and not hasattr(self._modele_gurobi, 'terminate'):
+            print("[INFO] Arrêt sur plateau indisponible avec cette version de Pyomo : progression suivie sans arrêt")
+        solver.set_callback(self._rappel)
+        return True
+
+    def _reinitialiser(self):
+        self.evenements = []
+        self.arret_plateau = False
+        self._meilleur = None
+        self._derniere_amelioration = 0.0
+        self._dernier_evenement = -math.inf
+
+    # sens : sens de l'objectif Pyomo résolu (minimize : 1, maximize : -1), pour reconnaître une amélioration
+    def demarrer_run(self, sens):
+        self._reinitialiser()
+        self._sens = int(sens)
+        self._actif = True
+
+    # Résumé de la résolution suivie, qui est refermée
+    def terminer_run(self):
+        self._actif = False
+        if self.arret_plateau:
+            self.nb_arrets += 1
+        return {'evenements': self.evenements, 'derniere_amelioration_s': self._derniere_amelioration if self._meilleur is not None else None,
+                'arret_plateau': self.arret_plateau}
+
+    # Incumbent ou borne encore infinis (pas de solution, nœud racine pas résolu) : None, et pas de gap
+    def _enregistrer(self, t, incumbent, borne):
+        borne = borne if abs(borne) < GRB.INFINITY else None
+        gap = abs(borne - incumbent) / max(1e-10, abs(incumbent)) if incumbent is not None and borne is not None else None
+        self.evenements.append({'t': t, 'incumbent': incumbent, 'borne': borne, 'gap': gap})
+        self._dernier_evenement = t
+        return gap
+
+    def _rappel(self, cb_m, cb_opt, cb_where):
+        if not self._actif:
+            return
+        if cb_where == GRB.Callback.MIPSOL:
+            t = cb_opt.cbGet(GRB.Callback.RUNTIME)
+            valeur = cb_opt.cbGet(GRB.Callback.MIPSOL_OBJ)
+            if self._meilleur is None or self._sens * (valeur - self._meilleur) < -1e-9:
+                self._meilleur = valeur
+                self._derniere_amelioration = t
+            self._enregistrer(t, self._meilleur, cb_opt.cbGet(GRB.Callback.MIPSOL_OBJBND))
+
+        elif cb_where == GRB.Callback.MIP:
+            t = cb_opt.cbGet(GRB.Callback.RUNTIME)
+            if t - self._dernier_evenement < self.intervalle_sec:
+                return
+            incumbent = cb_opt.cbGet(GRB.Callback.MIP_OBJBST)
+            incumbent = incumbent if abs(incumbent) < GRB.INFINITY else None
+            gap = self._enregistrer(t, incumbent, cb_opt.cbGet(GRB.Callback.MIP_OBJBND))
+            if (self.plateau_sec is not None and incumbent is not None and t - self._derniere_amelioration >= self.plateau_sec
+                    and (self.gap_arret is None or (gap is not None and gap <= self.gap_arret))
+                    and hasattr(self._modele_gurobi, 'terminate')):
+                self.arret_plateau = True
+                self._modele_gurobi.terminate()
+
+def suivi_depuis_options(options):
+    return SuiviProgression(**options) if options else None
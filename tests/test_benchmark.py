@@ -0,0 +1,14 @@
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from benchmark import lancer_benchmark
+
+# Solveur non persistant ('gurobi', par fichier LP) : pas de passage au solveur séparé ; balayages classique et augmenté
+def test_benchmark_solveur_non_persistant():
+    benchmark = lancer_benchmark(['toy'], [('profit', ['retard'])], [{'sparse': True}], solver_name='gurobi', balayage=True,
+                                 memoire=False, modes_augmentes=(False, True))
+    classique, augmente = benchmark['resultats']
+    assert classique['handoff_s'] is None and classique['status'] == 'optimal'
+    assert not classique['augmented'] and augmente['augmented'] and classique['cle'] != augmente['cle']
+    assert classique['points'] == augmente['points']
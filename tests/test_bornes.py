@@ -0,0 +1,24 @@
+import os
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from solve_model import _calculate_bounds, _make_solver
+
+OBJECTIFS = ['profit', 'nb_projets_max', 'duree', 'retard']
+
+# La table des gains ne dépend ni de l'ordre des anchors ni de leur répartition entre processus
+@pytest.mark.parametrize("objectifs, lexicographic", [(OBJECTIFS, False), (OBJECTIFS[:2], True), (['profit', 'duree'], True)])
+def test_bornes_sequentielles_et_paralleles_identiques(monkeypatch, objectifs, lexicographic):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    sequentiel, table_seq, _ = _calculate_bounds('toy', objectifs, _make_solver(), n_workers=1, lexicographic=lexicographic)
+    parallele, table_par, _ = _calculate_bounds('toy', objectifs, _make_solver(), n_workers=len(objectifs), lexicographic=lexicographic)
+    assert sequentiel == parallele
+    assert table_seq == table_par
+
+# nb_projets_max n'est borné que par en dessous dans le modèle : sa ligne est lue sur le planning, pas sur N_projets
+def test_nadir_nb_projets_max_lu_sur_le_planning(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    bornes, _, _ = _calculate_bounds('toy', ['profit', 'nb_projets_max'], _make_solver(), n_workers=2)
+    assert bornes['nb_projets_max']['best'] == 1
+    assert bornes['nb_projets_max']['worst'] <= 5  # toy : 5 projets
@@ -0,0 +1,50 @@
+from budget import GAP_PROUVE, BudgetTemps, majorant_runs_v2
+
+class _Solveur:
+    def __init__(self):
+        self.options = {}
+
+def _run(solve_s):
+    return {'source': 'solveur', 'solve_s': solve_s, 'status': 'optimal', 'point': {}, 'prouve': True}
+
+# v2 : le majorant (produit des étendues) n'est qu'une borne ; un budget large garde le gap par défaut
+# tant que le rythme observé permet de finir la recherche
+def test_budget_large_garde_le_gap_par_defaut():
+    bounds = {obj: {'worst': 0, 'best': 99} for obj in ['retard', 'duree', 'nb_projets_max']}
+    budget = BudgetTemps(600)
+    budget.demarrer()
+    budget.prevoir(majorant_runs_v2(bounds, ['nb_projets_max']))
+    solveur = _Solveur()
+    for i in range(5):
+        budget.avancer(0.05 * i)
+        limite, gap = budget.regler(solveur)
+        assert gap is None and solveur.options['MIPGap'] == GAP_PROUVE
+        budget.observer(_run(1.0))
+    assert budget.runs_prevus < majorant_runs_v2(bounds, list(bounds))
+
+# Au même rythme, une recherche qui avance trop lentement pour le budget relâche le gap
+def test_budget_en_retard_relache_le_gap():
+    budget = BudgetTemps(600)
+    budget.demarrer()
+    budget.prevoir(100)
+    solveur = _Solveur()
+    for _ in range(5):
+        budget.observer(_run(60.0))
+    budget.avancer(0.01)
+    limite, gap = budget.regler(solveur)
+    assert gap is not None and solveur.options['MIPGap'] == gap
+
+# Retour au gap normal : réécrit explicitement (un solveur persistant garderait le gap relâché)
+def test_gap_de_base_reecrit_apres_relachement():
+    budget = BudgetTemps(600)
+    budget.demarrer()
+    budget.prevoir(100)
+    solveur = _Solveur()
+    for _ in range(5):
+        budget.observer(_run(60.0))
+    budget.avancer(0.01)
+    assert budget.regler(solveur)[1] is not None
+    budget.temps_observes = [0.1]
+    budget.avancer(0.99)
+    assert budget.regler(solveur, gap_base=0)[1] is None
+    assert solveur.options['MIPGap'] == 0
@@ -0,0 +1,71 @@
+import json
+import shutil
+import time
+
+import numpy as np
+
+import extraction
+from cache_resultats import CacheResultats
+from heuristique import planning_glouton
+
+OPTIONS = {'formulation': 'cellule'}
+
+# Un optimum revient avec ses objectifs et son planning, un infaisable sans planning ; un statut non prouvé n'est pas stocké
+def test_aller_retour(tmp_path):
+    cache = CacheResultats(str(tmp_path / "resultats.sqlite"))
+    planning = planning_glouton('toy')
+    objectifs = {'profit': 30.0, 'retard': 1.0}
+    assert cache.enregistrer('toy', OPTIONS, 'profit', {'retard': 2}, 'optimal', objectifs, planning)
+    assert cache.enregistrer('toy', OPTIONS, 'profit', {'retard': -1}, 'infeasible')
+    assert not cache.enregistrer('toy', OPTIONS, 'profit', {'retard': 3}, 'maxTimeLimit', objectifs, planning)
+    assert len(cache) == 2
+
+    statut, valeurs, relu = cache.chercher('toy', OPTIONS, 'profit', {'retard': 2})
+    assert statut == 'optimal' and valeurs == objectifs
+    assert np.array_equal(relu.cellules, planning.cellules)
+    assert np.array_equal(relu.f, planning.f)
+    assert cache.chercher('toy', OPTIONS, 'profit', {'retard': -1}) == ('infeasible', None, None)
+    assert cache.chercher('toy', OPTIONS, 'profit', {'retard': 3}) is None
+    assert cache.chercher('toy', {'formulation': 'agregee'}, 'profit', {'retard': 2}) is None
+    cache.fermer()
+
+# Modifier le fichier de l'instance change son empreinte : les résultats enregistrés ne sont plus servis
+def test_invalidation_instance_modifiee(tmp_path, monkeypatch):
+    monkeypatch.setattr(extraction, "CACHE_DIR", str(tmp_path / "instances"))
+    monkeypatch.setattr(extraction, "_memo", {})
+    chemin = str(tmp_path / "copie_instance.json")
+    shutil.copy(extraction.instance_path('toy'), chemin)
+    cache = CacheResultats(str(tmp_path / "resultats.sqlite"))
+    cache.enregistrer(chemin, OPTIONS, 'profit', {'retard': -1}, 'infeasible')
+    assert cache.chercher(chemin, OPTIONS, 'profit', {'retard': -1}) == ('infeasible', None, None)
+
+    with open(chemin) as f:
+        instance = json.load(f)
+    instance['jobs'][0]['gain'] += 1
+    time.sleep(0.01)
+    with open(chemin, "w") as f:
+        json.dump(instance, f)
+    assert cache.chercher(chemin, OPTIONS, 'profit', {'retard': -1}) is None
+    cache.fermer()
+
+# Au-delà de la taille maximale, l'entrée lue le moins récemment est évincée
+def test_eviction_lru(tmp_path):
+    cache = CacheResultats(str(tmp_path / "resultats.sqlite"))
+    planning = planning_glouton('toy')
+    objectifs = {'profit': 30.0, 'retard': 1.0}
+    cache.enregistrer('toy', OPTIONS, 'profit', {'retard': 1}, 'optimal', objectifs, planning)
+    taille = cache.taille_octets()
+    cache.taille_max_mo = 3.5 * taille / 1e6
+    for retard in (2, 3):
+        time.sleep(0.01)
+        cache.enregistrer('toy', OPTIONS, 'profit', {'retard': retard}, 'optimal', objectifs, planning)
+    time.sleep(0.01)
+    assert cache.chercher('toy', OPTIONS, 'profit', {'retard': 1}) is not None
+    time.sleep(0.01)
+    cache.enregistrer('toy', OPTIONS, 'profit', {'retard': 4}, 'optimal', objectifs, planning)
+
+    assert len(cache) == 3
+    assert cache.chercher('toy', OPTIONS, 'profit', {'retard': 2}) is None
+    for retard in (1, 3, 4):
+        assert cache.chercher('toy', OPTIONS, 'profit', {'retard': retard}) is not None
+    cache.fermer()
@@ -0,0 +1,35 @@
+import numpy as np
+
+from check import verifier_solution, solution_valide
+from extraction import load_instance_arrays
+from heuristique import planning_glouton
+from planning import Planning
+
+def _types(violations):
+    return sorted({v['type'] for v in violations if v['gravite'] == 'erreur'})
+
+def test_planning_glouton_valide():
+    assert solution_valide(verifier_solution(planning_glouton('toy')))
+
+# toy : la personne 3 (index 2) n'a que la qualification 3 et est en congé le jour 2
+def test_violations_detectees():
+    vide = Planning('toy', (5, 3, 3, 5), np.empty((0, 4)), np.zeros(5), np.zeros(5), np.zeros(5), np.zeros(5))
+    assert verifier_solution(vide) == []
+
+    sans_competence = Planning('toy', (5, 3, 3, 5), [(0, 2, 0, 0)], np.zeros(5), np.zeros(5), np.zeros(5), np.zeros(5))
+    assert _types(verifier_solution(sans_competence)) == ['qualification']
+
+    en_conge = Planning('toy', (5, 3, 3, 5), [(1, 2, 2, 2)], np.zeros(5), np.zeros(5), np.zeros(5), np.zeros(5))
+    assert _types(verifier_solution(en_conge)) == ['conges']
+
+    double = Planning('toy', (5, 3, 3, 5), [(0, 0, 0, 0), (0, 0, 1, 0)], np.zeros(5), np.zeros(5), np.zeros(5), np.zeros(5))
+    assert _types(verifier_solution(double)) == ['unicite']
+
+    fini = Planning('toy', (5, 3, 3, 5), [(0, 0, 0, 0), (1, 0, 0, 0)], [1, 0, 0, 0, 0], np.zeros(5), np.zeros(5), np.zeros(5))
+    assert _types(verifier_solution(fini)) == ['coherence_f', 'completion', 'depassement']
+
+# Planning sans nom d'instance (sous-problème construit sur une Instance) : l'instance est passée directement
+def test_instance_fournie():
+    planning = planning_glouton('toy')
+    sans_nom = Planning(None, planning.dimensions, planning.cellules, planning.f, planning.fin, planning.debut, planning.R)
+    assert verifier_solution(sans_nom, instance=load_instance_arrays('toy')) == verifier_solution(planning)
@@ -0,0 +1,20 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import extraction
+
+def _charger(args):
+    cache_dir, nom = args
+    extraction.CACHE_DIR = cache_dir
+    return extraction.load_instance_arrays(nom).content_hash
+
+# Plusieurs processus qui chargent la même instance à froid écrivent chacun leur fichier temporaire
+def test_chargements_a_froid_concurrents(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        empreintes = list(executor.map(_charger, [(cache_dir, 'medium')] * 8))
+    assert len(set(empreintes)) == 1
+    assert [f for f in os.listdir(cache_dir) if f.endswith(".tmp.npz")] == []
+    monkeypatch.setattr(extraction, "CACHE_DIR", cache_dir)
+    monkeypatch.setattr(extraction, "_memo", {})
+    assert extraction.load_instance_arrays('medium').content_hash == empreintes[0]
@@ -0,0 +1,26 @@
+import pytest
+
+pytest.importorskip("gurobipy")
+
+import solve_model
+from build_model import FORMULATIONS
+
+# Profit optimal de toy sous la contrainte sur le retard, pour des options de modèle données
+def _optimum(epsilon_values, **model_options):
+    planning, result = solve_model.solve_with_specific_epsilons('toy', 'profit', ['retard'], epsilon_values, model_options=model_options)
+    assert str(result.solver.termination_condition) == 'optimal'
+    assert planning.objectifs['retard'] <= epsilon_values['retard']
+    return planning.objectifs['profit']
+
+# La matrice a creuse et la matrice dense donnent le même optimum
+@pytest.mark.parametrize("retard", [0, 1, 3])
+def test_a_creuse_et_dense(retard):
+    epsilon_values = {'retard': retard}
+    assert _optimum(epsilon_values, sparse=True) == _optimum(epsilon_values, sparse=False)
+
+# Les formulations agrégées atteignent l'optimum de la formulation par cellule
+@pytest.mark.parametrize("formulation", [f for f in FORMULATIONS if f != 'cellule'])
+@pytest.mark.parametrize("retard", [0, 1, 3])
+def test_formulations_meme_optimum(formulation, retard):
+    epsilon_values = {'retard': retard}
+    assert _optimum(epsilon_values, formulation=formulation) == _optimum(epsilon_values, formulation='cellule')
@@ -0,0 +1,39 @@
+import os
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from solve_model import solve_multiobjective_epsilon_constraint_v1, solve_multiobjective_epsilon_constraint_v2
+
+def _cle(front, objectifs):
+    return sorted(tuple(round(p[obj]) for obj in objectifs) for p in front)
+
+# Nadir lexicographique : exact pour deux objectifs, même front qu'avec la table des gains classique
+@pytest.mark.parametrize("secondaire", ['nb_projets_max', 'duree', 'retard'])
+def test_front_lexicographique_deux_objectifs(secondaire):
+    objectifs = ['profit', secondaire]
+    classique = solve_multiobjective_epsilon_constraint_v2('toy', 'profit', [secondaire])
+    lexicographique = solve_multiobjective_epsilon_constraint_v2('toy', 'profit', [secondaire], lexicographic_bounds=True)
+    assert _cle(lexicographique, objectifs) == _cle(classique, objectifs)
+
+# Au-delà de deux objectifs, le nadir lexicographique peut être trop optimiste (toy : (59,4,1,1) et (65,4,2,0) perdus)
+def test_front_lexicographique_refuse_trois_secondaires():
+    with pytest.raises(ValueError):
+        solve_multiobjective_epsilon_constraint_v2('toy', 'profit', ['nb_projets_max', 'duree', 'retard'], lexicographic_bounds=True)
+
+# AUGMECON2 ne change pas le front : mêmes points que l'epsilon-constraint classique (v2), y compris avec trois secondaires
+@pytest.mark.parametrize("secondaires", [['duree'], ['retard', 'duree'], ['nb_projets_max', 'duree', 'retard']])
+def test_front_augmente_identique_au_front_v2(secondaires):
+    objectifs = ['profit'] + secondaires
+    classique = solve_multiobjective_epsilon_constraint_v2('toy', 'profit', secondaires)
+    augmente = solve_multiobjective_epsilon_constraint_v2('toy', 'profit', secondaires, augmented=True)
+    assert _cle(augmente, objectifs) == _cle(classique, objectifs)
+
+# Grille v1 répartie sur plusieurs processus (cellules, ou lignes en mode augmenté) : même front qu'en séquentiel
+@pytest.mark.parametrize("augmented", [False, True])
+def test_front_v1_parallele_identique_au_sequentiel(monkeypatch, augmented):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    objectifs = ['profit', 'retard', 'duree']
+    sequentiel = solve_multiobjective_epsilon_constraint_v1('toy', 'profit', objectifs[1:], nb_epsilon_steps=4, augmented=augmented)
+    parallele = solve_multiobjective_epsilon_constraint_v1('toy', 'profit', objectifs[1:], nb_epsilon_steps=4, augmented=augmented, n_workers=2)
+    assert _cle(parallele, objectifs) == _cle(sequentiel, objectifs)
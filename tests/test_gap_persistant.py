@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from budget import GAP_PROUVE
+from solve_model import _calculate_bounds, _gap_tolere, _make_solver, _attach_model, build_epsilon_model
+
+# Le gap relâché d'un run ne doit pas rester sur le modèle Gurobi du run suivant
+def test_gap_reecrit_sur_le_solveur_persistant():
+    solver = _make_solver(True)
+    model = build_epsilon_model('toy', 'profit', ['retard'])
+    _attach_model(model, solver)
+    solver.options['MIPGap'] = 0.03
+    solver.solve(model)
+    assert _gap_tolere(solver) == pytest.approx(0.03)
+    solver.options['MIPGap'] = GAP_PROUVE
+    solver.solve(model)
+    assert _gap_tolere(solver) == pytest.approx(GAP_PROUVE)
+
+# La limite de temps des anchors ne reste pas sur le solveur après la table des gains
+def test_limite_anchors_retiree():
+    solver = _make_solver(True)
+    model = build_epsilon_model('toy', 'profit', ['retard'])
+    _attach_model(model, solver)
+    _calculate_bounds('toy', ['profit', 'retard'], solver, model=model, anchor_time_limit_sec=5)
+    solver.solve(model)
+    assert solver.get_gurobi_param_info('TimeLimit')[2] == float('inf')
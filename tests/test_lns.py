@@ -0,0 +1,35 @@
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from build_model import OBJECTIVE_SENSE
+from heuristique import planning_glouton
+from lns import MoteurLNS
+from pyomo.environ import minimize
+
+CAS = [('toy', 'profit', {'retard': 1}), ('toy', 'retard', {'profit': 40}), ('toy', 'duree', {'profit': 50, 'nb_projets_max': 3}),
+       ('medium', 'profit', {'retard': 0}), ('medium', 'retard', {'profit': 300})]
+
+def _respecte(obj, valeur, eps):
+    return valeur <= eps + 1e-6 if OBJECTIVE_SENSE[obj] == minimize else valeur >= eps - 1e-6
+
+def _pas_pire(obj, valeur, depart):
+    return valeur <= depart + 1e-6 if OBJECTIVE_SENSE[obj] == minimize else valeur >= depart - 1e-6
+
+# Depuis le planning glouton réalisable, l'objectif ne se dégrade jamais et les epsilon restent respectés
+@pytest.mark.parametrize("nom_instance, objectif, epsilon_values", CAS)
+def test_jamais_pire_et_epsilon_respectes(nom_instance, objectif, epsilon_values):
+    depart = planning_glouton(nom_instance, epsilon_values)
+    assert all(_respecte(obj, depart.objectifs[obj], eps) for obj, eps in epsilon_values.items())
+    planning = MoteurLNS(temps_sec=2.0, limite_sous_mip_sec=1.0, graine=1).ameliorer(nom_instance, objectif, depart, epsilon_values)
+    assert _pas_pire(objectif, planning.objectifs[objectif], depart.objectifs[objectif])
+    assert planning.meta['epsilon_violes'] == []
+    assert all(_respecte(obj, planning.objectifs[obj], eps) for obj, eps in epsilon_values.items())
+
+# Un planning de départ qui viole un epsilon est d'abord réparé
+def test_depart_hors_epsilon_repare():
+    depart = planning_glouton('toy')
+    assert depart.objectifs['retard'] > 0
+    planning = MoteurLNS(temps_sec=2.0, graine=1).ameliorer('toy', 'profit', depart, {'retard': 0})
+    assert planning.meta['epsilon_violes'] == []
+    assert planning.objectifs['retard'] == 0
@@ -0,0 +1,52 @@
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from solve_model import (_attach_model, _make_solver, _solve_epsilon_run, build_epsilon_model, nouveau_memo,
+                         solve_multiobjective_epsilon_constraint_v2)
+
+OBJECTIFS = ['profit', 'retard']
+
+@pytest.fixture
+def modele_et_solveur():
+    solver = _make_solver(True)
+    model = build_epsilon_model('toy', 'profit', ['retard'])
+    _attach_model(model, solver)
+    appels = []
+    solve = solver.solve
+    solver.solve = lambda *args, **kwargs: appels.append(1) or solve(*args, **kwargs)
+    return model, solver, appels
+
+# Un vecteur au moins aussi strict qu'un vecteur prouvé infaisable n'est pas résolu ; un vecteur plus lâche l'est
+def test_memo_infaisable(modele_et_solveur):
+    model, solver, appels = modele_et_solveur
+    memo = nouveau_memo()
+    run, _ = _solve_epsilon_run(model, solver, {'retard': -1}, OBJECTIFS, memo=memo)
+    assert run['status'] == 'infeasible' and run['source'] == 'solveur' and len(appels) == 1
+
+    run, _ = _solve_epsilon_run(model, solver, {'retard': -2}, OBJECTIFS, memo=memo)
+    assert run['status'] == 'infeasible' and run['source'] == 'memo' and len(appels) == 1
+    assert memo['evites_infaisables'] == 1
+
+    run, _ = _solve_epsilon_run(model, solver, {'retard': 5}, OBJECTIFS, memo=memo)
+    assert run['source'] == 'solveur' and len(appels) == 2
+
+# Un optimum qui respecte un vecteur plus strict est aussi l'optimum de ce vecteur
+def test_memo_solution_reutilisee(modele_et_solveur):
+    model, solver, appels = modele_et_solveur
+    memo = nouveau_memo()
+    run, _ = _solve_epsilon_run(model, solver, {'retard': 10}, OBJECTIFS, memo=memo)
+    assert run['status'] == 'optimal'
+    retard = run['point']['retard']
+
+    run_memo, _ = _solve_epsilon_run(model, solver, {'retard': retard}, OBJECTIFS, memo=memo)
+    assert run_memo['source'] == 'memo' and len(appels) == 1
+    assert run_memo['point']['profit'] == run['point']['profit'] and memo['evites_solutions'] == 1
+
+# Le mémo ne change pas le front
+def test_front_identique_avec_et_sans_memo():
+    objectifs = ['profit', 'retard', 'duree']
+    cle = lambda front: sorted(tuple(round(p[obj]) for obj in objectifs) for p in front)
+    avec = solve_multiobjective_epsilon_constraint_v2('toy', 'profit', objectifs[1:], use_memo=True)
+    sans = solve_multiobjective_epsilon_constraint_v2('toy', 'profit', objectifs[1:], use_memo=False)
+    assert cle(avec) == cle(sans)
@@ -0,0 +1,20 @@
+import pytest
+
+from reprise import Reprise
+
+CONFIGURATION = {'instance': 'toy', 'objectifs': ['profit', 'retard']}
+
+def test_reprise_relit_le_journal(tmp_path):
+    dossier = str(tmp_path / "reprise")
+    reprise = Reprise(dossier, CONFIGURATION)
+    reprise.enregistrer({'retard': 3}, 'optimal', {'profit': 10, 'retard': 3})
+    reprise = Reprise(dossier, CONFIGURATION)
+    assert reprise.rejouer({'retard': 3}) == ('optimal', {'profit': 10, 'retard': 3}, None)
+    assert reprise.rejouer({'retard': 2}) is None
+
+# Un dossier quelconque passé en checkpoint= n'est jamais vidé
+def test_dossier_etranger_refuse(tmp_path):
+    (tmp_path / "notes.txt").write_text("à garder")
+    with pytest.raises(ValueError):
+        Reprise(str(tmp_path), CONFIGURATION)
+    assert (tmp_path / "notes.txt").read_text() == "à garder"
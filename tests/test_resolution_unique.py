@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("gurobipy")
+
+import solve_model
+from heuristique import planning_glouton
+from pyomo.common.errors import ApplicationError
+
+EPSILON = {'retard': 3}
+
+# Limite de temps atteinte avec un incumbent (le démarrage à chaud) : l'incumbent est rendu, pas le planning glouton
+def test_limite_de_temps_rend_l_incumbent(monkeypatch):
+    make_solver = solve_model._make_solver
+
+    def solveur_limite(persistent=True):
+        solver = make_solver(persistent)
+        solver.options['TimeLimit'] = 0.001
+        return solver
+
+    monkeypatch.setattr(solve_model, "_make_solver", solveur_limite)
+    planning, result = solve_model.solve_with_specific_epsilons('toy', 'profit', ['retard'], EPSILON,
+                                                                 warm_start=planning_glouton('toy', EPSILON), repli_glouton=True)
+    assert str(result.solver.termination_condition) == 'maxTimeLimit'
+    assert 'repli' not in planning.meta and not planning.meta['prouve']
+    assert planning.objectifs['retard'] <= EPSILON['retard']
+
+# Solveur indisponible : repli glouton
+def test_solveur_indisponible_repli_glouton(monkeypatch):
+    def solveur_absent(persistent=True):
+        raise ApplicationError("pas de licence")
+
+    monkeypatch.setattr(solve_model, "_make_solver", solveur_absent)
+    planning, result = solve_model.solve_with_specific_epsilons('toy', 'profit', ['retard'], EPSILON, repli_glouton=True)
+    assert result is None and planning.meta['repli'] == "pas de licence"
+
+# Une erreur de construction du modèle n'est pas masquée par le repli
+def test_erreur_de_modele_non_masquee(monkeypatch):
+    def modele_casse(*args, **kwargs):
+        raise KeyError('n')
+
+    monkeypatch.setattr(solve_model, "build_epsilon_model", modele_casse)
+    with pytest.raises(KeyError):
+        solve_model.solve_with_specific_epsilons('toy', 'profit', ['retard'], EPSILON, repli_glouton=True)
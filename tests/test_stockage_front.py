@@ -0,0 +1,31 @@
+import os
+import pytest
+
+from heuristique import planning_glouton
+from stockage_front import ecrire_front, ouvrir_front
+
+OBJECTIFS = ['profit', 'retard']
+
+def _front():
+    planning = planning_glouton('toy')
+    return [{'status': 'feasible', **{obj: planning.objectifs[obj] for obj in OBJECTIFS}}], [planning]
+
+def test_ecrire_puis_remplacer_un_front(tmp_path):
+    dossier = str(tmp_path / "front")
+    points, plannings = _front()
+    ecrire_front(dossier, points, plannings, OBJECTIFS)
+    ecrire_front(dossier, points, plannings, OBJECTIFS)
+    front = ouvrir_front(dossier)
+    assert front.points() == points
+    assert (front.planning(0).cellules == plannings[0].cellules).all()
+
+# Un dossier quelconque passé en store= n'est jamais supprimé
+def test_dossier_etranger_refuse(tmp_path):
+    dossier = tmp_path / "results"
+    dossier.mkdir()
+    (dossier / "notes.txt").write_text("à garder")
+    points, plannings = _front()
+    with pytest.raises(ValueError):
+        ecrire_front(str(dossier), points, plannings, OBJECTIFS)
+    assert (dossier / "notes.txt").read_text() == "à garder"
+    assert not os.path.exists(str(dossier) + ".tmp")
@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip("gurobipy")
+
+from gurobipy import GRB
+from pyomo.environ import maximize
+from suivi_progression import SuiviProgression
+
+# Solveur Pyomo vu depuis le callback : seul cbGet (public) est disponible
+class _Solveur:
+    def __init__(self, valeurs):
+        self.valeurs = valeurs
+
+    def cbGet(self, what):
+        return self.valeurs[what]
+
+class _ModeleGurobi:
+    def __init__(self):
+        self.interrompu = False
+
+    def terminate(self):
+        self.interrompu = True
+
+def _solution(suivi, t, valeur, borne):
+    suivi._rappel(None, _Solveur({GRB.Callback.RUNTIME: t, GRB.Callback.MIPSOL_OBJ: valeur, GRB.Callback.MIPSOL_OBJBND: borne}),
+                  GRB.Callback.MIPSOL)
+
+def _noeud(suivi, t, incumbent, borne):
+    suivi._rappel(None, _Solveur({GRB.Callback.RUNTIME: t, GRB.Callback.MIP_OBJBST: incumbent, GRB.Callback.MIP_OBJBND: borne}),
+                  GRB.Callback.MIP)
+
+# Le sens vient de l'objectif Pyomo : en maximisation, seule une valeur plus grande améliore l'incumbent
+def test_sens_de_l_objectif_pyomo():
+    suivi = SuiviProgression()
+    suivi.demarrer_run(maximize)
+    _solution(suivi, 1.0, 50, 80)
+    _solution(suivi, 2.0, 40, 80)
+    _solution(suivi, 3.0, 60, 80)
+    assert [e['incumbent'] for e in suivi.evenements] == [50, 50, 60]
+    assert suivi.terminer_run()['derniere_amelioration_s'] == 3.0
+
+def test_arret_sur_plateau():
+    suivi = SuiviProgression(plateau_sec=5, gap_arret=0.5)
+    suivi._modele_gurobi = _ModeleGurobi()
+    suivi.demarrer_run(maximize)
+    _solution(suivi, 1.0, 60, 80)
+    _noeud(suivi, 4.0, 60, 80)
+    assert not suivi._modele_gurobi.interrompu
+    _noeud(suivi, 7.0, 60, 80)
+    assert suivi._modele_gurobi.interrompu and suivi.terminer_run()['arret_plateau']
+    assert suivi.nb_arrets == 1
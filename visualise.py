@@ -1,81 +1,64 @@
 from pyomo.environ import *
-from check import check_solution
+from extraction import load_instance_arrays
+from planning import Planning, extraire_planning
 import matplotlib.pyplot as plt
-from pyomo.environ import value
 import numpy as np
 from matplotlib import gridspec
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.express as px
 import pandas as pd
-from pyomo.environ import value, Param
-import numpy as np
 import re
 
-def afficher_solution(model, result, seuil_affichage=0.5):
+def afficher_solution(solution, result=None, seuil_affichage=0.5):
     """
     Affiche la solution avec deux visualisations principales améliorées.
     (Version corrigée V3)
+
+    'solution' : Planning (cf. planning.py) ou modèle Pyomo résolu, dont le planning est alors extrait en bloc.
     """
 
     # --- Données ---
-    H = list(model.H)
-    S = list(model.S)
-    Q = list(model.Q)
-    P = list(model.P)
-
-    staff_names = getattr(model, "staff_names", [f"Staffeur {s}" for s in S])
-    project_names = getattr(model, "job_names", [f"Projet {p}" for p in P])
-    qual_names = getattr(model, "qual_names", [f"Qualification {q}" for q in Q])
+    planning = solution if isinstance(solution, Planning) else extraire_planning(solution, seuil=seuil_affichage)
+    instance = load_instance_arrays(planning.nom_instance)
+    Hmax, Smax, Qmax, Pmax = planning.dimensions
+    H = list(range(1, Hmax + 1))
+    S = list(range(1, Smax + 1))
+    Q = list(range(1, Qmax + 1))
+    P = list(range(1, Pmax + 1))
+
+    staff_names = instance.staff_names
+    project_names = instance.job_names
+    qual_names = instance.qual_names
 
     # --- Assignations ---
-    assignments_data = []
-    for h in H:
-        for s in S:
-            for q in Q:
-                for p in P:
-                    if value(model.a[h, s, q, p]) >= seuil_affichage:
-                        assignments_data.append({
-                            'Période': h,
-                            'Staffeur': staff_names[s-1],
-                            'Qualification': qual_names[q-1],
-                            'Projet': project_names[p-1],
-                            'Projet_ID': p
-                        })
-    df_assignments = pd.DataFrame(assignments_data)
+    # Cellules (h,s,q,p) du planning, 0-based
+    h_idx, s_idx, q_idx, p_idx = planning.cellules.T
+    df_assignments = pd.DataFrame({
+        'Période': h_idx + 1,
+        'Staffeur': np.array(staff_names, dtype=object)[s_idx],
+        'Qualification': np.array(qual_names, dtype=object)[q_idx],
+        'Projet': np.array(project_names, dtype=object)[p_idx],
+        'Projet_ID': p_idx + 1,
+    }, columns=['Période', 'Staffeur', 'Qualification', 'Projet', 'Projet_ID'])
 
     # --- Vacances ---
-    vacations_data = []
-    for s in S:
-        for h in H:
-            if hasattr(model, 'v') and (s, h) in model.v:
-                if value(model.v[s, h]) > 0.5:
-                    vacations_data.append({
-                        'Période': h,
-                        'Staffeur': staff_names[s-1],
-                        'Type': 'Vacances'
-                    })
-    df_vacations = pd.DataFrame(vacations_data)
+    s_vac, h_vac = np.nonzero(instance.v)
+    df_vacations = pd.DataFrame({
+        'Période': h_vac + 1,
+        'Staffeur': np.array(staff_names, dtype=object)[s_vac],
+        'Type': 'Vacances',
+    }, columns=['Période', 'Staffeur', 'Type'])
 
     # --- Résumé projets ---
     
     # 1. Durées théoriques
-    theoretical_durations = {}
-    if hasattr(model, 'n'):
-        for p in model.P:
-            try:
-                total_days = sum(value(model.n[p, q]) for q in model.Q if (p, q) in model.n)
-                theoretical_durations[p] = total_days
-            except Exception:
-                theoretical_durations[p] = 0 
-    else:
-        for p in model.P:
-            theoretical_durations[p] = 0 
+    theoretical_durations = {p: int(instance.n[p-1].sum()) for p in P}
 
     project_summary_data = []
     for p in P:
         project_name = project_names[p-1]
-        is_finished = value(model.f[p]) > 0.5
+        is_finished = planning.f[p-1] > 0.5
         
         # 2. Jours de travail réels
         project_assignments = df_assignments[df_assignments['Projet_ID'] == p]
@@ -85,13 +68,13 @@ def afficher_solution(model, result, seuil_affichage=0.5):
         duree_theorique = theoretical_durations.get(p, 0)
         
         # 4. Deadline et Pénalité
-        deadline = value(model.d[p]) if hasattr(model, 'd') and p in model.d and value(model.d[p]) is not None else float('inf')
-        deadline_str = f"{deadline:.0f}" if deadline is not None and deadline != float('inf') else "N/A"
-        penalty_rate = value(model.r[p]) if hasattr(model, 'r') and p in model.r else 0
+        deadline = int(instance.d[p-1])
+        deadline_str = f"{deadline:.0f}"
+        penalty_rate = int(instance.r[p-1])
         
         # 5. Jour de complétion
-        completion_day = value(model.fin[p])
-        completion_day_str = f"{completion_day:.0f}" if completion_day is not None else "N/A"
+        completion_day = int(planning.fin[p-1])
+        completion_day_str = f"{completion_day:.0f}"
 
         # --- Logique pour Statut, Couleur, Hauteur de Barre, et Survol ---
         bar_height = actual_work_days # Par défaut
@@ -100,7 +83,7 @@ def afficher_solution(model, result, seuil_affichage=0.5):
         hover_details = ''
         
         if is_finished:
-            jours_de_retard = value(model.R[p])
+            jours_de_retard = int(planning.R[p-1])
             bar_height = completion_day if completion_day is not None else actual_work_days
             
             if jours_de_retard > 0:
@@ -140,7 +123,7 @@ def afficher_solution(model, result, seuil_affichage=0.5):
             'Jours_travailles': actual_work_days,
             'Bar_Height': bar_height,
             'Duree_Theorique': duree_theorique,
-            'Gain': value(model.g[p]) if hasattr(model, 'g') and p in model.g else 0,
+            'Gain': int(instance.g[p-1]),
             'Color': color,
             'Deadline_Raw': deadline, # Gardé pour le tracé de la ligne
             'Deadline_Str': deadline_str, # Pour hover
@@ -152,22 +135,13 @@ def afficher_solution(model, result, seuil_affichage=0.5):
 
     # --- Demande qualifications ---
     qual_demand_data = []
-    if hasattr(model, 'jobs_data'):
-        for job in model.jobs_data:
-            for qual, days in job.get('working_days_per_qualification', {}).items():
-                qual_demand_data.append({
-                    'Qualification': qual,
-                    'Jours_demande': days,
-                    'Projet': job.get('name', 'Unknown')
-                })
-    else:
-        for qual in qual_names:
-            count = len(df_assignments[df_assignments['Qualification'] == qual])
-            qual_demand_data.append({
-                'Qualification': qual,
-                'Jours_demande': count,
-                'Projet': 'Total'
-            })
+    for qual in qual_names:
+        count = len(df_assignments[df_assignments['Qualification'] == qual])
+        qual_demand_data.append({
+            'Qualification': qual,
+            'Jours_demande': count,
+            'Projet': 'Total'
+        })
     df_qual_demand = pd.DataFrame(qual_demand_data)
 
 
@@ -196,27 +170,19 @@ def afficher_solution(model, result, seuil_affichage=0.5):
     # --- 1. TIMELINE DES PROJETS ---
     fig.update_yaxes(categoryorder='array', categoryarray=list(reversed(projects)), row=1, col=1)
 
-    if hasattr(model, "d"):
-        y_positions = list(reversed(projects)) 
-        for p in model.P:
-            try:
-                if p in model.d and value(model.d[p]) is not None:
-                    deadline_x = float(value(model.d[p]))
-                    project_label = project_names[p-1]
-                    y_pos = y_positions.index(project_label)
-                    y0 = y_pos - 0.35
-                    y1 = y_pos + 0.35
-                    fig.add_shape(
-                        type="line",
-                        x0=deadline_x, x1=deadline_x,
-                        y0=y0, y1=y1,
-                        xref="x1", yref="y1",
-                        # MODIFIÉ V3: Couleur de la deadline
-                        line=dict(color="red", width=2),
-                        layer="above"
-                    )
-            except Exception:
-                continue
+    y_positions = list(reversed(projects)) 
+    for p in P:
+        deadline_x = float(instance.d[p-1])
+        y_pos = y_positions.index(project_names[p-1])
+        fig.add_shape(
+            type="line",
+            x0=deadline_x, x1=deadline_x,
+            y0=y_pos - 0.35, y1=y_pos + 0.35,
+            xref="x1", yref="y1",
+            # MODIFIÉ V3: Couleur de la deadline
+            line=dict(color="red", width=2),
+            layer="above"
+        )
 
     if not df_assignments.empty:
         timeline_data = df_assignments.groupby(['Projet', 'Période']).agg({
@@ -0,0 +1,100 @@
+from pyomo.environ import value, minimize
+from build_model import get_objective_expression, OBJECTIVE_SENSE
+from planning import Planning
+
+# --- Démarrage à chaud (MIP start) à partir d'un planning déjà trouvé
+
+# Donne à toutes les variables du modèle les valeurs cohérentes avec les affectations fournies
+# (f, fin, R, p_retard, debut, z, k, N_projets et w pour la formulation agrégée)
+def completer_solution(model, affectations):
+    affectations = [cell for cell in affectations if cell in model.a]
+    actives = set(affectations)
+    for idx, var in model.a.items():
+        var.set_value(1 if idx in actives else 0)
+
+    travail = {}                               # jours affectés par (p,q)
+    jours = {p: set() for p in model.P}        # jours travaillés par projet
+    staff = {p: set() for p in model.P}        # personnes affectées par projet
+    for (h, s, q, p) in affectations:
+        travail[p, q] = travail.get((p, q), 0) + 1
+        jours[p].add(h)
+        staff[p].add(s)
+
+    for p in model.P:
+        # Un projet est fini si toutes ses qualifications ont reçu leurs jours
+        fini = all(travail.get((p, q), 0) >= value(model.n[p, q]) for q in model.Q)
+        model.f[p].set_value(1 if fini else 0)
+
+        fin = max(jours[p]) if jours[p] else 0
+        retard = max(0, fin - value(model.d[p]))
+        model.fin[p].set_value(fin)
+        model.R[p].set_value(retard)
+        model.p_retard[p].set_value(1 if retard > 0 else 0)
+
+        # z[p,h] = 1 à partir du premier jour travaillé, debut = ce jour (0 s'il s'agit du jour 1, cf. debut_rule)
+        premier = min(jours[p]) if jours[p] else None
+        for h in model.H:
+            model.z[p, h].set_value(1 if premier is not None and h >= premier else 0)
+        model.debut[p].set_value(premier if premier is not None and premier >= 2 else 0)
+
+        for s in model.S:
+            model.k[s, p].set_value(1 if s in staff[p] else 0)
+
+    if hasattr(model, 'w'):
+        for (p, h) in model.w:
+            model.w[p, h].set_value(1 if h in jours[p] else 0)
+
+    model.N_projets.set_value(max(sum(value(model.k[s, p]) for p in model.P) for s in model.S))
+
+# Liste des contraintes epsilon violées par la solution actuellement chargée dans le modèle
+def _epsilon_violes(model, epsilon_values, tol=1e-6):
+    violes = []
+    for obj, eps in epsilon_values.items():
+        val = value(get_objective_expression(model, obj))
+        if OBJECTIVE_SENSE[obj] == minimize and val > eps + tol:
+            violes.append(obj)
+        elif OBJECTIVE_SENSE[obj] != minimize and val < eps - tol:
+            violes.append(obj)
+    return violes
+
+# Réparation d'un planning qui viole des epsilon plus stricts :
+# on abandonne un à un les projets qui rapportent le moins, ce qui ne peut que faire baisser
+# les objectifs minimisés (retard, nb_projets_max, duree).
+# Renvoie le planning réparé, ou None si une contrainte reste violée (ex: profit >= eps).
+def reparer_affectations(model, affectations, epsilon_values):
+    affectations = list(affectations)
+    completer_solution(model, affectations)
+    violes = _epsilon_violes(model, epsilon_values)
+
+    while violes:
+        if any(OBJECTIVE_SENSE[obj] != minimize for obj in violes):
+            return None
+        projets = sorted({p for (h, s, q, p) in affectations},
+                         key=lambda p: value(model.g[p] * model.f[p] - model.r[p] * model.R[p]))
+        if not projets:
+            return None
+        affectations = [cell for cell in affectations if cell[3] != projets[0]]
+        completer_solution(model, affectations)
+        violes = _epsilon_violes(model, epsilon_values)
+
+    return affectations
+
+# Prépare le démarrage à chaud : charge le planning (Planning ou liste de cellules, réparé si besoin) dans les variables du modèle.
+# Renvoie True si le point de départ respecte les epsilon demandés (à passer en warmstart au solveur).
+def preparer_demarrage(model, affectations, epsilon_values):
+    if affectations is None:
+        return False
+    if isinstance(affectations, Planning):
+        affectations = affectations.affectations()
+    repare = reparer_affectations(model, affectations, epsilon_values)
+    if repare is None:
+        return False
+
+    # Mode augmenté : les contraintes epsilon sont des égalités avec écart, l'écart doit suivre la solution
+    if hasattr(model, 'eps_slack'):
+        for obj in model.SEC:
+            ecart = value(model.eps[obj]) - value(get_objective_expression(model, obj))
+            if OBJECTIVE_SENSE[obj] != minimize:
+                ecart = -ecart
+            model.eps_slack[obj].set_value(max(0, ecart))
+    return True